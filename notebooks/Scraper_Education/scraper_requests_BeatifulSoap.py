@@ -14,6 +14,14 @@ from bs4 import BeautifulSoup
 import sqlite3
 from urllib.parse import urljoin
 import time
+import os
+import sys
+
+# Caché HTTP condicional compartida con el ETL (source/ETL/cache_condicional.py):
+# si una página no ha cambiado desde la última ejecución (304), se reutilizan
+# los ítems ya extraídos sin volver a descargarla ni a parsearla.
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'source', 'ETL'))
+import cache_condicional
 
 # ==============================================================================
 # 1. CONFIGURACIÓN CENTRAL DE SITIOS
@@ -47,8 +55,52 @@ SITES_CONFIG = {
 }
 
 # ==============================================================================
-# 2. FUNCIÓN DE SCRAPING
+# 2. FUNCIONES DE SCRAPING
 # ==============================================================================
+def extract_items(html, site_config):
+    """
+    Parsea el HTML de la página y extrae los ítems con los selectores del sitio.
+    """
+    name = site_config["name"]
+    url = site_config["url"]
+    item_selector = site_config["item_container_selector"]
+    title_selector = site_config["title_selector"]
+    link_selector = site_config["link_selector"]
+
+    print("   - Página descargada correctamente.")
+
+    # Usamos BeautifulSoup para "entender" y parsear el HTML descargado.
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Extraemos todos los ítems de la página usando el selector proporcionado.
+    item_elements = soup.select(item_selector)
+
+    if not item_elements:
+        print(f"   - No se encontraron ítems con el selector '{item_selector}'.")
+        return []
+
+    print(f"   - Se encontraron {len(item_elements)} ítems. Extrayendo datos...")
+
+    scraped_data = []
+    for item in item_elements:
+        # Usamos .select_one() que es más seguro que .find() si el elemento no existe.
+        title_element = item.select_one(title_selector)
+        link_element = item.select_one(link_selector)
+
+        if title_element and link_element:
+            title = title_element.get_text(strip=True)
+            relative_url = link_element.get('href')
+            full_url = urljoin(url, relative_url) # Construye la URL completa
+
+            scraped_data.append({
+                "title": title,
+                "url": full_url,
+                "source": name,
+                "skill": name # Usamos el nombre del sitio como categoría general
+            })
+
+    return scraped_data
+
 def scrape_site_with_requests(site_config):
     """
     Descarga y extrae datos de un sitio usando Requests y BeautifulSoup.
@@ -67,42 +119,13 @@ def scrape_site_with_requests(site_config):
     }
 
     try:
-        # Hacemos la petición para descargar el HTML de la página.
-        response = requests.get(url, headers=headers, timeout=15)
-        # Lanza un error si la descarga no fue exitosa (ej. error 404, 500).
-        response.raise_for_status()
-        print("   - Página descargada correctamente.")
-
-        # Usamos BeautifulSoup para "entender" y parsear el HTML descargado.
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # Extraemos todos los ítems de la página usando el selector proporcionado.
-        item_elements = soup.select(item_selector)
-        
-        if not item_elements:
-            print(f"   - No se encontraron ítems con el selector '{item_selector}'.")
-            return []
-
-        print(f"   - Se encontraron {len(item_elements)} ítems. Extrayendo datos...")
-        
-        scraped_data = []
-        for item in item_elements:
-            # Usamos .select_one() que es más seguro que .find() si el elemento no existe.
-            title_element = item.select_one(title_selector)
-            link_element = item.select_one(link_selector)
-            
-            if title_element and link_element:
-                title = title_element.get_text(strip=True)
-                relative_url = link_element.get('href')
-                full_url = urljoin(url, relative_url) # Construye la URL completa
-                
-                scraped_data.append({
-                    "title": title,
-                    "url": full_url,
-                    "source": name,
-                    "skill": name # Usamos el nombre del sitio como categoría general
-                })
-        
+        # Petición condicional: solo se descarga y parsea el HTML si la página cambió.
+        # Los selectores forman parte de la clave: con otros selectores se vuelve a parsear.
+        clave_analisis = f"{item_selector}|{title_selector}|{link_selector}"
+        scraped_data = cache_condicional.obtener_analizado(
+            url, lambda html: extract_items(html, site_config), clave_analisis=clave_analisis,
+            headers=headers, timeout=15
+        )
         print(f"   - Extracción completada. {len(scraped_data)} ítems procesados.")
         return scraped_data
 
@@ -4,8 +4,15 @@
 # 1. IMPORTACIÓN DE LIBRERÍAS
 # -----------------------------------------------------------------------------
 # Solo necesitamos 'requests' porque la clave estará directamente en el código.
+# Las peticiones se hacen con el cliente HTTP compartido de source/ETL.
+import os
+import sys
+
 import requests
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import cliente_http
+
 # -----------------------------------------------------------------------------
 # 2. CONFIGURACIÓN INICIAL
 # -----------------------------------------------------------------------------
@@ -30,7 +37,7 @@ def run(moneda_base="USD"):
     print(f"-> Realizando petición a la API: {url}")
 
     try:
-        response = requests.get(url)
+        response = cliente_http.obtener(url)
 
         if response.status_code == 200:
             print("-> ¡Conexión Exitosa! Respuesta recibida (HTTP 200 OK).")
@@ -0,0 +1,157 @@
+# ENRIQUECIMIENTO DE OFERTAS DE JSEARCH CON /job-details
+#
+# Toma los job_id de las ofertas crudas de JSearch y pide sus detalles a la API
+# en lotes (el endpoint acepta varios job_id separados por comas). Los detalles
+# se van añadiendo a la partición del día de datos/crudos/jsearch_detalles a
+# medida que llegan; en la siguiente ejecución los job_id que ya tienen
+# detalles se saltan, así que volver a enriquecer solo gasta cuota en las
+# ofertas nuevas.
+#
+# Uso (desde la raíz del proyecto):
+#   python source/ETL/JSearch_API/enriquecer_detalles.py --concurrencia 4
+
+import requests
+import argparse
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+sys.path.append(current_dir)
+import config
+from config import APP_KEY_JSearch
+import almacen_crudos
+import cache_respuestas
+import cliente_http
+import progreso
+import planificador_cuota
+
+# URL base de la API (se puede apuntar a un servidor simulado para pruebas de carga).
+JSEARCH_URL_BASE = "https://jsearch.p.rapidapi.com"
+
+# --- CONFIGURACIÓN PRINCIPAL ---
+
+FUENTE_OFERTAS = 'jsearch'
+FUENTE_DETALLES = 'jsearch_detalles'
+
+IDS_POR_LLAMADA = 20     # Máximo de job_id que admite /job-details en una llamada.
+MAX_CONCURRENCIA = 4
+
+
+def _peticion_detalles(job_ids, country_code='us'):
+    """URL y parámetros de una llamada a /job-details."""
+    querystring = {
+        "job_id": ",".join(job_ids),
+        "country": country_code
+    }
+    return f"{JSEARCH_URL_BASE}/job-details", querystring
+
+
+def obtener_detalles_jsearch(job_ids, country_code='us'):
+    """Pide los detalles de varias ofertas en una sola llamada. Devuelve la lista 'data' o un texto de error."""
+    url, querystring = _peticion_detalles(job_ids, country_code)
+    headers = {
+        "x-rapidapi-key": APP_KEY_JSearch,
+        "x-rapidapi-host": "jsearch.p.rapidapi.com"
+    }
+
+    print(f"Pidiendo detalles de {len(job_ids)} oferta(s) a JSearch (País: {country_code.upper()})...")
+
+    try:
+        respuesta = cliente_http.obtener(url, headers=headers, params=querystring)
+        respuesta.raise_for_status()
+        return respuesta.json().get('data') or []
+    except (requests.exceptions.RequestException, ValueError) as e:
+        return f"Error al pedir detalles a JSearch: {e}"
+
+
+def cargar_ids_enriquecidos():
+    """Devuelve los job_id que ya tienen detalles (o que la API ya no reconoce)."""
+    return {registro.get('job_id') for registro in almacen_crudos.leer(FUENTE_DETALLES)}
+
+
+def lotes_pendientes(ofertas, enriquecidos, tamano=IDS_POR_LLAMADA):
+    """Agrupa los job_id sin detalles por país en lotes de hasta 'tamano'."""
+    por_pais = {}
+    vistos = set(enriquecidos)
+    for oferta in ofertas:
+        job_id = oferta.get('job_id')
+        if not job_id or job_id in vistos:
+            continue
+        vistos.add(job_id)
+        pais = (oferta.get('job_country') or 'us').lower()
+        por_pais.setdefault(pais, []).append(job_id)
+    return [
+        (pais, ids[i:i + tamano])
+        for pais, ids in por_pais.items()
+        for i in range(0, len(ids), tamano)
+    ]
+
+
+def enriquecer_lote(pais, job_ids, cuota, salida):
+    """Pide un lote y guarda sus detalles. Devuelve cuántas ofertas se enriquecieron, o None si no quedó cuota."""
+    # Un lote que ya está en la caché de respuestas no pasa por RapidAPI: no gasta cuota.
+    if not cache_respuestas.contiene('GET', *_peticion_detalles(job_ids, pais)) and not cuota.consumir():
+        return None
+    detalles = obtener_detalles_jsearch(job_ids, pais)
+    if isinstance(detalles, str):
+        print(detalles)
+        return 0
+
+    recibidos = {detalle.get('job_id') for detalle in detalles}
+    # Las ofertas que la API ya no devuelve (caducadas) se anotan para no volver a pagarlas.
+    sin_detalles = [{'job_id': job_id, 'sin_detalles': True} for job_id in job_ids if job_id not in recibidos]
+    salida.escribir(detalles + sin_detalles)
+    progreso.sumar('jsearch_detalles', len(detalles))
+    return len(detalles)
+
+
+def ejecutar(max_concurrencia=MAX_CONCURRENCIA, presupuesto=None):
+    """
+    Enriquece con /job-details las ofertas crudas de JSearch que aún no
+    tienen detalles, en lotes de IDS_POR_LLAMADA y dentro de la cuota del
+    mes (compartida con extract_jsearch.py). Devuelve el número de ofertas
+    enriquecidas.
+    """
+    print("--- Iniciando enriquecimiento de ofertas de JSearch ---")
+
+    enriquecidos = cargar_ids_enriquecidos()
+    lotes = lotes_pendientes(almacen_crudos.leer(FUENTE_OFERTAS), enriquecidos)
+    print(f"{len(enriquecidos)} oferta(s) ya enriquecidas; {sum(len(ids) for _, ids in lotes)} pendientes en {len(lotes)} lote(s).")
+    if not lotes:
+        return 0
+
+    if presupuesto is None:
+        presupuesto = getattr(config, 'CUOTA_JSEARCH_MENSUAL', planificador_cuota.PRESUPUESTO_MENSUAL_POR_DEFECTO)
+    # En modo replay no se gasta cuota: todo sale de la caché.
+    cuota = planificador_cuota.ContadorCuota(presupuesto, ilimitado=cache_respuestas.solo_cache)
+    print(f"Cuota del mes: {cuota.llamadas}/{cuota.presupuesto} llamadas usadas.")
+
+    # Cada lote se escribe en cuanto llega: si el proceso se corta, lo ya pagado queda guardado.
+    with almacen_crudos.EscritorCrudos(FUENTE_DETALLES) as salida:
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrencia)) as pool:
+            resultados = list(pool.map(lambda lote: enriquecer_lote(*lote, cuota, salida), lotes))
+
+    enriquecidas = sum(r for r in resultados if r)
+    sin_cuota = sum(1 for r in resultados if r is None)
+    if sin_cuota:
+        print(f"Cuota agotada: {sin_cuota} lote(s) quedan para la próxima ejecución.")
+    print(f"\n--- Proceso completado. Ofertas enriquecidas: {enriquecidas} ---")
+    print(f"Detalles guardados en: '{almacen_crudos.ruta_particion(FUENTE_DETALLES)}'")
+    return enriquecidas
+
+
+# --- PUNTO DE ENTRADA DEL SCRIPT ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Enriquece las ofertas de JSearch con /job-details.")
+    parser.add_argument('--concurrencia', type=int, default=MAX_CONCURRENCIA,
+                        help=f"Lotes simultáneos (por defecto {MAX_CONCURRENCIA}).")
+    parser.add_argument('--cuota', type=int, default=None,
+                        help="Presupuesto de llamadas del mes (por defecto CUOTA_JSEARCH_MENSUAL de config.py o 200).")
+    cache_respuestas.agregar_argumentos(parser)
+    args = parser.parse_args()
+    cache_respuestas.configurar_desde_argumentos(args)
+
+    ejecutar(args.concurrencia, args.cuota)
@@ -1,111 +1,325 @@
 import requests
-import json
+import argparse
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import os
-import time
 import sys
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
 sys.path.append(parent_dir)
+sys.path.append(current_dir)
+import config
 from config import APP_KEY_JSearch
+import almacen_crudos
+import cache_respuestas
+import cliente_http
+import progreso
+import planificador_cuota
 
-def obtener_ofertas_jsearch(query, country_code='us', pagina=1):
-    url = "https://jsearch.p.rapidapi.com/search"
+# URL base de la API (se puede apuntar a un servidor simulado para pruebas de carga).
+JSEARCH_URL_BASE = "https://jsearch.p.rapidapi.com"
 
-    # Se añade el parámetro 'country' a la búsqueda.
+def _peticion_busqueda(query, country_code='us', pagina=1, num_paginas=1):
+    """URL y parámetros de una llamada a /search."""
+    # Se añade el parámetro 'country' a la búsqueda. Con 'num_pages' > 1 la API
+    # devuelve en un solo 'data' las ofertas de varias páginas seguidas.
     querystring = {
         "query": query,
         "page": str(pagina),
-        "num_pages": "1",
+        "num_pages": str(num_paginas),
         "country": country_code
     }
+    return f"{JSEARCH_URL_BASE}/search", querystring
+
+def en_cache(query, country_code='us', pagina=1, num_paginas=1):
+    """True si la llamada se serviría desde la caché de respuestas (y no gasta cuota)."""
+    url, querystring = _peticion_busqueda(query, country_code, pagina, num_paginas)
+    return cache_respuestas.contiene('GET', url, querystring)
+
+def obtener_ofertas_jsearch(query, country_code='us', pagina=1, num_paginas=1):
+    url, querystring = _peticion_busqueda(query, country_code, pagina, num_paginas)
 
     headers = {
         "x-rapidapi-key": APP_KEY_JSearch,
         "x-rapidapi-host": "jsearch.p.rapidapi.com"
     }
 
-    print(f"Realizando petición a JSearch para: '{query}' (País: {country_code.upper()}) (Página {pagina})...")
+    paginas = f"Página {pagina}" if num_paginas == 1 else f"Páginas {pagina}-{pagina + num_paginas - 1}"
+    print(f"Realizando petición a JSearch para: '{query}' (País: {country_code.upper()}) ({paginas})...")
     
     try:
-        respuesta = requests.get(url, headers=headers, params=querystring)
+        respuesta = cliente_http.obtener(url, headers=headers, params=querystring)
         respuesta.raise_for_status()
         return respuesta.json()
     except requests.exceptions.RequestException as e:
         return f"Error al conectar con la API de JSearch: {e}"
 
-# --- PUNTO DE ENTRADA DEL SCRIPT ---
-if __name__ == "__main__":
+# --- CONFIGURACIÓN DE LA EXTRACCIÓN ---
 
-    PAISES_A_BUSCAR = [
-        {'nombre_en': 'United States', 'codigo': 'us'},
-        {'nombre_en': 'Mexico', 'codigo': 'mx'},
-        {'nombre_en': 'Colombia', 'codigo': 'co'},
-        {'nombre_en': 'Chile', 'codigo': 'cl'},
-        {'nombre_en': 'Argentina', 'codigo': 'ar'},
-        {'nombre_en': 'Brazil', 'codigo': 'br'},
-    ]
-
-    # 2. Lista de roles o tecnologías a buscar en cada país
-    TERMINOS_DE_BUSQUEDA = [
-        "Data Scientist",
-        "Data Analyst",
-        "Software Developer",
-        "Python Developer",
-        "Frontend Developer",
-        "Backend Developer",
-        "DevOps Engineer"
-    ]
-    
-    # --- FIN DE LA NUEVA ESTRUCTURA ---
+PAISES_A_BUSCAR = [
+    {'nombre_en': 'United States', 'codigo': 'us'},
+    {'nombre_en': 'Mexico', 'codigo': 'mx'},
+    {'nombre_en': 'Colombia', 'codigo': 'co'},
+    {'nombre_en': 'Chile', 'codigo': 'cl'},
+    {'nombre_en': 'Argentina', 'codigo': 'ar'},
+    {'nombre_en': 'Brazil', 'codigo': 'br'},
+]
+
+# Lista de roles o tecnologías a buscar en cada país
+TERMINOS_DE_BUSQUEDA = [
+    "Data Scientist",
+    "Data Analyst",
+    "Software Developer",
+    "Python Developer",
+    "Frontend Developer",
+    "Backend Developer",
+    "DevOps Engineer"
+]
+
+FUENTE = 'jsearch'  # datos/crudos/jsearch/fecha=AAAA-MM-DD/ (ver almacen_crudos.py)
+RESULTADOS_POR_PAGINA = 10   # JSearch devuelve hasta 10 ofertas por página.
+
+# Las páginas de una consulta se siguen pidiendo mientras traigan ofertas
+# nuevas: si en la última llamada la proporción de job_id nunca vistos
+# baja de UMBRAL_NOVEDAD, la consulta se da por agotada. MAX_PAGINAS_POR_CONSULTA
+# es el tope aunque la novedad siga alta.
+MAX_PAGINAS_POR_CONSULTA = 5
+UMBRAL_NOVEDAD = 0.3
+
+# Páginas que se piden en una sola llamada (num_pages). Cada consulta empieza
+# con una sola página y el tamaño se dobla (hasta PAGINAS_POR_LLAMADA) mientras
+# la novedad siga alta: una consulta sin nada nuevo solo gasta una llamada.
+# RapidAPI cobra más de una unidad por las llamadas de varias páginas;
+# COSTE_PAGINA_EXTRA_JSEARCH en config.py fija cuánto cuenta cada página
+# adicional. Por defecto se cuenta como una llamada entera, que es lo más
+# prudente para no pasarse de cuota.
+PAGINAS_POR_LLAMADA = 4
+COSTE_PAGINA_EXTRA = getattr(config, 'COSTE_PAGINA_EXTRA_JSEARCH', 1.0)
+
+def coste_llamada(num_paginas):
+    """Unidades de cuota que cuesta una llamada de 'num_paginas' páginas."""
+    return math.ceil(1 + (num_paginas - 1) * COSTE_PAGINA_EXTRA)
+
+def _pedir_paginas(query_actual, pais_codigo, pagina, num_paginas, cuota=None):
+    """
+    Pide 'num_paginas' páginas en una llamada y devuelve (ofertas,
+    paginas_recibidas, error). La API no indica a qué página pertenece cada
+    oferta, así que se devuelven todas juntas. Si la llamada de varias páginas
+    falla, se repite página a página (reservando cuota para cada una que no
+    esté en la caché) hasta la primera que falle, la primera vacía o hasta
+    que se acabe la cuota.
+    """
+    datos = obtener_ofertas_jsearch(query_actual, pais_codigo, pagina, num_paginas)
+    if not isinstance(datos, str):
+        return (datos or {}).get('data') or [], num_paginas, None
+    if num_paginas == 1:
+        return [], 0, datos
+
+    print(f"{datos}. Se reintenta página a página.")
+    ofertas = []
+    recibidas = 0
+    for numero in range(pagina, pagina + num_paginas):
+        if cuota is not None and not en_cache(query_actual, pais_codigo, numero) and not cuota.consumir():
+            break
+        datos = obtener_ofertas_jsearch(query_actual, pais_codigo, numero)
+        if isinstance(datos, str):
+            return ofertas, recibidas, datos
+        recibidas += 1
+        ofertas.extend(datos.get('data') or [])
+        if not datos.get('data'):
+            break
+    return ofertas, recibidas, None
+
+def _reservar_paginas(cuota, num_paginas):
+    """Reserva cuota para la llamada más grande que quepa (hasta 'num_paginas'); 0 si no cabe ninguna."""
+    if cuota is None:
+        return num_paginas
+    while num_paginas > 0 and not cuota.consumir(coste_llamada(num_paginas)):
+        num_paginas -= 1
+    return num_paginas
+
+def extraer_consulta(query_actual, pais_codigo, pagina_inicial=1, cuota=None, vistos=None, historial=None,
+                     max_paginas=MAX_PAGINAS_POR_CONSULTA, umbral_novedad=UMBRAL_NOVEDAD):
+    """
+    Recorre las páginas de una consulta mientras la proporción de ofertas
+    nuevas no baje de 'umbral_novedad' (hasta 'max_paginas'), empezando con
+    una página por llamada y doblando las páginas de cada llamada (hasta
+    PAGINAS_POR_LLAMADA) mientras la novedad siga alta, y devuelve
+    (ofertas_nuevas, pagina_pendiente). Antes de cada llamada que no esté en
+    la caché de respuestas se reserva cuota; si no queda, se devuelve la
+    página que faltó pedir para que el plan pueda reanudarse. Las ofertas con un job_id ya visto se descartan y
+    no cuentan como nuevas en el historial de rendimiento.
+    """
+    vistos = vistos if vistos is not None else _IdsVistos()
+    resultados_consulta = []
+    pagina_actual = pagina_inicial
+    paginas_por_llamada = 1
+    clave = historial.clave(query_actual, pais_codigo) if historial is not None else None
+
+    print(f"\n--- Iniciando búsqueda para '{query_actual}' ---")
+
+    while pagina_actual <= max_paginas:
+        restantes = max_paginas - pagina_actual + 1
+        num_paginas = min(paginas_por_llamada, restantes)
+        # Las respuestas que ya están en la caché no pasan por RapidAPI: no gastan cuota.
+        if not en_cache(query_actual, pais_codigo, pagina_actual, num_paginas):
+            num_paginas = _reservar_paginas(cuota, num_paginas)
+        if num_paginas == 0:
+            print(f"Cuota agotada: '{query_actual}' queda pendiente desde la página {pagina_actual}.")
+            return resultados_consulta, pagina_actual
+
+        ofertas, recibidas, error = _pedir_paginas(query_actual, pais_codigo, pagina_actual, num_paginas, cuota)
+        if historial is not None:
+            historial.registrar(clave, 0, coste_llamada(num_paginas))
+
+        if ofertas:
+            nuevas = vistos.filtrar_nuevas(ofertas)
+            resultados_consulta.extend(nuevas)
+            progreso.sumar('jsearch', len(nuevas))
+            if historial is not None:
+                historial.registrar(clave, len(nuevas), 0)
+            rango = f"Página {pagina_actual}" if recibidas == 1 else f"Páginas {pagina_actual}-{pagina_actual + recibidas - 1}"
+            print(f"{rango}: Se obtuvieron {len(ofertas)} resultados ({len(nuevas)} nuevos).")
+        pagina_actual += recibidas
+        if recibidas == 0 and error is None:
+            # Al repetir página a página se acabó la cuota antes de la primera.
+            print(f"Cuota agotada: '{query_actual}' queda pendiente desde la página {pagina_actual}.")
+            return resultados_consulta, pagina_actual
+
+        # Solo una llamada vacía, o con menos ofertas de las que caben en las
+        # páginas pedidas, indica que la consulta no tiene más resultados.
+        if error is not None or not ofertas or len(ofertas) < recibidas * RESULTADOS_POR_PAGINA:
+            print(error or "No se encontraron más resultados. Finalizando esta búsqueda.")
+            return resultados_consulta, None
+        # Las páginas ya pagadas de la llamada se aprovechan todas; la novedad
+        # de la llamada decide si merece la pena pedir más.
+        novedad = len(nuevas) / len(ofertas)
+        if novedad < umbral_novedad:
+            print(f"Solo un {novedad:.0%} de ofertas nuevas en la última llamada. Finalizando esta búsqueda.")
+            return resultados_consulta, None
+        paginas_por_llamada = min(paginas_por_llamada * 2, PAGINAS_POR_LLAMADA)
+        # El ritmo de peticiones lo marca el limitador del cliente HTTP.
 
-    todos_los_resultados = []
+    print("Límite de páginas alcanzado para esta búsqueda.")
+    return resultados_consulta, None
 
+class _IdsVistos:
+    """Conjunto de job_id ya guardados, compartido por los hilos de la extracción."""
+
+    def __init__(self, ofertas=()):
+        self._ids = {oferta.get('job_id') for oferta in ofertas}
+        self._candado = threading.Lock()
+
+    def filtrar_nuevas(self, ofertas):
+        with self._candado:
+            nuevas = [oferta for oferta in ofertas if oferta.get('job_id') not in self._ids]
+            self._ids.update(oferta.get('job_id') for oferta in nuevas)
+            return nuevas
+
+def ejecutar(max_concurrencia=1, presupuesto=None, podar=True,
+             max_paginas=MAX_PAGINAS_POR_CONSULTA, umbral_novedad=UMBRAL_NOVEDAD):
+    """
+    Ejecuta el plan de consultas (término en país) dentro del presupuesto de
+    cuota y añade las ofertas nuevas a la partición del día de
+    datos/crudos/jsearch. Las ofertas de cada consulta se escriben en cuanto
+    esta termina. Si quedó un plan pendiente de la ejecución anterior se
+    retoma primero; si la cuota se acaba o la ejecución se corta, lo que falta
+    se guarda como nuevo plan pendiente. Con
+    'max_concurrencia' > 1 las consultas se reparten en un pool de hilos (las
+    páginas de una misma consulta siguen en orden). Con 'podar' se saltan las
+    consultas que llevan varias ejecuciones sin aportar ofertas nuevas.
+    'max_paginas' y 'umbral_novedad' fijan cuándo se deja de paginar cada
+    consulta (ver extraer_consulta). Devuelve el número de ofertas nuevas.
+    """
     print("--- Iniciando extracción masiva y comparativa de datos de JSearch ---")
-    
-    # 3. Bucle anidado para buscar cada término en cada país
-    for pais_info in PAISES_A_BUSCAR:
-        pais_codigo = pais_info['codigo']
-        pais_nombre = pais_info['nombre_en']
-        
-        for termino in TERMINOS_DE_BUSQUEDA:
-            # Construimos la query combinando el término y el nombre del país en inglés
-            query_actual = f"{termino} in {pais_nombre}"
-            pagina_actual = 1
-            
-            print(f"\n--- Iniciando búsqueda para '{query_actual}' ---")
-            
-            while True:
-                datos_pagina = obtener_ofertas_jsearch(query_actual, pais_codigo, pagina=pagina_actual)
-                
-                if isinstance(datos_pagina, str):
-                    print(datos_pagina)
-                    break
-
-                if datos_pagina and 'data' in datos_pagina and datos_pagina['data']:
-                    resultados = datos_pagina['data']
-                    todos_los_resultados.extend(resultados)
-                    print(f"Página {pagina_actual}: Se obtuvieron {len(resultados)} resultados.")
-                    
-                    if pagina_actual >= 5: # Limitamos a 5 páginas por búsqueda para no exceder los límites
-                        print("Límite de páginas alcanzado para esta búsqueda.")
-                        break
-                    
-                    pagina_actual += 1
-                    time.sleep(0.1)
-                else:
-                    print("No se encontraron más resultados. Finalizando esta búsqueda.")
-                    break
-    
-    if todos_los_resultados:
-        print(f"\n--- Proceso completado. Total de ofertas extraídas: {len(todos_los_resultados)} ---")
-        ruta_salida = os.path.join('datos', 'crudos')
-        os.makedirs(ruta_salida, exist_ok=True)
-        nombre_archivo = "jsearch_datos_crudos.json"
-        
-        with open(os.path.join(ruta_salida, nombre_archivo), 'w', encoding='utf-8') as f:
-            json.dump(todos_los_resultados, f, ensure_ascii=False, indent=4)
-        
-        print(f"Todos los datos han sido guardados en: '{os.path.join(ruta_salida, nombre_archivo)}'")
+
+    if presupuesto is None:
+        presupuesto = getattr(config, 'CUOTA_JSEARCH_MENSUAL', planificador_cuota.PRESUPUESTO_MENSUAL_POR_DEFECTO)
+    # En modo replay no se gasta cuota: todo sale de la caché.
+    cuota = planificador_cuota.ContadorCuota(presupuesto, ilimitado=cache_respuestas.solo_cache)
+    historial = planificador_cuota.historial_rendimiento()
+    print(f"Cuota del mes: {cuota.llamadas}/{cuota.presupuesto} llamadas usadas.")
+
+    plan = planificador_cuota.cargar_plan_pendiente()
+    if plan:
+        print(f"Se retoma el plan pendiente de la ejecución anterior ({len(plan)} consulta(s)).")
     else:
-        print("\nNo se extrajo ningún dato de la API en ninguna de las búsquedas.")
+        # Combinamos el término y el nombre del país en inglés para cada consulta.
+        consultas = [
+            (f"{termino} in {pais_info['nombre_en']}", pais_info['codigo'])
+            for pais_info in PAISES_A_BUSCAR
+            for termino in TERMINOS_DE_BUSQUEDA
+        ]
+        plan, omitidas = planificador_cuota.planificar(consultas, historial, podar)
+        if omitidas:
+            print(f"Se omiten {len(omitidas)} consulta(s) de bajo rendimiento en las últimas ejecuciones.")
+
+    # Los job_id ya guardados se leen como flujo, sin cargar las ofertas en memoria.
+    vistos = _IdsVistos(almacen_crudos.leer(FUENTE))
+
+    # Índice en el plan -> página pendiente de cada consulta terminada (None si se completó).
+    terminadas = {}
+
+    # Solo se escriben las ofertas nuevas: las de ejecuciones anteriores ya
+    # están en sus particiones (con cuota limitada una cosecha completa puede
+    # repartirse entre varias ejecuciones).
+    with almacen_crudos.EscritorCrudos(FUENTE) as salida:
+
+        def ejecutar_tarea(indice):
+            tarea = plan[indice]
+            resultados, pagina_pendiente = extraer_consulta(tarea['query'], tarea['pais'], tarea['pagina'], cuota,
+                                                            vistos, historial, max_paginas, umbral_novedad)
+            # Se escriben al terminar la consulta: si otra falla después, estas ya están en disco.
+            salida.escribir(resultados)
+            terminadas[indice] = pagina_pendiente
+
+        pool = ThreadPoolExecutor(max_workers=max(1, max_concurrencia))
+        try:
+            futuros = [pool.submit(ejecutar_tarea, indice) for indice in range(len(plan))]
+            for futuro in as_completed(futuros):
+                futuro.result()
+        finally:
+            # Tras un error (o Ctrl+C) no se empiezan más consultas.
+            pool.shutdown(cancel_futures=True)
+            historial.guardar()
+            # Vuelven al plan, en su orden (que conserva las prioridades), las
+            # consultas sin cuota y las que no llegaron a terminar.
+            pendientes = []
+            for indice, tarea in enumerate(plan):
+                if indice not in terminadas:
+                    pendientes.append(tarea)
+                elif terminadas[indice] is not None:
+                    pendientes.append({**tarea, 'pagina': terminadas[indice]})
+            planificador_cuota.guardar_plan_pendiente(pendientes)
+
+    if pendientes:
+        print(f"\nCuota agotada. Quedan {len(pendientes)} consulta(s) en el plan pendiente para la próxima ejecución.")
+
+    if salida.registros:
+        print(f"\n--- Proceso completado. Total de ofertas nuevas extraídas: {salida.registros} ---")
+        print(f"Todos los datos han sido guardados en: '{salida.ruta}'")
+    else:
+        print("\nNo se extrajo ningún dato nuevo de la API en ninguna de las búsquedas.")
+    return salida.registros
+
+# --- PUNTO DE ENTRADA DEL SCRIPT ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extracción de ofertas desde la API de JSearch.")
+    parser.add_argument('--concurrencia', type=int, default=1,
+                        help="Consultas simultáneas (por defecto 1, en secuencia).")
+    parser.add_argument('--cuota', type=int, default=None,
+                        help="Presupuesto de llamadas del mes (por defecto CUOTA_JSEARCH_MENSUAL de config.py o 200).")
+    parser.add_argument('--sin-poda', action='store_true',
+                        help="Ejecuta todas las consultas, aunque tengan bajo rendimiento histórico.")
+    parser.add_argument('--max-paginas', type=int, default=MAX_PAGINAS_POR_CONSULTA,
+                        help=f"Tope de páginas por consulta (por defecto {MAX_PAGINAS_POR_CONSULTA}).")
+    parser.add_argument('--umbral-novedad', type=float, default=UMBRAL_NOVEDAD,
+                        help=f"Proporción mínima de ofertas nuevas en una página para seguir paginando (por defecto {UMBRAL_NOVEDAD}).")
+    cache_respuestas.agregar_argumentos(parser)
+    args = parser.parse_args()
+    cache_respuestas.configurar_desde_argumentos(args)
+
+    ejecutar(args.concurrencia, args.cuota, podar=not args.sin_poda,
+             max_paginas=args.max_paginas, umbral_novedad=args.umbral_novedad)
@@ -0,0 +1,89 @@
+# Planificador de peticiones a JSearch según la cuota de RapidAPI.
+#
+# - ContadorCuota lleva en disco las llamadas hechas en el mes y no deja pasar
+#   de un presupuesto.
+# - planificar() ordena las consultas por rendimiento esperado (según el
+#   historial de rendimiento_consultas.py), para que las primeras llamadas del
+#   mes sean las que más ofertas nuevas traen, y deja fuera las que llevan
+#   varias ejecuciones sin aportar casi nada.
+# - Si la cuota se acaba a mitad de ejecución, lo que quedó sin hacer se guarda
+#   como plan pendiente y la siguiente ejecución empieza por ahí.
+
+import os
+import threading
+from datetime import date
+
+import archivos_json
+import rendimiento_consultas
+
+# --- CONFIGURACIÓN PRINCIPAL ---
+
+RUTA_ESTADO = os.path.join('datos', 'estado')
+ARCHIVO_CUOTA = 'jsearch_cuota.json'
+ARCHIVO_PLAN_PENDIENTE = 'jsearch_plan_pendiente.json'
+
+# Presupuesto mensual si no se indica otro (plan básico de RapidAPI).
+PRESUPUESTO_MENSUAL_POR_DEFECTO = 200
+
+
+class ContadorCuota:
+    """Contador persistente de llamadas del mes en curso frente a un presupuesto."""
+
+    def __init__(self, presupuesto=PRESUPUESTO_MENSUAL_POR_DEFECTO, ruta=None, ilimitado=False):
+        self.ruta = ruta or os.path.join(RUTA_ESTADO, ARCHIVO_CUOTA)
+        self.presupuesto = presupuesto
+        self.ilimitado = ilimitado
+        self._candado = threading.Lock()
+        periodo = date.today().strftime('%Y-%m')
+        datos = archivos_json.leer_json(self.ruta, {})
+        # Al cambiar de mes RapidAPI renueva la cuota, y el contador también.
+        self.llamadas = datos.get('llamadas', 0) if datos.get('periodo') == periodo else 0
+        self.periodo = periodo
+
+    def disponibles(self):
+        return max(0, self.presupuesto - self.llamadas)
+
+    def consumir(self, unidades=1):
+        """Reserva 'unidades' de cuota. Devuelve False (sin reservar) si no alcanzan."""
+        if self.ilimitado:
+            return True
+        with self._candado:
+            if self.llamadas + unidades > self.presupuesto:
+                return False
+            self.llamadas += unidades
+            # Se guarda en cada llamada: si el proceso se corta, la cuenta sigue siendo fiel.
+            archivos_json.escribir_json(self.ruta, {'periodo': self.periodo, 'llamadas': self.llamadas}, indent=4)
+            return True
+
+
+def historial_rendimiento():
+    """Historial de ofertas nuevas por (consulta, país) de JSearch."""
+    return rendimiento_consultas.HistorialRendimiento('jsearch')
+
+
+def planificar(consultas, historial, podar=True):
+    """
+    Convierte una lista de (query, pais) en un plan ordenado de mayor a menor
+    rendimiento esperado. Cada tarea empieza en la página 1. Devuelve
+    (plan, omitidas), donde 'omitidas' son las consultas podadas por bajo
+    rendimiento en esta ejecución.
+    """
+    por_clave = {historial.clave(query, pais): (query, pais) for query, pais in consultas}
+    a_ejecutar, omitidas = historial.priorizar(list(por_clave), podar)
+    plan = [{'query': por_clave[c][0], 'pais': por_clave[c][1], 'pagina': 1} for c in a_ejecutar]
+    return plan, [por_clave[c] for c in omitidas]
+
+
+def cargar_plan_pendiente(ruta=None):
+    """Devuelve el plan que quedó sin terminar en la ejecución anterior, o None."""
+    plan = archivos_json.leer_json(ruta or os.path.join(RUTA_ESTADO, ARCHIVO_PLAN_PENDIENTE), None)
+    return plan or None
+
+
+def guardar_plan_pendiente(plan, ruta=None):
+    """Guarda las tareas que faltan; si no falta ninguna, borra el plan pendiente."""
+    ruta = ruta or os.path.join(RUTA_ESTADO, ARCHIVO_PLAN_PENDIENTE)
+    if plan:
+        archivos_json.escribir_json(ruta, plan, indent=4)
+    elif os.path.exists(ruta):
+        os.remove(ruta)
@@ -1,102 +1,208 @@
 import pandas as pd
-import json
+import argparse
+import itertools
 import os
+import sys
 
-def cargar_datos_json(ruta_archivo):
-    """Carga un archivo JSON y devuelve su contenido."""
-    if not os.path.exists(ruta_archivo):
-        print(f"Error: El archivo no se encontró en la ruta '{ruta_archivo}'")
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+import almacen_crudos
+
+# Ofertas que se transforman y escriben de una vez. La memoria usada depende
+# de este tamaño y no del tamaño total de la extracción.
+TAMANO_BLOQUE = 50000
+
+# Columnas del CSV, en orden, y de dónde sale cada una en la oferta cruda.
+COLUMNAS_DIRECTAS = {
+    'puesto_trabajo': 'title',
+    'salario_minimo': 'salary_min',
+    'salario_maximo': 'salary_max',
+    'tipo_contrato': 'contract_time',
+    'enlace_oferta': 'redirect_url',
+}
+COLUMNAS_FIJAS = {
+    'moneda_salario': 'USD',
+    'periodo_salario': 'Anual',
+    'plataforma_origen': 'Adzuna',
+    'tipo_fuente_datos': 'API',
+}
+ORDEN_COLUMNAS = [
+    'puesto_trabajo', 'nombre_empresa', 'pais', 'region_estado', 'salario_minimo', 'salario_maximo',
+    'moneda_salario', 'periodo_salario', 'tipo_contrato', 'categoria', 'plataforma_origen',
+    'tipo_fuente_datos', 'enlace_oferta',
+]
+
+# Valor por defecto de los diccionarios anidados que faltan (no se modifica nunca).
+_VACIO = {}
+
+def _anidado(oferta, clave, subclave, ausente='NA'):
+    """
+    oferta[clave][subclave] con las mismas reglas que oferta.get(clave, 'NA'):
+    'ausente' si falta alguna de las dos claves y None si alguna es null
+    (p. ej. "company": null o "display_name": null dejan la celda vacía).
+    """
+    diccionario = oferta.get(clave, _VACIO)
+    return None if diccionario is None else diccionario.get(subclave, ausente)
+
+def _elemento_de_area(area, indice):
+    """Elemento 'indice' de la lista 'area': 'NA' si es más corta (o vacía) y None si el área es null."""
+    if area is None:
         return None
+    return area[indice] if len(area) > indice else 'NA'
+
+def transformar_oferta(oferta):
+    """Convierte una oferta cruda de la API en un diccionario con las columnas finales."""
+    #Estructura de la oferta:
+
+    # Extraemos los datos, usando .get() para evitar errores si una clave no existe.
+    titulo = oferta.get('title', 'NA')
     
-    print(f"Cargando archivo JSON: {ruta_archivo}")
-    with open(ruta_archivo, 'r', encoding='utf-8') as f:
-        datos = json.load(f)
-    return datos
+    # 'company' es un diccionario anidado, accedemos a su 'display_name'.
+    empresa = _anidado(oferta, 'company', 'display_name')
+    
+    # 'location' también es un diccionario anidado.
+    # Obtenemos el pais y la región/estado de su lista 'area'.
+    # Si 'location' no tiene 'area' (o viene vacía), devolvemos 'NA'.
+    area = _anidado(oferta, 'location', 'area', ausente=())
+    pais = _elemento_de_area(area, 0)
+    region_estado = _elemento_de_area(area, 1)
+    
+    # El salario puede no estar presente.
+    salario_min = oferta.get('salary_min', 'NA')
+    salario_max = oferta.get('salary_max', 'NA')
+
+    # Contract Time
+    tipo_contrato = oferta.get('contract_time', 'NA')
+    #Categoria
+    categoria = _anidado(oferta, 'category', 'label')
+
+    # Creamos un diccionario con los datos limpios para esta oferta.
+    return {
+        'puesto_trabajo': titulo,
+        'nombre_empresa': empresa,
+        'pais': pais,
+        'region_estado': region_estado,
+        'salario_minimo': salario_min,
+        'salario_maximo': salario_max,
+        'moneda_salario': 'USD',  # Asumimos que el salario está en USD, ajustar si es necesario.
+        'periodo_salario': 'Anual',
+        'tipo_contrato': tipo_contrato,
+        'categoria': categoria,
+        'plataforma_origen': 'Adzuna',
+        'tipo_fuente_datos': 'API',
+        'enlace_oferta': oferta.get('redirect_url', 'NA'),
+    }
+
+def transformar_ofertas(ofertas):
+    """
+    DataFrame de un bloque oferta a oferta. Con dtype=object cada valor se
+    escribe tal cual (48000 sigue siendo 48000 aunque otra oferta del bloque
+    tenga un salario decimal), así el CSV no depende de cómo se corten los bloques.
+    """
+    return pd.DataFrame([transformar_oferta(oferta) for oferta in ofertas], columns=ORDEN_COLUMNAS, dtype=object)
 
 def transformar_json_a_dataframe(datos_json):
     if not datos_json:
         print("El archivo JSON está vacío o no es válido.")
         return pd.DataFrame()
 
-    lista_ofertas_limpias = []
-    
     print(f"Procesando {len(datos_json)} ofertas de la API...")
     
-    # Iteramos sobre cada oferta de trabajo en la lista de resultados.
-    for oferta in datos_json:
-        #Estructura de la oferta:
+    # Convertimos la lista de ofertas a un DataFrame con las columnas limpias.
+    return transformar_bloque(list(datos_json))
 
-        # Extraemos los datos, usando .get() para evitar errores si una clave no existe.
-        titulo = oferta.get('title', 'NA')
-        
-        # 'company' es un diccionario anidado, accedemos a su 'display_name'.
-        empresa = oferta.get('company', {}).get('display_name', 'NA')
-        
-        # 'location' también es un diccionario anidado.
-        ubicacion_dict = oferta.get('location', {})
-        # Obtenemos el pais y la región/estado de la ubicación.
-        # Si 'location' no tiene 'area', devolvemos 'NA'.
-        pais = ubicacion_dict.get('area', ['NA'])[0]
-        region_estado = ubicacion_dict.get('area', ['NA'])[1] if len(ubicacion_dict.get('area', [])) > 1 else 'NA'
-        
-        # El salario puede no estar presente.
-        salario_min = oferta.get('salary_min', 'NA')
-        salario_max = oferta.get('salary_max', 'NA')
-
-        # Contract Time
-        tipo_contrato = oferta.get('contract_time', 'NA')
-        #Categoria
-        categoria = oferta.get('category', {}).get('label', 'NA')
-
-        # Creamos un diccionario con los datos limpios para esta oferta.
-        oferta_limpia = {
-            'puesto_trabajo': titulo,
-            'nombre_empresa': empresa,
-            'pais': pais,
-            'region_estado': region_estado,
-            'salario_minimo': salario_min,
-            'salario_maximo': salario_max,
-            'moneda_salario': 'USD',  # Asumimos que el salario está en USD, ajustar si es necesario.
-            'periodo_salario': 'Anual',
-            'tipo_contrato': tipo_contrato,
-            'categoria': categoria,
-            'plataforma_origen': 'Adzuna',
-            'tipo_fuente_datos': 'API',
-            'enlace_oferta': oferta.get('redirect_url', 'NA'),
-        }
-        
-        lista_ofertas_limpias.append(oferta_limpia)
-        
-    # Convertimos la lista de diccionarios a un DataFrame.
-    return pd.DataFrame(lista_ofertas_limpias)
+# --- TRANSFORMACIÓN POR COLUMNAS ---
+
+def transformar_bloque(ofertas):
+    """
+    Transforma una lista de ofertas en el mismo DataFrame que
+    transformar_ofertas, pero por columnas: cada columna sale de una sola
+    pasada sobre el bloque, sin crear un diccionario por oferta ni llamar a
+    una función por valor. El país y la región salen de la columna de áreas.
+    Las claves ausentes y los null siguen las reglas de _anidado.
+    """
+    columnas = {
+        columna: [oferta.get(clave, 'NA') for oferta in ofertas]
+        for columna, clave in COLUMNAS_DIRECTAS.items()
+    }
+    empresas = [oferta.get('company', _VACIO) for oferta in ofertas]
+    columnas['nombre_empresa'] = [None if e is None else e.get('display_name', 'NA') for e in empresas]
+    categorias = [oferta.get('category', _VACIO) for oferta in ofertas]
+    columnas['categoria'] = [None if c is None else c.get('label', 'NA') for c in categorias]
+
+    ubicaciones = [oferta.get('location', _VACIO) for oferta in ofertas]
+    areas = [None if u is None else u.get('area', ()) for u in ubicaciones]
+    columnas['pais'] = [None if a is None else (a[0] if len(a) > 0 else 'NA') for a in areas]
+    columnas['region_estado'] = [None if a is None else (a[1] if len(a) > 1 else 'NA') for a in areas]
+
+    # Las columnas fijas son escalares: pandas las repite en todas las filas.
+    columnas.update(COLUMNAS_FIJAS)
+    # Sin inferir tipos por bloque (ver transformar_ofertas): el CSV sale igual sea cual sea el tamaño de bloque.
+    return pd.DataFrame({columna: columnas[columna] for columna in ORDEN_COLUMNAS}, index=range(len(ofertas)), dtype=object)
+
+def transformar_en_bloques(ofertas, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Recorre un flujo de ofertas (p. ej. almacen_crudos.leer) y devuelve un
+    DataFrame por cada bloque de 'tamano_bloque' ofertas.
+    """
+    ofertas = iter(ofertas)
+    while True:
+        bloque = list(itertools.islice(ofertas, tamano_bloque))
+        if not bloque:
+            return
+        yield transformar_bloque(bloque)
+
+def transformar_a_csv(ofertas, ruta_salida, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Transforma un flujo de ofertas y lo va escribiendo en 'ruta_salida' bloque
+    a bloque. Devuelve (ofertas escritas, primeras filas para la vista previa).
+    El CSV anterior solo se sustituye cuando el nuevo está completo.
+    """
+    ruta_temporal = ruta_salida + '.tmp'
+    total = 0
+    vista_previa = None
+    for df_bloque in transformar_en_bloques(ofertas, tamano_bloque):
+        # La cabecera solo se escribe con el primer bloque; el resto se añade.
+        df_bloque.to_csv(ruta_temporal, index=False, mode='w' if total == 0 else 'a', header=total == 0)
+        if vista_previa is None:
+            vista_previa = df_bloque.head()
+        total += len(df_bloque)
+        print(f"  {total} ofertas transformadas...")
+    if total:
+        os.replace(ruta_temporal, ruta_salida)
+    return total, vista_previa
 
 # --- PUNTO DE ENTRADA DEL SCRIPT ---
 if __name__ == "__main__":
     
+    parser = argparse.ArgumentParser(description="Transforma las ofertas crudas de Adzuna a CSV.")
+    parser.add_argument('--desde', help="Primera fecha de extracción a incluir (AAAA-MM-DD).")
+    parser.add_argument('--hasta', help="Última fecha de extracción a incluir (AAAA-MM-DD).")
+    parser.add_argument('--tamano-bloque', type=int, default=TAMANO_BLOQUE,
+                        help=f"Ofertas que se transforman y escriben de una vez (por defecto {TAMANO_BLOQUE}).")
+    args = parser.parse_args()
+
     # Definición de rutas.
-    ruta_datos_crudos = os.path.join('datos', 'crudos')
     ruta_datos_procesados = os.path.join('datos', 'procesados')
-    
-    archivo_entrada = 'adzuna_datos_crudos.json'
     archivo_salida = 'datos_procesados_adzuna.csv'
     
     # Aseguramos que la carpeta de salida exista.
     os.makedirs(ruta_datos_procesados, exist_ok=True)
     
-    # Cargamos los datos crudos del JSON.
-    datos_crudos = cargar_datos_json(os.path.join(ruta_datos_crudos, archivo_entrada))
+    # Las ofertas se leen como un flujo de las particiones pedidas (y del
+    # landing antiguo, si sigue ahí) y se escriben por bloques. Una oferta
+    # extraída en varias fechas solo se escribe una vez, con su versión más reciente.
+    print("Transformando datos crudos de Adzuna...")
+    ofertas = almacen_crudos.leer_sin_duplicados('adzuna', lambda oferta: oferta.get('id'), args.desde, args.hasta)
+    ruta_salida_completa = os.path.join(ruta_datos_procesados, archivo_salida)
+    total, vista_previa = transformar_a_csv(ofertas, ruta_salida_completa, args.tamano_bloque)
     
-    if datos_crudos:
-        # Transformamos los datos.
-        df_procesado = transformar_json_a_dataframe(datos_crudos)
-        print(df_procesado)
-        # Guardamos el DataFrame resultante en un nuevo archivo CSV.
-        ruta_salida_completa = os.path.join(ruta_datos_procesados, archivo_salida)
-        df_procesado.to_csv(ruta_salida_completa, index=False)
-        
-        print(f"\n¡Proceso completado! Se han transformado {len(df_procesado)} ofertas.")
+    if total:
+        print(f"\n¡Proceso completado! Se han transformado {total} ofertas.")
         print(f"Datos guardados en: '{ruta_salida_completa}'")
         
         print("\n--- Vista Previa de los Datos Transformados ---")
-        print(df_procesado.head())
-
+        print(vista_previa)
+    else:
+        print("No hay datos crudos de Adzuna para transformar.")
@@ -1,8 +1,10 @@
 import requests
+import argparse
+import asyncio
 import json
 import os
-import time
 import sys
+from datetime import datetime, timezone
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
@@ -10,25 +12,39 @@ sys.path.append(parent_dir)
 
 
 import config
+import almacen_crudos
+import archivos_json
+import cache_respuestas
+import cliente_http
+import progreso
 APP_ID = config.APP_ID
 APP_KEY = config.APP_KEY
 
-def obtener_ofertas_adzuna(que_buscar, donde_buscar, pais='us', pagina=1):
+# URL base de la API (se puede apuntar a un servidor simulado para pruebas de carga).
+ADZUNA_URL_BASE = "https://api.adzuna.com/v1/api/jobs"
+
+# La API de Adzuna no entrega más de 50 resultados por página.
+RESULTADOS_POR_PAGINA_MAX = 50
+
+def obtener_ofertas_adzuna(que_buscar, donde_buscar, pais='us', pagina=1, resultados_por_pagina=RESULTADOS_POR_PAGINA_MAX, filtros=None):
     # Construimos la URL base usando el código del país.
-    url_endpoint = f"https://api.adzuna.com/v1/api/jobs/{pais}/search/{pagina}"
+    url_endpoint = f"{ADZUNA_URL_BASE}/{pais}/search/{pagina}"
     
     params = {
         'app_id': APP_ID,
         'app_key': APP_KEY,
         'what': que_buscar,
         'where': donde_buscar,
-        'results_per_page': 50
+        'results_per_page': resultados_por_pagina
     }
+    # Parámetros opcionales, p. ej. {'max_days_old': 3, 'sort_by': 'date'} en el modo incremental.
+    if filtros:
+        params.update(filtros)
     
     print(f"Petición a Adzuna: Buscando '{que_buscar}' en '{donde_buscar}' ({pais.upper()}) - Página {pagina}...")
     
     try:
-        respuesta = requests.get(url_endpoint, params=params)
+        respuesta = cliente_http.obtener(url_endpoint, params=params)
         print(f"URL final construida: {respuesta.url}") # Imprimimos la URL para depurar
         respuesta.raise_for_status()
         return respuesta.json()
@@ -36,56 +52,487 @@ def obtener_ofertas_adzuna(que_buscar, donde_buscar, pais='us', pagina=1):
     except requests.exceptions.RequestException as e:
         return f"Error al conectar con la API de Adzuna: {e}"
 
-if __name__ == "__main__":
-    busquedas = [
-        {'que': 'python developer', 'donde': 'california', 'pais': 'us'},
-        {'que': 'data analyst', 'donde': 'new york', 'pais': 'us'},
-        {'que': 'react developer', 'donde': 'texas', 'pais': 'us'},
+# --- PLANIFICACIÓN DE PÁGINAS ---
+
+def resultados_por_pagina_para(busqueda):
+    """
+    Elige 'results_per_page' para una búsqueda. Si la búsqueda define
+    'max_resultados', no se piden más ofertas de las necesarias; en otro caso
+    se usa el máximo permitido para hacer el menor número de peticiones.
+    """
+    max_resultados = busqueda.get('max_resultados')
+    if max_resultados:
+        return max(1, min(RESULTADOS_POR_PAGINA_MAX, max_resultados))
+    return RESULTADOS_POR_PAGINA_MAX
+
+def planificar_paginas(total_ofertas, resultados_por_pagina, max_resultados=None):
+    """
+    A partir del 'count' que devuelve la primera página, calcula las páginas
+    restantes (de la 2 en adelante) que hay que pedir para cubrir la búsqueda.
+    """
+    if max_resultados:
+        total_ofertas = min(total_ofertas, max_resultados)
+    total_paginas = -(-total_ofertas // resultados_por_pagina)  # División con redondeo hacia arriba.
+    return list(range(2, total_paginas + 1))
+
+def _resultados_de(datos_pagina):
+    """Devuelve la lista de ofertas de una página, o None si la petición falló."""
+    if isinstance(datos_pagina, str):
+        print(datos_pagina)
+        return None
+    return datos_pagina.get('results', []) if datos_pagina else []
+
+# --- LANDING Y CHECKPOINT ---
+
+RUTA_DATOS_CRUDOS = os.path.join('datos', 'crudos')
+RUTA_ESTADO = os.path.join('datos', 'estado')
+FUENTE_LANDING = 'adzuna'  # datos/crudos/adzuna/fecha=AAAA-MM-DD/ (ver almacen_crudos.py)
+ARCHIVO_CHECKPOINT = 'adzuna_checkpoint.jsonl'
+ARCHIVO_MARCAS = 'adzuna_marcas_de_agua.json'
+
+class MarcasDeAgua:
+    """
+    Guarda, por búsqueda, la fecha ('created') de la oferta más reciente vista
+    y los ids de las ofertas con esa misma fecha (para desempatar). Las marcas
+    nuevas quedan pendientes hasta que la búsqueda termina y se confirman; así
+    una caída a mitad de búsqueda no deja ofertas sin descargar.
+    """
+
+    def __init__(self, ruta=None):
+        self.ruta = ruta or os.path.join(RUTA_ESTADO, ARCHIVO_MARCAS)
+        # Un archivo de marcas dañado equivale a no tener marcas: la búsqueda se hace completa.
+        self.marcas = archivos_json.leer_json(self.ruta, {})
+        self._pendientes = {}
+
+    @staticmethod
+    def clave(busqueda):
+        return f"{busqueda['que']}|{busqueda['donde']}|{busqueda['pais']}"
+
+    def obtener(self, busqueda):
+        return self.marcas.get(self.clave(busqueda))
+
+    def es_nueva(self, busqueda, oferta):
+        """Indica si la oferta es posterior a la marca de agua de la búsqueda."""
+        marca = self.obtener(busqueda)
+        if not marca:
+            return True
+        fecha = oferta.get('created', '')
+        if fecha != marca['fecha']:
+            return fecha > marca['fecha']  # Fechas ISO 8601: el orden de texto es el cronológico.
+        return str(oferta.get('id')) not in marca['ids']
+
+    def actualizar(self, busqueda, resultados):
+        """Sube la marca pendiente con las ofertas recién guardadas."""
+        clave = self.clave(busqueda)
+        marca = self._pendientes.get(clave) or dict(self.marcas.get(clave) or {'fecha': '', 'ids': []})
+        for oferta in resultados:
+            fecha = oferta.get('created', '')
+            if fecha > marca['fecha']:
+                marca = {'fecha': fecha, 'ids': [str(oferta.get('id'))]}
+            elif fecha == marca['fecha'] and str(oferta.get('id')) not in marca['ids']:
+                marca['ids'] = marca['ids'] + [str(oferta.get('id'))]
+        self._pendientes[clave] = marca
+
+    def confirmar(self, busqueda):
+        """Hace definitiva la marca de una búsqueda terminada y la escribe en disco."""
+        marca = self._pendientes.pop(self.clave(busqueda), None)
+        if not marca or not marca['fecha']:
+            return
+        self.marcas[self.clave(busqueda)] = marca
+        archivos_json.escribir_json(self.ruta, self.marcas, indent=4)
+
+    def filtros_incrementales(self, busqueda):
+        """
+        Parámetros para pedir solo lo reciente: orden por fecha y 'max_days_old'
+        según los días transcurridos desde la marca (con un día de margen).
+        """
+        marca = self.obtener(busqueda)
+        fecha = datetime.fromisoformat(marca['fecha'].replace('Z', '+00:00'))
+        if fecha.tzinfo is None:
+            fecha = fecha.replace(tzinfo=timezone.utc)
+        dias = (datetime.now(timezone.utc) - fecha).days + 1
+        return {'sort_by': 'date', 'max_days_old': max(1, dias)}
+
+class LandingAdzuna:
+    """
+    Escribe cada página en la partición del día del almacén de crudos (una
+    oferta por línea, comprimido) en cuanto llega, y registra en un
+    checkpoint las claves (que, donde, pais, pagina) ya guardadas. Si el
+    checkpoint existe al arrancar, la ejecución anterior no terminó: se
+    reanuda en un archivo nuevo saltando lo ya guardado.
+
+    En el modo incremental no se usa el checkpoint: el landing siempre se
+    amplía y lo que permite reanudar son las marcas de agua.
+    """
+
+    def __init__(self, raiz_crudos=None, ruta_checkpoint=None, marcas=None, incremental=False):
+        raiz_crudos = raiz_crudos or RUTA_DATOS_CRUDOS
+        self.ruta_checkpoint = ruta_checkpoint or os.path.join(RUTA_ESTADO, ARCHIVO_CHECKPOINT)
+        self.marcas = marcas
+        self.incremental = incremental
+        os.makedirs(os.path.dirname(self.ruta_checkpoint), exist_ok=True)
+
+        # Página ya guardada -> 'count' que anunció la API (para planificar al reanudar).
+        self.completadas = {} if incremental else self._leer_checkpoint()
+        self.reanudando = bool(self.completadas)
+        self.total_guardadas = 0
+        self.errores = 0
+
+        # Una extracción completa desde cero sustituye a la que hubiera del mismo día.
+        if not self.reanudando and not incremental:
+            almacen_crudos.vaciar_particion(FUENTE_LANDING, raiz=raiz_crudos)
+        self._landing = almacen_crudos.EscritorCrudos(FUENTE_LANDING, raiz=raiz_crudos)
+        self.ruta_landing = os.path.dirname(self._landing.ruta)
+        self._checkpoint = open(self.ruta_checkpoint, 'a', encoding='utf-8')
+
+    @staticmethod
+    def clave(busqueda, pagina):
+        return (busqueda['que'], busqueda['donde'], busqueda['pais'], pagina)
+
+    def _leer_checkpoint(self):
+        completadas = {}
+        if not os.path.exists(self.ruta_checkpoint):
+            return completadas
+        with open(self.ruta_checkpoint, 'r', encoding='utf-8') as f:
+            for linea in f:
+                try:
+                    registro = json.loads(linea)
+                except json.JSONDecodeError:
+                    continue  # Línea cortada por una caída a mitad de escritura.
+                clave = (registro['que'], registro['donde'], registro['pais'], registro['pagina'])
+                completadas[clave] = registro.get('count')
+        return completadas
+
+    def esta_completada(self, busqueda, pagina):
+        return self.clave(busqueda, pagina) in self.completadas
+
+    def count_guardado(self, busqueda):
+        """Devuelve el 'count' registrado para la búsqueda, si su página 1 ya se guardó."""
+        return self.completadas.get(self.clave(busqueda, 1))
+
+    def guardar_pagina(self, busqueda, pagina, resultados, count=None):
+        """Añade las ofertas de la página al landing y luego marca la página como completada."""
+        self._landing.escribir(resultados)
+        self.total_guardadas += len(resultados)
+        progreso.sumar('adzuna', len(resultados))
+        if self.marcas is not None:
+            self.marcas.actualizar(busqueda, resultados)
+        if self.incremental:
+            return
+
+        que, donde, pais, _ = self.clave(busqueda, pagina)
+        registro = {'que': que, 'donde': donde, 'pais': pais, 'pagina': pagina, 'count': count}
+        self._checkpoint.write(json.dumps(registro, ensure_ascii=False) + '\n')
+        self._checkpoint.flush()
+
+        self.completadas[self.clave(busqueda, pagina)] = count
+
+    def cerrar(self, completa=False):
+        """
+        Cierra los archivos. Si la extracción terminó sin errores se borra el
+        checkpoint, para que la siguiente ejecución empiece de cero.
+        """
+        self._landing.cerrar()
+        self._checkpoint.close()
+        if completa and not self.incremental and self.errores == 0 and os.path.exists(self.ruta_checkpoint):
+            os.remove(self.ruta_checkpoint)
+
+def _recortar(busqueda, pagina, por_pagina, resultados):
+    """Recorta la última página para no pasar de 'max_resultados'."""
+    max_resultados = busqueda.get('max_resultados')
+    if not max_resultados:
+        return resultados
+    return resultados[:max(0, max_resultados - (pagina - 1) * por_pagina)]
+
+def extraer_busqueda(busqueda, landing):
+    """
+    Descarga la primera página de una búsqueda, usa su 'count' para planificar
+    el resto y recorre las páginas planificadas, guardando cada una en el
+    landing en cuanto llega. Las páginas ya registradas en el checkpoint se saltan.
+    Devuelve False si alguna petición falló.
+    """
+    que, donde, pais = busqueda['que'], busqueda['donde'], busqueda['pais']
+    por_pagina = resultados_por_pagina_para(busqueda)
+
+    print(f"\n--- Iniciando búsqueda para '{que}' en '{donde}' ({pais.upper()}) ---")
+
+    count = landing.count_guardado(busqueda)
+    if count is None:
+        primera = obtener_ofertas_adzuna(que, donde, pais, 1, por_pagina)
+        resultados = _resultados_de(primera)
+        if resultados is None:
+            landing.errores += 1
+            return False
+        if not resultados:
+            print("No se encontraron resultados. Finalizando esta búsqueda.")
+            return True
+        count = primera.get('count', len(resultados))
+        landing.guardar_pagina(busqueda, 1, _recortar(busqueda, 1, por_pagina, resultados), count)
+        print(f"Página 1: {len(resultados)} resultados. Total anunciado: {count}.")
+    else:
+        print(f"Página 1 ya guardada en una ejecución anterior (total anunciado: {count}).")
+
+    for pagina in planificar_paginas(count, por_pagina, busqueda.get('max_resultados')):
+        if landing.esta_completada(busqueda, pagina):
+            continue
+        resultados = _resultados_de(obtener_ofertas_adzuna(que, donde, pais, pagina, por_pagina))
+        if resultados is None:
+            landing.errores += 1
+            return False
+        if not resultados:
+            print("No se encontraron más resultados. Finalizando esta búsqueda.")
+            break
+        landing.guardar_pagina(busqueda, pagina, _recortar(busqueda, pagina, por_pagina, resultados), count)
+        print(f"Página {pagina}: Se obtuvieron {len(resultados)} resultados.")
+    return True
+
+def extraer_busqueda_incremental(busqueda, landing):
+    """
+    Pide solo las ofertas recientes (ordenadas por fecha y con 'max_days_old')
+    y deja de paginar en cuanto aparece una oferta anterior a la marca de agua.
+    Devuelve False si alguna petición falló.
+    """
+    que, donde, pais = busqueda['que'], busqueda['donde'], busqueda['pais']
+    por_pagina = RESULTADOS_POR_PAGINA_MAX
+    filtros = landing.marcas.filtros_incrementales(busqueda)
+
+    print(f"\n--- Búsqueda incremental para '{que}' en '{donde}' ({pais.upper()}), últimos {filtros['max_days_old']} día(s) ---")
+
+    pagina = 1
+    while True:
+        resultados = _resultados_de(obtener_ofertas_adzuna(que, donde, pais, pagina, por_pagina, filtros))
+        if resultados is None:
+            landing.errores += 1
+            return False
+
+        nuevas = [oferta for oferta in resultados if landing.marcas.es_nueva(busqueda, oferta)]
+        if nuevas:
+            landing.guardar_pagina(busqueda, pagina, nuevas)
+        print(f"Página {pagina}: {len(nuevas)} oferta(s) nueva(s) de {len(resultados)}.")
+
+        # Con orden por fecha, una oferta ya conocida indica que lo que sigue también lo es.
+        if len(nuevas) < len(resultados) or len(resultados) < por_pagina:
+            return True
+        pagina += 1
+
+def procesar_busqueda(busqueda, landing, incremental=False):
+    """
+    Extrae una búsqueda (incremental si ya tiene marca de agua) y, si terminó
+    sin errores, confirma su nueva marca de agua.
+    """
+    if incremental and landing.marcas.obtener(busqueda):
+        exito = extraer_busqueda_incremental(busqueda, landing)
+    else:
+        exito = extraer_busqueda(busqueda, landing)
+    if exito and landing.marcas is not None:
+        landing.marcas.confirmar(busqueda)
+
+# --- MODO ASÍNCRONO ---
+
+async def _pedir_pagina(semaforo, que, donde, pais, pagina, por_pagina, filtros=None):
+    """Pide una página ocupando un lugar del semáforo mientras espera la respuesta."""
+    async with semaforo:
+        return await asyncio.to_thread(obtener_ofertas_adzuna, que, donde, pais, pagina, por_pagina, filtros)
+
+class _LandingEnOrden:
+    """
+    Escritura en el landing en el orden del plan de búsquedas, para que el
+    modo asíncrono deje las ofertas en el mismo orden que el secuencial. Solo
+    escribe directamente la búsqueda a la que le toca el turno; las páginas de
+    las siguientes esperan en memoria hasta que terminan todas las anteriores.
+    La marca de agua de cada búsqueda se confirma al escribir su última página.
+    """
+
+    def __init__(self, landing, busquedas):
+        self.landing = landing
+        self.busquedas = busquedas
+        self.turno = 0
+        self._en_espera = [[] for _ in busquedas]
+        self._terminadas = {}  # Índice de la búsqueda -> si terminó sin errores.
+
+    def guardar_pagina(self, indice, pagina, resultados, count=None):
+        if indice == self.turno:
+            self.landing.guardar_pagina(self.busquedas[indice], pagina, resultados, count)
+        else:
+            self._en_espera[indice].append((pagina, resultados, count))
+
+    def terminar(self, indice, exito):
+        self._terminadas[indice] = exito
+        while self.turno in self._terminadas:
+            if self._terminadas.pop(self.turno) and self.landing.marcas is not None:
+                self.landing.marcas.confirmar(self.busquedas[self.turno])
+            self.turno += 1
+            if self.turno < len(self.busquedas):
+                for pagina, resultados, count in self._en_espera[self.turno]:
+                    self.landing.guardar_pagina(self.busquedas[self.turno], pagina, resultados, count)
+                self._en_espera[self.turno] = []
+
+async def _extraer_busqueda_async(semaforo, busqueda, landing, guardar_pagina):
+    """
+    Versión asíncrona de extraer_busqueda. Con el 'count' de la primera página
+    se conocen todas las páginas restantes, que se piden en paralelo. Las
+    páginas se entregan a 'guardar_pagina' en el orden del plan: una que llega
+    antes de tiempo espera en memoria a que lleguen las anteriores. Si alguna
+    falla, las posteriores que ya llegaron se guardan igualmente al final (en
+    orden), y la fallida se pide al reanudar desde el checkpoint.
+    """
+    que, donde, pais = busqueda['que'], busqueda['donde'], busqueda['pais']
+    por_pagina = resultados_por_pagina_para(busqueda)
+
+    count = landing.count_guardado(busqueda)
+    if count is None:
+        primera = await _pedir_pagina(semaforo, que, donde, pais, 1, por_pagina)
+        resultados = _resultados_de(primera)
+        if resultados is None:
+            landing.errores += 1
+            return False
+        if not resultados:
+            return True
+        count = primera.get('count', len(resultados))
+        guardar_pagina(1, _recortar(busqueda, 1, por_pagina, resultados), count)
+
+    paginas = [
+        pagina for pagina in planificar_paginas(count, por_pagina, busqueda.get('max_resultados'))
+        if not landing.esta_completada(busqueda, pagina)
     ]
+    print(f"[{que} | {donde}] Total anunciado: {count} -> {len(paginas)} página(s) pendiente(s).")
+
+    # Páginas que llegaron antes que alguna anterior: pagina -> resultados.
+    en_espera = {}
+    siguiente = 0  # Posición en 'paginas' de la próxima página a guardar.
+
+    def guardar(pagina, resultados):
+        if resultados:
+            guardar_pagina(pagina, _recortar(busqueda, pagina, por_pagina, resultados), count)
+
+    def guardar_en_orden():
+        nonlocal siguiente
+        while siguiente < len(paginas) and paginas[siguiente] in en_espera:
+            guardar(paginas[siguiente], en_espera.pop(paginas[siguiente]))
+            siguiente += 1
+
+    async def pedir_pagina(pagina):
+        resultados = _resultados_de(await _pedir_pagina(semaforo, que, donde, pais, pagina, por_pagina))
+        if resultados is None:
+            landing.errores += 1
+            return False
+        en_espera[pagina] = resultados
+        guardar_en_orden()
+        return True
+
+    exito = all(await asyncio.gather(*[pedir_pagina(pagina) for pagina in paginas]))
+    # Lo que quedó detrás de una página fallida se guarda igual, en orden de página.
+    for pagina in sorted(en_espera):
+        guardar(pagina, en_espera.pop(pagina))
+    return exito
+
+async def _extraer_busqueda_incremental_async(semaforo, busqueda, landing, guardar_pagina):
+    """
+    Versión asíncrona de extraer_busqueda_incremental. Las páginas de una misma
+    búsqueda van en secuencia (cada una decide si hace falta la siguiente),
+    pero las distintas búsquedas avanzan a la vez.
+    """
+    que, donde, pais = busqueda['que'], busqueda['donde'], busqueda['pais']
+    por_pagina = RESULTADOS_POR_PAGINA_MAX
+    filtros = landing.marcas.filtros_incrementales(busqueda)
+
+    pagina = 1
+    while True:
+        resultados = _resultados_de(await _pedir_pagina(semaforo, que, donde, pais, pagina, por_pagina, filtros))
+        if resultados is None:
+            landing.errores += 1
+            return False
+
+        nuevas = [oferta for oferta in resultados if landing.marcas.es_nueva(busqueda, oferta)]
+        if nuevas:
+            guardar_pagina(pagina, nuevas)
+        print(f"[{que} | {donde}] Página {pagina}: {len(nuevas)} oferta(s) nueva(s) de {len(resultados)}.")
+
+        if len(nuevas) < len(resultados) or len(resultados) < por_pagina:
+            return True
+        pagina += 1
+
+async def _procesar_busqueda_async(semaforo, indice, en_orden, incremental):
+    busqueda, landing = en_orden.busquedas[indice], en_orden.landing
 
-    todos_los_resultados = []
+    def guardar_pagina(pagina, resultados, count=None):
+        en_orden.guardar_pagina(indice, pagina, resultados, count)
+
+    exito = False
+    try:
+        if incremental and landing.marcas.obtener(busqueda):
+            exito = await _extraer_busqueda_incremental_async(semaforo, busqueda, landing, guardar_pagina)
+        else:
+            exito = await _extraer_busqueda_async(semaforo, busqueda, landing, guardar_pagina)
+    finally:
+        # También si falla: las búsquedas siguientes no pueden quedarse esperando su turno.
+        en_orden.terminar(indice, exito)
+
+async def extraer_busquedas_async(busquedas, landing, max_concurrencia=8, incremental=False):
+    """
+    Ejecuta todas las búsquedas de forma concurrente, con como máximo
+    'max_concurrencia' peticiones en vuelo. El landing queda en el mismo
+    orden que en el modo secuencial (búsqueda a búsqueda y página a página):
+    lo que llega antes de su turno espera en memoria (ver _LandingEnOrden).
+    """
+    semaforo = asyncio.Semaphore(max_concurrencia)
+    en_orden = _LandingEnOrden(landing, busquedas)
+    await asyncio.gather(*[_procesar_busqueda_async(semaforo, i, en_orden, incremental) for i in range(len(busquedas))])
+
+# --- EJECUCIÓN COMPLETA ---
+
+BUSQUEDAS = [
+    {'que': 'python developer', 'donde': 'california', 'pais': 'us'},
+    {'que': 'data analyst', 'donde': 'new york', 'pais': 'us'},
+    {'que': 'react developer', 'donde': 'texas', 'pais': 'us'},
+    # Opcional: 'max_resultados' limita la búsqueda y ajusta 'results_per_page'.
+]
+
+def ejecutar(busquedas=None, modo_async=True, max_concurrencia=8, incremental=False):
+    """
+    Extrae todas las búsquedas hacia el almacén de crudos y devuelve el número de
+    ofertas guardadas en esta ejecución. Es lo que usa ejecutar_extraccion.py.
+    """
+    busquedas = busquedas or BUSQUEDAS
 
     print("--- Iniciando extracción masiva de datos de Adzuna ---")
-    
-    for busqueda in busquedas:
-        que = busqueda['que']
-        donde = busqueda['donde']
-        pais = busqueda['pais']
-        pagina_actual = 1
-        
-        print(f"\n--- Iniciando búsqueda para '{que}' en '{donde}' ({pais.upper()}) ---")
-        
-        while True:
-            datos_pagina = obtener_ofertas_adzuna(que, donde, pais, pagina=pagina_actual)
-            
-            if isinstance(datos_pagina, str):
-                print(datos_pagina)
-                break
-
-            if datos_pagina and datos_pagina.get('results'):
-                resultados = datos_pagina['results']
-                todos_los_resultados.extend(resultados)
-                print(f"Página {pagina_actual}: Se obtuvieron {len(resultados)} resultados.")
-                
-                if len(resultados) < 50:
-                    print("Última página alcanzada para esta búsqueda.")
-                    break
-                
-                pagina_actual += 1
-                time.sleep(0.1)
-            else:
-                print("No se encontraron más resultados. Finalizando esta búsqueda.")
-                break
-    
-    if todos_los_resultados:
-        print(f"\n--- Proceso completado. Total de ofertas extraídas: {len(todos_los_resultados)} ---")
-        ruta_salida = os.path.join('datos', 'crudos')
-        os.makedirs(ruta_salida, exist_ok=True)
-        nombre_archivo = "adzuna_datos_crudos.json"
-        
-        with open(os.path.join(ruta_salida, nombre_archivo), 'w', encoding='utf-8') as f:
-            json.dump(todos_los_resultados, f, ensure_ascii=False, indent=4)
-        
-        print(f"Todos los datos han sido guardados en: '{os.path.join(ruta_salida, nombre_archivo)}'")
-    else:
-        print("\nNA")
+
+    landing = LandingAdzuna(marcas=MarcasDeAgua(), incremental=incremental)
+    if landing.reanudando:
+        print(f"Checkpoint encontrado: se reanuda la extracción ({len(landing.completadas)} página(s) ya guardadas).")
+    if incremental:
+        print("Modo incremental activado: se añadirán solo las ofertas nuevas al landing.")
+
+    completa = False
+    try:
+        if modo_async:
+            print(f"Modo asíncrono activado (concurrencia máxima: {max_concurrencia}).")
+            asyncio.run(extraer_busquedas_async(busquedas, landing, max_concurrencia, incremental))
+        else:
+            for busqueda in busquedas:
+                procesar_busqueda(busqueda, landing, incremental)
+        completa = True
+    finally:
+        # Ante un Ctrl-C o una caída el checkpoint se conserva para reanudar.
+        landing.cerrar(completa)
+
+    print(f"\n--- Proceso completado. Ofertas guardadas en esta ejecución: {landing.total_guardadas} ---")
+    print(f"Los datos se han guardado en: '{landing.ruta_landing}'")
+    if landing.errores:
+        print(f"Hubo {landing.errores} página(s) con error. Vuelve a ejecutar el script para reanudar desde el checkpoint.")
+    return landing.total_guardadas
+
+# --- PUNTO DE ENTRADA DEL SCRIPT ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extracción de ofertas desde la API de Adzuna.")
+    parser.add_argument('--async', dest='modo_async', action='store_true',
+                        help="Ejecuta las búsquedas y páginas de forma concurrente.")
+    parser.add_argument('--concurrencia', type=int, default=8,
+                        help="Máximo de peticiones simultáneas en el modo asíncrono (por defecto 8).")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Solo descarga ofertas posteriores a la marca de agua de cada búsqueda.")
+    cache_respuestas.agregar_argumentos(parser)
+    args = parser.parse_args()
+    cache_respuestas.configurar_desde_argumentos(args)
+
+    ejecutar(BUSQUEDAS, args.modo_async, args.concurrencia, args.incremental)
@@ -0,0 +1,267 @@
+# Almacén de datos crudos: JSONL comprimido y particionado por fuente y fecha.
+#
+# Cada extractor escribe sus registros en
+#   datos/crudos/<fuente>/fecha=AAAA-MM-DD/parte-<hora>-<pid>.jsonl.zst
+# con un registro por línea. Se comprime con zstd si está instalado
+# 'zstandard' (si no, con gzip) y se serializa con orjson si está instalado
+# (si no, con json). Los lectores recorren las particiones como un flujo, un
+# registro cada vez, y pueden limitarse a un rango de fechas. Las fuentes que
+# se vuelven a extraer enteras cada día repiten ofertas entre particiones; sus
+# transformaciones leen con leer_sin_duplicados.
+#
+# Los archivos anteriores a este formato (p. ej. jooble_datos_crudos.json) se
+# siguen leyendo como parte de su fuente hasta que se borren; si está
+# instalado 'ijson' también se leen como flujo, sin cargarlos enteros.
+
+import gzip
+import json
+import os
+import threading
+import zlib
+from datetime import date, datetime
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# --- CONFIGURACIÓN PRINCIPAL ---
+
+RUTA_CRUDOS = os.path.join('datos', 'crudos')
+NIVEL_ZSTD = 3      # Buen equilibrio entre velocidad y tamaño para JSON.
+NIVEL_GZIP = 6
+
+# Archivos de antes del particionado que todavía cuentan como datos de cada fuente.
+ARCHIVOS_LEGADOS = {
+    'adzuna': ['adzuna_datos_crudos.jsonl', 'adzuna_datos_crudos.json'],
+    'jooble': ['jooble_datos_crudos.json'],
+    'jsearch': ['jsearch_datos_crudos.json'],
+    'jsearch_detalles': ['jsearch_detalles.jsonl'],
+}
+
+EXTENSION = '.jsonl.zst' if zstandard is not None else '.jsonl.gz'
+
+# Errores de un archivo comprimido cuyo último bloque quedó a medias.
+_ERRORES_DE_TRUNCADO = (EOFError, zlib.error) + ((zstandard.ZstdError,) if zstandard is not None else ())
+
+
+def serializar(registro):
+    if orjson is not None:
+        return orjson.dumps(registro) + b'\n'
+    return (json.dumps(registro, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+def deserializar(linea):
+    return orjson.loads(linea) if orjson is not None else json.loads(linea)
+
+
+def ruta_particion(fuente, fecha=None, raiz=RUTA_CRUDOS):
+    """Carpeta de la partición de una fuente para una fecha (por defecto, hoy)."""
+    fecha = fecha or date.today()
+    if not isinstance(fecha, str):
+        fecha = fecha.isoformat()
+    return os.path.join(raiz, fuente, f"fecha={fecha}")
+
+
+class EscritorCrudos:
+    """
+    Escribe registros en un archivo nuevo de la partición del día. Se puede
+    compartir entre hilos. Cada llamada a escribir() cierra un bloque
+    comprimido completo, así lo ya escrito es legible aunque el proceso se
+    corte a mitad de la ejecución.
+    """
+
+    def __init__(self, fuente, fecha=None, raiz=RUTA_CRUDOS):
+        carpeta = ruta_particion(fuente, fecha, raiz)
+        os.makedirs(carpeta, exist_ok=True)
+        nombre = f"parte-{datetime.now().strftime('%H%M%S%f')}-{os.getpid()}{EXTENSION}"
+        self.ruta = os.path.join(carpeta, nombre)
+        self.registros = 0
+        self._archivo = open(self.ruta, 'wb')
+        if zstandard is not None:
+            self._comprimido = zstandard.ZstdCompressor(level=NIVEL_ZSTD).stream_writer(self._archivo)
+        else:
+            self._comprimido = gzip.GzipFile(fileobj=self._archivo, mode='wb', compresslevel=NIVEL_GZIP)
+        self._candado = threading.Lock()
+
+    def escribir(self, registros):
+        if not registros:
+            return
+        datos = b''.join(serializar(registro) for registro in registros)
+        with self._candado:
+            self._comprimido.write(datos)
+            if zstandard is not None:
+                self._comprimido.flush(zstandard.FLUSH_FRAME)
+            else:
+                self._comprimido.flush(zlib.Z_SYNC_FLUSH)
+            self._archivo.flush()
+            self.registros += len(registros)
+
+    def cerrar(self):
+        with self._candado:
+            if self._archivo.closed:
+                return
+            self._comprimido.close()
+            self._archivo.close()  # El escritor de zstd ya lo cierra; el de gzip no.
+        # Un escritor que no llegó a escribir nada no deja archivos vacíos.
+        if self.registros == 0:
+            os.remove(self.ruta)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+def _bloques_zstd(archivo, tamano=1 << 16):
+    """
+    Descomprime un archivo zstd de varios frames. Si el último frame quedó a
+    medias (el proceso se cortó al escribir), se devuelve lo que se pudo
+    descomprimir de él y se termina sin error.
+    """
+    dctx = zstandard.ZstdDecompressor()
+    frame = dctx.decompressobj()
+    while True:
+        datos = archivo.read(tamano)
+        if not datos:
+            return
+        while datos:
+            yield frame.decompress(datos)
+            if not frame.eof:
+                break
+            # Empieza el siguiente frame: lo que sobró del bloque leído es suyo.
+            datos = frame.unused_data
+            frame = dctx.decompressobj()
+
+
+def _lineas(bloques):
+    """Parte en líneas un flujo de bloques de bytes."""
+    resto = b''
+    for bloque in bloques:
+        lineas = (resto + bloque).split(b'\n')
+        resto = lineas.pop()
+        yield from lineas
+    if resto:
+        yield resto
+
+
+def _lineas_de(ruta, archivo):
+    if ruta.endswith('.zst'):
+        if zstandard is None:
+            raise ImportError(f"Para leer '{ruta}' hace falta el paquete 'zstandard'.")
+        return _lineas(_bloques_zstd(archivo))
+    if ruta.endswith('.gz'):
+        return gzip.GzipFile(fileobj=archivo, mode='rb')
+    return archivo
+
+
+def leer_archivo(ruta):
+    """Recorre los registros de un archivo crudo (.jsonl.zst, .jsonl.gz, .jsonl o .json)."""
+    if ruta.endswith('.json'):
+        # Formato antiguo: un único documento JSON con la lista de registros.
+        # Con ijson se recorre elemento a elemento sin cargar el archivo entero.
+        if ijson is not None:
+            with open(ruta, 'rb') as f:
+                try:
+                    yield from ijson.items(f, 'item', use_float=True)
+                except ijson.JSONError:
+                    print(f"Advertencia: '{ruta}' no es un JSON válido; se lee hasta donde es válido.")
+            return
+        with open(ruta, 'r', encoding='utf-8') as f:
+            try:
+                yield from json.load(f)
+            except json.JSONDecodeError:
+                print(f"Advertencia: '{ruta}' no es un JSON válido, se ignora.")
+        return
+
+    with open(ruta, 'rb') as archivo:
+        try:
+            for linea in _lineas_de(ruta, archivo):
+                if not linea.strip():
+                    continue
+                try:
+                    yield deserializar(linea)
+                except ValueError:
+                    continue  # Línea cortada por una caída a mitad de escritura.
+        except _ERRORES_DE_TRUNCADO:
+            # El último bloque quedó incompleto: lo anterior ya se ha leído.
+            print(f"Advertencia: '{ruta}' termina de forma incompleta; se lee hasta donde es válido.")
+
+
+def particiones(fuente, desde=None, hasta=None, raiz=RUTA_CRUDOS):
+    """Devuelve las carpetas de partición de la fuente entre 'desde' y 'hasta' (AAAA-MM-DD, inclusivas)."""
+    carpeta = os.path.join(raiz, fuente)
+    if not os.path.isdir(carpeta):
+        return []
+    elegidas = []
+    for nombre in sorted(os.listdir(carpeta)):
+        if not nombre.startswith('fecha='):
+            continue
+        fecha = nombre[len('fecha='):]
+        if (desde and fecha < str(desde)) or (hasta and fecha > str(hasta)):
+            continue
+        elegidas.append(os.path.join(carpeta, nombre))
+    return elegidas
+
+
+def archivos(fuente, desde=None, hasta=None, incluir_legado=True, raiz=RUTA_CRUDOS):
+    """Archivos que forman los datos de una fuente, del más antiguo al más reciente."""
+    rutas = []
+    if incluir_legado and not desde:
+        for nombre in ARCHIVOS_LEGADOS.get(fuente, []):
+            ruta = os.path.join(raiz, nombre)
+            if os.path.exists(ruta):
+                # Si hay varios formatos antiguos, el primero de la lista es el más reciente.
+                rutas.append(ruta)
+                break
+    for carpeta in particiones(fuente, desde, hasta, raiz):
+        rutas.extend(
+            os.path.join(carpeta, nombre) for nombre in sorted(os.listdir(carpeta))
+            if nombre.startswith('parte-') and nombre.endswith(('.jsonl.zst', '.jsonl.gz'))
+        )
+    return rutas
+
+
+def leer(fuente, desde=None, hasta=None, incluir_legado=True, raiz=RUTA_CRUDOS):
+    """Recorre, como un flujo, todos los registros de una fuente en el rango de fechas."""
+    for ruta in archivos(fuente, desde, hasta, incluir_legado, raiz):
+        yield from leer_archivo(ruta)
+
+
+def leer_sin_duplicados(fuente, clave, desde=None, hasta=None, incluir_legado=True, raiz=RUTA_CRUDOS):
+    """
+    Como leer(), pero cada registro sale una sola vez aunque se haya extraído
+    en varias fechas: se recorren los archivos del más reciente al más antiguo
+    y se queda la versión más reciente. 'clave' devuelve el identificador de
+    un registro; los registros sin identificador salen siempre.
+    """
+    vistas = set()
+    for ruta in reversed(archivos(fuente, desde, hasta, incluir_legado, raiz)):
+        for registro in leer_archivo(ruta):
+            identificador = clave(registro)
+            if identificador is not None:
+                if identificador in vistas:
+                    continue
+                vistas.add(identificador)
+            yield registro
+
+
+def vaciar_particion(fuente, fecha=None, raiz=RUTA_CRUDOS):
+    """Borra los archivos de la partición del día (para repetir una extracción completa)."""
+    carpeta = ruta_particion(fuente, fecha, raiz)
+    if not os.path.isdir(carpeta):
+        return
+    for nombre in os.listdir(carpeta):
+        if nombre.startswith('parte-'):
+            os.remove(os.path.join(carpeta, nombre))
@@ -0,0 +1,41 @@
+# Lectura y escritura atómica de archivos JSON de estado y caché del ETL.
+#
+# El JSON se escribe en un archivo temporal de la misma carpeta y luego se
+# sustituye el definitivo con os.replace, que es atómico: un corte a mitad de
+# escritura deja el archivo anterior intacto y quien lo lea nunca ve un JSON a
+# medias. El nombre temporal lleva el proceso y el hilo, así varios hilos o
+# procesos pueden escribir el mismo archivo a la vez (gana el último).
+#
+# Al leer, un archivo que falta o que no se puede interpretar (p. ej. uno
+# truncado por una versión anterior sin escritura atómica) se trata como si no
+# existiera: el estado se reconstruye en lugar de romper la ejecución.
+
+import json
+import os
+import threading
+
+
+def leer_json(ruta, por_defecto=None):
+    """Contenido JSON de 'ruta', o 'por_defecto' si no existe o no se puede leer."""
+    try:
+        with open(ruta, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return por_defecto
+
+
+def escribir_json(ruta, datos, indent=None):
+    """Escribe 'datos' como JSON en 'ruta' de forma atómica, creando la carpeta si hace falta."""
+    carpeta = os.path.dirname(ruta)
+    if carpeta:
+        os.makedirs(carpeta, exist_ok=True)
+    ruta_temporal = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(ruta_temporal, 'w', encoding='utf-8') as f:
+            json.dump(datos, f, ensure_ascii=False, indent=indent)
+        os.replace(ruta_temporal, ruta)
+    except BaseException:
+        # Sin restos: un temporal a medias no sirve para nada.
+        if os.path.exists(ruta_temporal):
+            os.remove(ruta_temporal)
+        raise
@@ -0,0 +1,108 @@
+# Benchmark del aplanado de Jooble: registro a registro frente a por columnas.
+#
+# Genera registros sintéticos con la forma de los de la API (claves que
+# faltan, salarios enteros y decimales y, con --anidados, un diccionario y una
+# lista por registro) y los aplana como lo hacía la versión anterior (un
+# diccionario plano por registro y pd.DataFrame sobre todos ellos) y con
+# script.aplanar (esquema inferido una vez y una lista por columna). Muestra
+# el mejor tiempo de cada camino y comprueba que salen las mismas columnas.
+#
+# Uso (desde la raíz del proyecto):
+#   python source/ETL/benchmark/benchmark_aplanado_jooble.py --registros 200000 --anidados
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(os.path.join(parent_dir, 'jooble_API'))
+import script
+
+UBICACIONES = ['Lima', 'Bogotá', 'Santiago', 'Ciudad de México', 'Buenos Aires', 'Quito']
+SALARIOS = ['', '2500 PEN', 48000, 61234.56, '3000 - 4000 USD']
+
+
+def registro_sintetico(i, azar, anidados=False):
+    """Un registro con la forma de los de Jooble; algunos campos faltan con cierta probabilidad."""
+    registro = {
+        'id': 7000000000000000000 + i,
+        'title': f"Desarrollador {i % 300}",
+        'location': azar.choice(UBICACIONES),
+        'snippet': "Buscamos una persona para el equipo de desarrollo. " * 3,
+        'source': 'computrabajo.com',
+        'type': azar.choice(['Tiempo completo', 'Medio tiempo', '']),
+        'link': f"https://pe.jooble.org/desc/{7000000000000000000 + i}",
+        'company': f"Empresa {i % 1500}",
+        'updated': '2025-06-01T12:00:00.0000000',
+    }
+    if azar.random() < 0.7:
+        registro['salary'] = azar.choice(SALARIOS)
+    if anidados:
+        if azar.random() < 0.9:
+            registro['detalle'] = {'sector': 'TI', 'nivel': {'nombre': 'Senior', 'orden': i % 4}}
+        registro['etiquetas'] = ['python', 'sql'][:i % 3]
+    return registro
+
+
+def _aplanar_registro(datos, prefijo="", sep="_"):
+    """Aplanado de la versión anterior: un diccionario plano por registro, listas como texto JSON."""
+    plano = {}
+    for clave, valor in datos.items():
+        nueva = f"{prefijo}{sep}{clave}" if prefijo else clave
+        if isinstance(valor, dict):
+            plano.update(_aplanar_registro(valor, nueva, sep=sep))
+        elif isinstance(valor, list):
+            plano[nueva] = json.dumps(valor, ensure_ascii=False)
+        else:
+            plano[nueva] = valor
+    return plano
+
+
+def por_registro(registros):
+    df = pd.DataFrame([_aplanar_registro(registro) for registro in registros])
+    return df.reindex(sorted(df.columns), axis=1)
+
+
+def por_columnas(registros):
+    # Como script.aplanar, sin la tabla de Arrow del Parquet (que la versión anterior no generaba).
+    esquema, columnas_lista = script.inferir_esquema(registros)
+    return script.columnas_a_dataframe(script.aplanar_en_columnas(registros, esquema), columnas_lista)
+
+
+def medir(nombre, funcion, registros, repeticiones):
+    """Ejecuta 'funcion' varias veces y se queda con el mejor tiempo (el menos afectado por el resto del sistema)."""
+    segundos = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        df = funcion(registros)
+        segundos = min(segundos, time.perf_counter() - inicio)
+    print(f"{nombre:<16} {segundos:>8.2f} s  {len(registros) / segundos:>12,.0f} registros/s")
+    return df, segundos
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara el aplanado de Jooble registro a registro y por columnas.")
+    parser.add_argument('--registros', type=int, default=200000, help="Registros sintéticos (por defecto 200000).")
+    parser.add_argument('--repeticiones', type=int, default=3, help="Veces que se mide cada camino (por defecto 3).")
+    parser.add_argument('--anidados', action='store_true', help="Añade un diccionario anidado y una lista a cada registro.")
+    args = parser.parse_args()
+
+    print(f"Generando {args.registros} registros sintéticos...")
+    azar = random.Random(42)
+    registros = [registro_sintetico(i, azar, args.anidados) for i in range(args.registros)]
+
+    print("\n--- Aplanado (solo el DataFrame del CSV) ---")
+    antes_df, antes = medir("por registro", por_registro, registros, args.repeticiones)
+    ahora_df, ahora = medir("por columnas", por_columnas, registros, args.repeticiones)
+    print(f"Aceleración: x{antes / ahora:.1f}")
+
+    mismas = list(antes_df.columns) == list(ahora_df.columns)
+    print(f"Mismas columnas: {'sí' if mismas else 'NO'}")
+    if not mismas:
+        sys.exit(1)
@@ -0,0 +1,159 @@
+# Benchmark de extracción contra los servidores simulados.
+#
+# Levanta servidor_simulado.py en local, apunta cada extractor a su API
+# simulada y mide, para varios niveles de concurrencia, el tiempo total de la
+# cosecha, las peticiones por segundo y cuántas respuestas 429 se recibieron.
+#
+# Uso (desde la raíz del proyecto):
+#   python source/ETL/benchmark/benchmark_extraccion.py --concurrencias 1,4,16
+
+import argparse
+import asyncio
+import contextlib
+import importlib.util
+import io
+import os
+import sys
+import tempfile
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+sys.path.append(current_dir)
+
+# Los extractores leen sus claves de config.py (no versionado). Contra el
+# servidor simulado las claves dan igual, así que basta con unas de relleno.
+try:
+    import config  # noqa: F401
+except ImportError:
+    sys.modules['config'] = types.SimpleNamespace(APP_ID='simulado', APP_KEY='simulado', APP_KEY_JSearch='simulado')
+
+import limitador_tasa
+from servidor_simulado import ServidoresSimulados
+
+# Las tasas aprendidas contra 127.0.0.1 no deben mezclarse con las reales.
+limitador_tasa.PERSISTIR_TASAS = False
+
+PAISES_JSEARCH = [('United States', 'us'), ('Mexico', 'mx'), ('Colombia', 'co'), ('Chile', 'cl'), ('Argentina', 'ar'), ('Brazil', 'br')]
+TERMINOS_JSEARCH = ["Data Scientist", "Data Analyst", "Software Developer", "Python Developer",
+                    "Frontend Developer", "Backend Developer", "DevOps Engineer"]
+PAISES_JOOBLE = ["Peru", "Mexico", "Colombia", "Chile", "Argentina", "Ecuador", "United States"]
+TERMINOS_JOOBLE = ["informatica", "sistemas", "programacion", "desarrollador", "software",
+                   "analista de datos", "data scientist", "ingeniero de datos", "ciberseguridad",
+                   "soporte tecnico", "redes y telecomunicaciones", "devops", "cloud", "arquitecto de software",
+                   "frontend", "backend", "fullstack", "mobile developer", "analista funcional",
+                   "jefe de proyecto ti", "product owner", "scrum master", "qa tester"]
+MONEDAS = ["USD", "PEN", "EUR", "BRL", "COP", "MXN", "CLP", "ARS"]
+
+
+def _cargar_modulo(nombre, ruta_relativa):
+    """Importa un extractor por ruta (hay varios archivos llamados extractor.py)."""
+    spec = importlib.util.spec_from_file_location(nombre, os.path.join(parent_dir, ruta_relativa))
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+# --- COSECHAS (una por extractor) ---
+
+def cosechar_adzuna(modulo, concurrencia, n_busquedas):
+    busquedas = [{'que': f"rol {i}", 'donde': f"region {i % 7}", 'pais': 'us'} for i in range(n_busquedas)]
+    with tempfile.TemporaryDirectory() as carpeta:
+        landing = modulo.LandingAdzuna(carpeta, os.path.join(carpeta, 'checkpoint.jsonl'))
+        asyncio.run(modulo.extraer_busquedas_async(busquedas, landing, concurrencia))
+        landing.cerrar(True)
+    return landing.total_guardadas
+
+
+def cosechar_jsearch(modulo, concurrencia):
+    def consulta(par):
+        (nombre, codigo), termino = par
+        # Recorre las páginas igual que el extractor, agrupadas con num_pages.
+        ofertas, _ = modulo.extraer_consulta(f"{termino} in {nombre}", codigo)
+        return len(ofertas)
+    pares = [(pais, termino) for pais in PAISES_JSEARCH for termino in TERMINOS_JSEARCH]
+    with ThreadPoolExecutor(concurrencia) as pool:
+        return sum(pool.map(consulta, pares))
+
+
+def cosechar_jooble(modulo, concurrencia):
+    # Como el extractor: todas las páginas de cada término y sin repetir ofertas entre términos.
+    vistas = modulo.OfertasVistas()
+
+    def consulta(par):
+        pais, termino = par
+        return len(modulo.buscar_termino(pais, termino, vistas))
+    pares = [(pais, termino) for pais in PAISES_JOOBLE for termino in TERMINOS_JOOBLE]
+    with ThreadPoolExecutor(concurrencia) as pool:
+        return sum(pool.map(consulta, pares))
+
+
+def cosechar_tasas(modulo, concurrencia, repeticiones=5):
+    with ThreadPoolExecutor(concurrencia) as pool:
+        respuestas = pool.map(modulo.run, MONEDAS * repeticiones)
+        return sum(1 for r in respuestas if r and r.get('result') == 'success')
+
+
+# --- PROGRAMA PRINCIPAL ---
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide el rendimiento de los extractores contra APIs simuladas.")
+    parser.add_argument('--fuentes', default='adzuna,jsearch,jooble,tasas',
+                        help="Fuentes a medir, separadas por comas.")
+    parser.add_argument('--concurrencias', default='1,4,16',
+                        help="Niveles de concurrencia a probar, separados por comas.")
+    parser.add_argument('--busquedas-adzuna', type=int, default=12,
+                        help="Número de búsquedas (que, donde) de la cosecha de Adzuna.")
+    parser.add_argument('--tasa-maxima', type=float, default=1000.0,
+                        help="Techo del limitador AIMD en req/s (alto para medir la concurrencia real).")
+    args = parser.parse_args()
+
+    limitador_tasa.TASA_INICIAL_POR_DEFECTO = args.tasa_maxima
+    limitador_tasa.TASA_MAXIMA_POR_DEFECTO = args.tasa_maxima
+
+    servidores = ServidoresSimulados()
+    urls = servidores.iniciar()
+
+    adzuna = _cargar_modulo('bench_adzuna', os.path.join('adzuna_API', 'getdata.py'))
+    jsearch = _cargar_modulo('bench_jsearch', os.path.join('JSearch_API', 'extract_jsearch.py'))
+    jooble = _cargar_modulo('bench_jooble', os.path.join('jooble_API', 'extractor.py'))
+    tasas = _cargar_modulo('bench_tasas', os.path.join('Cliente', 'obtener_tasas_de_cambio.py'))
+    adzuna.ADZUNA_URL_BASE = urls['adzuna']
+    jsearch.JSEARCH_URL_BASE = urls['jsearch']
+    jooble.JOOBLE_URL_BASE = urls['jooble']
+    tasas.BASE_URL = urls['tasas']
+
+    cosechas = {
+        'adzuna': lambda c: cosechar_adzuna(adzuna, c, args.busquedas_adzuna),
+        'jsearch': lambda c: cosechar_jsearch(jsearch, c),
+        'jooble': lambda c: cosechar_jooble(jooble, c),
+        'tasas': lambda c: cosechar_tasas(tasas, c),
+    }
+
+    fuentes = [f.strip() for f in args.fuentes.split(',') if f.strip()]
+    concurrencias = [int(c) for c in args.concurrencias.split(',')]
+
+    print("--- Benchmark de extracción contra APIs simuladas ---")
+    print(f"{'fuente':<9}{'conc.':>6}{'peticiones':>12}{'429':>6}{'tiempo (s)':>12}{'req/s':>9}{'registros':>11}")
+    try:
+        for fuente in fuentes:
+            perfil = servidores.perfiles[fuente]
+            for concurrencia in concurrencias:
+                # Cada medición empieza con limitadores nuevos y contadores a cero.
+                limitador_tasa._limitadores.clear()
+                perfil.reiniciar_contadores()
+                inicio = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    registros = cosechas[fuente](concurrencia)
+                duracion = time.perf_counter() - inicio
+                print(f"{fuente:<9}{concurrencia:>6}{perfil.peticiones:>12}{perfil.rechazadas:>6}"
+                      f"{duracion:>12.2f}{perfil.peticiones / duracion:>9.1f}{registros:>11}")
+    finally:
+        servidores.detener()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# Benchmark del análisis de páginas de Computrabajo con cada motor HTML.
+#
+# Analiza páginas de resultados guardadas (las que deja el extractor con
+# --guardar-html) con cada motor instalado, comprueba que todos devuelven las
+# mismas ofertas y muestra el tiempo medio por página. Como referencia se mide
+# también 'html.parser' construyendo el árbol de la página completa, que es lo
+# que hacía el extractor antes de limitarse a los contenedores de oferta.
+#
+# Si no hay páginas guardadas se usa una página sintética con el mismo marcado
+# que las de Computrabajo.
+#
+# Uso (desde la raíz del proyecto):
+#   python source/ETL/computrabajo_webscraping/extractor.py --guardar-html datos/paginas/computrabajo
+#   python source/ETL/benchmark/benchmark_parseo_computrabajo.py --paginas datos/paginas/computrabajo
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(os.path.join(parent_dir, 'computrabajo_webscraping'))
+import extractor
+
+CARPETA_PAGINAS = os.path.join('datos', 'paginas', 'computrabajo')
+
+OFERTA_SINTETICA = """
+<article class="box_offer" data-id="{id}">
+  <h2 class="fs18 fwB"><a class="js-o-link fc_base" href="/ofertas-de-trabajo/oferta-de-trabajo-de-analista-sql-{id}">
+    Analista SQL {i}</a></h2>
+  <p class="dFlex vm_fx fs16 fc_base mt5"><a class="fc_base t_ellipsis" href="/empresa-{i}">Empresa {i} S.A.C.</a>
+    <span class="fc_aux">4,1 <span class="icon i_star"></span></span></p>
+  <p class="fs16 fc_base mt5"><span class="mr10">Lima, Lima</span></p>
+  <div class="fs13 mt15">
+    <span class="dIB mr10"><span class="icon i_salary"></span>S/ 3.500,00 (Mensual)</span>
+    <span class="dIB mr10"><span class="icon i_home_office"></span>Presencial y remoto</span>
+  </div>
+  <p class="fs13 fc_aux mt15">Hace {i} horas</p>
+</article>
+"""
+
+
+def pagina_sintetica(ofertas=20):
+    """Página de resultados con cabecera, filtros y scripts alrededor de 'ofertas' contenedores."""
+    relleno = ''.join(
+        f'<li class="filtro"><a href="/trabajo-de-sql?f={i}">Filtro {i}</a><span class="cont">({i})</span></li>'
+        for i in range(600)
+    )
+    scripts = '<script>' + 'var datos = {"clave": "valor"};' * 2000 + '</script>'
+    cuerpo = ''.join(OFERTA_SINTETICA.format(id=f"{i:032X}", i=i) for i in range(ofertas))
+    return (f'<html><head><title>Trabajo de SQL</title>{scripts}</head><body>'
+            f'<header><nav><ul>{relleno}</ul></nav></header><main><section>{cuerpo}</section></main>'
+            f'<footer><ul>{relleno}</ul></footer>{scripts}</body></html>')
+
+
+def cargar_paginas(carpeta):
+    rutas = sorted(glob.glob(os.path.join(carpeta, '*.html')))
+    paginas = []
+    for ruta in rutas:
+        with open(ruta, 'r', encoding='utf-8') as f:
+            paginas.append(f.read())
+    return paginas
+
+
+def medir(paginas, motor, repeticiones):
+    """Analiza todas las páginas 'repeticiones' veces; devuelve (ms por página, ofertas de la última pasada)."""
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        ofertas = [extractor.analizar_pagina(html, 'pe', 'sql', motor) for html in paginas]
+    segundos = time.perf_counter() - inicio
+    return segundos * 1000 / (repeticiones * len(paginas)), ofertas
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara el tiempo de análisis por página de cada motor HTML.")
+    parser.add_argument('--paginas', default=CARPETA_PAGINAS,
+                        help=f"Carpeta con páginas .html guardadas (por defecto {CARPETA_PAGINAS}).")
+    parser.add_argument('--repeticiones', type=int, default=5, help="Pasadas sobre todas las páginas (por defecto 5).")
+    args = parser.parse_args()
+
+    paginas = cargar_paginas(args.paginas)
+    if paginas:
+        print(f"{len(paginas)} página(s) guardada(s) en '{args.paginas}'.")
+    else:
+        print(f"No hay páginas guardadas en '{args.paginas}'; se usa una página sintética.")
+        paginas = [pagina_sintetica()]
+    print(f"Tamaño medio: {sum(len(p) for p in paginas) / len(paginas) / 1024:.0f} KB por página.\n")
+
+    # Referencia: árbol completo de la página con html.parser (sin SoupStrainer).
+    solo_ofertas = extractor._SOLO_OFERTAS
+    extractor._SOLO_OFERTAS = None
+    try:
+        base, referencia = medir(paginas, 'html.parser', args.repeticiones)
+    finally:
+        extractor._SOLO_OFERTAS = solo_ofertas
+
+    print(f"{'motor':<28}{'ms/página':>10}{'aceleración':>13}  ofertas")
+    print(f"{'html.parser (página entera)':<28}{base:>10.2f}{'x1.0':>13}  {sum(len(o) for o in referencia)}")
+    distintos = []
+    for motor in extractor.motores_disponibles()[::-1]:
+        ms, ofertas = medir(paginas, motor, args.repeticiones)
+        print(f"{motor:<28}{ms:>10.2f}{f'x{base / ms:.1f}':>13}  {sum(len(o) for o in ofertas)}")
+        if ofertas != referencia:
+            distintos.append(motor)
+
+    if distintos:
+        print(f"\nATENCIÓN: {', '.join(distintos)} no devuelve(n) las mismas ofertas que la referencia.")
+        sys.exit(1)
+    print("\nTodos los motores devuelven las mismas ofertas.")
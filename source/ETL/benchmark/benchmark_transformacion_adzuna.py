@@ -0,0 +1,90 @@
+# Benchmark de la transformación de Adzuna: oferta a oferta frente a por columnas.
+#
+# Genera ofertas sintéticas con la forma de las de la API (con claves que
+# faltan, áreas de distinto largo y salarios enteros y decimales), las
+# transforma con transformar_oferta (un diccionario por oferta) y con
+# transformar_bloque (una lista por columna, sin diccionarios intermedios),
+# comprueba que ambos CSV salen idénticos y muestra el tiempo de cada camino.
+#
+# Uso (desde la raíz del proyecto):
+#   python source/ETL/benchmark/benchmark_transformacion_adzuna.py --ofertas 1000000
+
+import argparse
+import os
+import random
+import sys
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(os.path.join(parent_dir, 'adzuna_API'))
+import from_json_to_csv
+
+AREAS = [
+    ['US'], ['US', 'California'], ['US', 'California', 'Los Angeles County'],
+    ['US', 'New York', 'New York City'], ['US', 'Texas', 'Austin'],
+]
+SALARIOS = [48000, 55000, 61234.56, 72000, 85000.5, 120000]
+
+
+def oferta_sintetica(i, azar):
+    """Una oferta con la forma de las de Adzuna; cada campo opcional falta con cierta probabilidad."""
+    oferta = {
+        'id': str(4000000000 + i),
+        'title': f"Data Engineer {i % 500}",
+        'description': "Buscamos una persona para el equipo de datos. " * 4,
+        'created': '2025-06-01T12:00:00Z',
+        '__CLASS__': 'Adzuna::API::Response::Job',
+        'redirect_url': f"https://www.adzuna.com/land/ad/{4000000000 + i}",
+    }
+    if azar.random() < 0.95:
+        oferta['company'] = {'display_name': f"Empresa {i % 2000}", '__CLASS__': 'Adzuna::API::Response::Company'}
+    if azar.random() < 0.98:
+        oferta['location'] = {'display_name': 'Los Angeles, California', 'area': azar.choice(AREAS)}
+    if azar.random() < 0.6:
+        oferta['salary_min'] = azar.choice(SALARIOS)
+        oferta['salary_max'] = oferta['salary_min'] + 10000
+    if azar.random() < 0.5:
+        oferta['contract_time'] = azar.choice(['full_time', 'part_time'])
+    oferta['category'] = {'label': 'IT Jobs', 'tag': 'it-jobs'}
+    return oferta
+
+
+def medir(nombre, funcion, ofertas, tamano_bloque):
+    inicio = time.perf_counter()
+    bloques = [
+        funcion(ofertas[i:i + tamano_bloque])
+        for i in range(0, len(ofertas), tamano_bloque)
+    ]
+    segundos = time.perf_counter() - inicio
+    print(f"{nombre:<16} {segundos:>8.2f} s  {len(ofertas) / segundos:>12,.0f} ofertas/s")
+    return bloques, segundos
+
+
+def por_oferta(ofertas):
+    return from_json_to_csv.transformar_ofertas(ofertas)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara la transformación de Adzuna oferta a oferta y por columnas.")
+    parser.add_argument('--ofertas', type=int, default=1000000, help="Ofertas sintéticas (por defecto 1000000).")
+    parser.add_argument('--tamano-bloque', type=int, default=from_json_to_csv.TAMANO_BLOQUE,
+                        help=f"Ofertas por bloque (por defecto {from_json_to_csv.TAMANO_BLOQUE}).")
+    args = parser.parse_args()
+
+    print(f"Generando {args.ofertas} ofertas sintéticas...")
+    azar = random.Random(42)
+    ofertas = [oferta_sintetica(i, azar) for i in range(args.ofertas)]
+
+    print(f"\n--- Transformación en bloques de {args.tamano_bloque} ofertas ---")
+    bloques_antes, antes = medir("oferta a oferta", por_oferta, ofertas, args.tamano_bloque)
+    bloques_ahora, ahora = medir("por columnas", from_json_to_csv.transformar_bloque, ofertas, args.tamano_bloque)
+    print(f"Aceleración: x{antes / ahora:.1f}")
+
+    identicos = all(
+        a.to_csv(index=False) == b.to_csv(index=False)
+        for a, b in zip(bloques_antes, bloques_ahora)
+    )
+    print(f"CSV idénticos: {'sí' if identicos else 'NO'}")
+    if not identicos:
+        sys.exit(1)
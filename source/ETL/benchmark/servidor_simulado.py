@@ -0,0 +1,274 @@
+# Servidores locales que imitan las APIs de empleo y de tasas de cambio.
+#
+# Sirven para medir el rendimiento de los extractores sin tocar los servicios
+# reales: reproducen la paginación y la forma de las respuestas de Adzuna,
+# JSearch, Jooble y ExchangeRate-API, con una latencia aleatoria (log-normal)
+# y respuestas 429 con Retry-After cuando se supera el límite de peticiones.
+#
+# Uso directo (deja los cuatro servidores escuchando hasta Ctrl-C):
+#   python source/ETL/benchmark/servidor_simulado.py
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+@dataclass
+class PerfilServidor:
+    """Comportamiento simulado de una API."""
+    latencia_mediana: float = 0.15      # Segundos.
+    dispersion_latencia: float = 0.5    # Sigma de la log-normal: cuanto mayor, más cola.
+    limite_rps: float = 50.0            # Peticiones/s aceptadas antes de responder 429.
+    retry_after: int = 1                # Segundos que se piden en la cabecera Retry-After.
+    peticiones: int = 0
+    rechazadas: int = 0
+    _tokens: float = 0.0
+    _ultimo: float = field(default_factory=time.monotonic)
+    _candado: threading.Lock = field(default_factory=threading.Lock)
+
+    def admitir(self):
+        """Token bucket del lado del servidor: False si hay que responder 429."""
+        with self._candado:
+            self.peticiones += 1
+            ahora = time.monotonic()
+            self._tokens = min(self.limite_rps, self._tokens + (ahora - self._ultimo) * self.limite_rps)
+            self._ultimo = ahora
+            if self._tokens < 1:
+                self.rechazadas += 1
+                return False
+            self._tokens -= 1
+            return True
+
+    def esperar_latencia(self):
+        time.sleep(random.lognormvariate(0, self.dispersion_latencia) * self.latencia_mediana)
+
+    def reiniciar_contadores(self):
+        with self._candado:
+            self.peticiones = 0
+            self.rechazadas = 0
+
+
+def _total_para(*partes, minimo=0, maximo=500):
+    """Número de resultados estable para una misma búsqueda (no cambia entre peticiones)."""
+    semilla = hashlib.md5('|'.join(map(str, partes)).encode('utf-8')).hexdigest()
+    return minimo + int(semilla[:8], 16) % (maximo - minimo + 1)
+
+
+def _id(*partes):
+    return hashlib.sha1('|'.join(map(str, partes)).encode('utf-8')).hexdigest()[:16]
+
+
+# --- GENERADORES DE RESPUESTAS ---
+
+def respuesta_adzuna(pais, pagina, consulta):
+    que = consulta.get('what', [''])[0]
+    donde = consulta.get('where', [''])[0]
+    por_pagina = int(consulta.get('results_per_page', ['10'])[0])
+    total = _total_para('adzuna', pais, que, donde, maximo=600)
+    inicio = (pagina - 1) * por_pagina
+    resultados = []
+    for i in range(inicio, min(total, inicio + por_pagina)):
+        resultados.append({
+            'id': _id('adzuna', pais, que, donde, i),
+            'title': f"{que.title()} #{i}",
+            'company': {'display_name': f"Empresa {i % 37}"},
+            'location': {'area': [pais.upper(), donde.title(), f"Ciudad {i % 11}"], 'display_name': donde.title()},
+            'salary_min': 40000 + (i % 20) * 1000,
+            'salary_max': 60000 + (i % 20) * 1500,
+            'contract_time': 'full_time' if i % 3 else 'part_time',
+            'category': {'label': 'IT Jobs', 'tag': 'it-jobs'},
+            'redirect_url': f"https://www.adzuna.com/details/{i}",
+            # Más recientes primero, como con sort_by=date.
+            'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(time.time() - i * 3600)),
+        })
+    return {'count': total, 'mean': 55000, 'results': resultados}
+
+
+def respuesta_jsearch(consulta):
+    query = consulta.get('query', [''])[0]
+    pagina = int(consulta.get('page', ['1'])[0])
+    num_paginas = int(consulta.get('num_pages', ['1'])[0])
+    total = _total_para('jsearch', query, maximo=120)
+    datos = []
+    for p in range(pagina, pagina + num_paginas):
+        for i in range((p - 1) * 10, min(total, p * 10)):
+            datos.append({
+                'job_id': _id('jsearch', query, i),
+                'job_title': f"{query} #{i}",
+                'employer_name': f"Empresa {i % 41}",
+                'job_country': consulta.get('country', ['us'])[0].upper(),
+                'job_city': f"Ciudad {i % 13}",
+                'job_employment_type': 'FULLTIME',
+                'job_apply_link': f"https://example.com/jsearch/{i}",
+                'job_posted_at_timestamp': int(time.time()) - i * 3600,
+            })
+    return {'status': 'OK', 'request_id': _id('req', time.time()), 'parameters': {k: v[0] for k, v in consulta.items()}, 'data': datos}
+
+
+def respuesta_jsearch_detalles(consulta):
+    ids = consulta.get('job_id', [''])[0].split(',')
+    return {'status': 'OK', 'data': [
+        {'job_id': job_id, 'job_description': f"Descripción simulada de {job_id}",
+         'job_highlights': {'Qualifications': ['Python', 'SQL']}, 'estimated_salaries': []}
+        for job_id in ids if job_id
+    ]}
+
+
+def respuesta_jooble(cuerpo):
+    palabras = cuerpo.get('keywords', '')
+    ubicacion = cuerpo.get('location', '')
+    pagina = int(cuerpo.get('page', 1) or 1)
+    por_pagina = int(cuerpo.get('ResultOnPage', 20) or 20)
+    total = _total_para('jooble', palabras, ubicacion, maximo=200)
+    trabajos = []
+    for i in range((pagina - 1) * por_pagina, min(total, pagina * por_pagina)):
+        # Los términos se solapan: una parte de las ofertas se repite entre búsquedas.
+        clave = i if i % 4 else f"comun-{ubicacion}-{i}"
+        trabajos.append({
+            'title': f"{palabras.title()} #{i}",
+            'location': ubicacion,
+            'snippet': f"Oferta simulada para {palabras}",
+            'salary': '',
+            'source': 'simulado',
+            'type': 'Tiempo completo',
+            'link': f"https://jooble.org/desc/{_id('jooble', palabras if i % 4 else '', clave)}",
+            'company': f"Empresa {i % 29}",
+            'updated': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(time.time() - i * 3600)),
+            'id': int(_id('jooble', palabras if i % 4 else '', clave)[:12], 16),
+        })
+    return {'totalCount': total, 'jobs': trabajos}
+
+
+def respuesta_tasas(moneda_base):
+    tasas = {'USD': 1.0, 'PEN': 3.75, 'EUR': 0.92, 'BRL': 5.4, 'COP': 4000.0, 'MXN': 18.5, 'CLP': 930.0, 'ARS': 900.0}
+    base = tasas.get(moneda_base, 1.0)
+    return {'result': 'success', 'base_code': moneda_base,
+            'conversion_rates': {codigo: round(valor / base, 6) for codigo, valor in tasas.items()}}
+
+
+# --- SERVIDOR ---
+
+def _crear_manejador(api, perfil):
+    class Manejador(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, formato, *args):
+            pass  # Sin log por petición: ensuciaría la salida del benchmark.
+
+        def _responder(self, estado, cuerpo=None, cabeceras=None):
+            contenido = json.dumps(cuerpo if cuerpo is not None else {}, ensure_ascii=False).encode('utf-8')
+            self.send_response(estado)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(contenido)))
+            for nombre, valor in (cabeceras or {}).items():
+                self.send_header(nombre, valor)
+            self.end_headers()
+            self.wfile.write(contenido)
+
+        def _atender(self, cuerpo=None):
+            if not perfil.admitir():
+                self._responder(429, {'message': 'Too Many Requests'}, {'Retry-After': str(perfil.retry_after)})
+                return
+            perfil.esperar_latencia()
+
+            partes = urlsplit(self.path)
+            ruta = [p for p in partes.path.split('/') if p]
+            consulta = parse_qs(partes.query)
+
+            if api == 'adzuna' and len(ruta) >= 6 and ruta[-2] == 'search':
+                self._responder(200, respuesta_adzuna(ruta[-3], int(ruta[-1]), consulta))
+            elif api == 'jsearch' and ruta == ['search']:
+                self._responder(200, respuesta_jsearch(consulta))
+            elif api == 'jsearch' and ruta == ['job-details']:
+                self._responder(200, respuesta_jsearch_detalles(consulta))
+            elif api == 'jooble' and ruta[:1] == ['api'] and cuerpo is not None:
+                self._responder(200, respuesta_jooble(cuerpo))
+            elif api == 'tasas' and len(ruta) == 4 and ruta[2] == 'latest':
+                self._responder(200, respuesta_tasas(ruta[3]))
+            else:
+                self._responder(404, {'message': f'Ruta no simulada: {partes.path}'})
+
+        def do_GET(self):
+            self._atender()
+
+        def do_POST(self):
+            longitud = int(self.headers.get('Content-Length', 0))
+            try:
+                cuerpo = json.loads(self.rfile.read(longitud) or b'{}')
+            except json.JSONDecodeError:
+                self._responder(400, {'message': 'JSON inválido'})
+                return
+            self._atender(cuerpo)
+
+    return Manejador
+
+
+# Perfiles por defecto, aproximados a lo observado con los servicios reales.
+PERFILES_POR_DEFECTO = {
+    'adzuna': dict(latencia_mediana=0.25, dispersion_latencia=0.4, limite_rps=25),
+    'jsearch': dict(latencia_mediana=0.8, dispersion_latencia=0.6, limite_rps=5),
+    'jooble': dict(latencia_mediana=0.35, dispersion_latencia=0.5, limite_rps=10),
+    'tasas': dict(latencia_mediana=0.1, dispersion_latencia=0.3, limite_rps=20),
+}
+
+
+class ServidoresSimulados:
+    """Levanta un servidor por API, cada uno en su puerto, en hilos en segundo plano."""
+
+    def __init__(self, host='127.0.0.1', perfiles=None):
+        self.host = host
+        self.perfiles = {api: PerfilServidor(**config) for api, config in PERFILES_POR_DEFECTO.items()}
+        for api, config in (perfiles or {}).items():
+            self.perfiles[api] = PerfilServidor(**config)
+        self._servidores = {}
+
+    def iniciar(self, puertos=None):
+        puertos = puertos or {}
+        for api, perfil in self.perfiles.items():
+            servidor = ThreadingHTTPServer((self.host, puertos.get(api, 0)), _crear_manejador(api, perfil))
+            servidor.daemon_threads = True
+            threading.Thread(target=servidor.serve_forever, daemon=True).start()
+            self._servidores[api] = servidor
+        return self.urls()
+
+    def urls(self):
+        """URL base de cada API simulada, en el formato que esperan los extractores."""
+        puerto = {api: servidor.server_address[1] for api, servidor in self._servidores.items()}
+        return {
+            'adzuna': f"http://{self.host}:{puerto['adzuna']}/v1/api/jobs",
+            'jsearch': f"http://{self.host}:{puerto['jsearch']}",
+            'jooble': f"http://{self.host}:{puerto['jooble']}",
+            'tasas': f"http://{self.host}:{puerto['tasas']}/v6",
+        }
+
+    def detener(self):
+        for servidor in self._servidores.values():
+            servidor.shutdown()
+            servidor.server_close()
+        self._servidores = {}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidores locales que imitan las APIs de empleo.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto-base', type=int, default=8801,
+                        help="Puerto de Adzuna; JSearch, Jooble y tasas usan los tres siguientes.")
+    args = parser.parse_args()
+
+    servidores = ServidoresSimulados(args.host)
+    apis = list(servidores.perfiles)
+    urls = servidores.iniciar({api: args.puerto_base + i for i, api in enumerate(apis)})
+    print("--- Servidores simulados en marcha (Ctrl-C para detener) ---")
+    for api, url in urls.items():
+        print(f"{api:>8}: {url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        servidores.detener()
@@ -0,0 +1,114 @@
+# Caché HTTP condicional (ETag / Last-Modified) para páginas que se scrapean.
+#
+# Por cada URL se guarda en disco el ETag y el Last-Modified de la última
+# respuesta junto con los resultados ya analizados de la página (no el HTML).
+# La siguiente vez la petición se envía con If-None-Match / If-Modified-Since:
+# si el servidor responde 304 la página no ha cambiado y se devuelven los
+# resultados guardados, sin descargar el HTML ni volver a analizarlo.
+#
+# Solo depende de archivos_json.py (en esta misma carpeta), así que también lo
+# pueden usar los scrapers de notebooks/Scraper_Education:
+#
+#   sys.path.append(os.path.join(..., 'source', 'ETL'))
+#   import cache_condicional
+#   items = cache_condicional.obtener_analizado(url, extraer_items, headers=headers, timeout=15)
+
+import hashlib
+import os
+import threading
+import time
+
+import requests
+
+import archivos_json
+
+# --- CONFIGURACIÓN PRINCIPAL ---
+
+RUTA_CACHE = os.path.join('datos', 'cache', 'condicional')
+
+_contadores = {'no_modificadas': 0, 'descargadas': 0}
+_candado = threading.Lock()
+
+
+def clave(url, clave_analisis=''):
+    """
+    Hash de la URL y del analizador. 'clave_analisis' distingue resultados de
+    la misma página analizada de otra forma (otros selectores, otra versión
+    del analizador...), para no servir resultados de un análisis distinto.
+    """
+    return hashlib.sha256(f"{url}\n{clave_analisis}".encode('utf-8')).hexdigest()
+
+
+def _ruta(clave_cache):
+    # Subcarpetas por prefijo para no acumular miles de archivos en un directorio.
+    return os.path.join(RUTA_CACHE, clave_cache[:2], clave_cache + '.json')
+
+
+def leer(url, clave_analisis=''):
+    """Entrada guardada de la URL ({'etag', 'last_modified', 'resultados', ...}) o None."""
+    return archivos_json.leer_json(_ruta(clave(url, clave_analisis)))
+
+
+def cabeceras_condicionales(entrada):
+    """Cabeceras If-None-Match / If-Modified-Since para revalidar una entrada (vacías si no hay)."""
+    if not entrada:
+        return {}
+    cabeceras = {}
+    if entrada.get('etag'):
+        cabeceras['If-None-Match'] = entrada['etag']
+    if entrada.get('last_modified'):
+        cabeceras['If-Modified-Since'] = entrada['last_modified']
+    return cabeceras
+
+
+def guardar(url, respuesta, resultados, clave_analisis=''):
+    """
+    Guarda los validadores de una respuesta 200 y los resultados de analizarla
+    (deben poder pasarse a JSON). Si el servidor no envía ETag ni
+    Last-Modified no hay con qué revalidar y no se guarda nada.
+    """
+    etag = respuesta.headers.get('ETag')
+    last_modified = respuesta.headers.get('Last-Modified')
+    if respuesta.status_code != 200 or not (etag or last_modified):
+        return
+    entrada = {
+        'guardado': time.time(),
+        'url': url,
+        'etag': etag,
+        'last_modified': last_modified,
+        'resultados': resultados,
+    }
+    # Escritura atómica: varios hilos pueden estar guardando a la vez.
+    archivos_json.escribir_json(_ruta(clave(url, clave_analisis)), entrada)
+
+
+def contar(no_modificada):
+    with _candado:
+        _contadores['no_modificadas' if no_modificada else 'descargadas'] += 1
+
+
+def resumen():
+    """Devuelve (páginas no modificadas servidas desde la caché, páginas descargadas)."""
+    with _candado:
+        return _contadores['no_modificadas'], _contadores['descargadas']
+
+
+def obtener_analizado(url, analizar, obtener=None, clave_analisis='', headers=None, **kwargs):
+    """
+    Descarga 'url' con un GET condicional y devuelve analizar(html). Si la
+    página no ha cambiado (304) devuelve los resultados guardados sin
+    analizar nada. 'obtener' es la función que hace el GET (por defecto
+    requests.get; p. ej. cliente_http.obtener) y recibe 'headers' y el resto
+    de argumentos. Los errores HTTP se lanzan con raise_for_status().
+    """
+    obtener = obtener or requests.get
+    entrada = leer(url, clave_analisis)
+    respuesta = obtener(url, headers={**(headers or {}), **cabeceras_condicionales(entrada)}, **kwargs)
+    if respuesta.status_code == 304 and entrada is not None:
+        contar(no_modificada=True)
+        return entrada['resultados']
+    respuesta.raise_for_status()
+    contar(no_modificada=False)
+    resultados = analizar(respuesta.text)
+    guardar(url, respuesta, resultados, clave_analisis)
+    return resultados
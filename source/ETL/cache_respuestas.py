@@ -0,0 +1,128 @@
+# Caché en disco de respuestas de las APIs, con modo de reproducción offline.
+#
+# Cada respuesta correcta se guarda en un archivo cuyo nombre es el hash de
+# (método, endpoint, parámetros, cuerpo). Mientras no pase el TTL, la misma
+# petición se sirve desde disco sin tocar la red ni gastar cuota. En modo
+# "replay" solo se usa la caché: lo que no esté guardado se trata como un
+# error de conexión.
+
+import hashlib
+import json
+import os
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+
+import archivos_json
+
+# --- CONFIGURACIÓN PRINCIPAL ---
+
+RUTA_CACHE = os.path.join('datos', 'cache', 'respuestas')
+TTL_POR_DEFECTO = 24 * 3600   # Segundos que una respuesta se considera vigente.
+
+# Parámetros con credenciales: no forman parte de la clave (pueden cambiar
+# entre miembros del equipo sin cambiar la respuesta) ni se guardan en disco.
+# Las credenciales que van en la ruta (Jooble) las quita quien llama, pasando
+# a cliente_http el endpoint sin ellas (url_cache).
+PARAMETROS_EXCLUIDOS = {'app_id', 'app_key'}
+
+# Estado global, lo fija cada script con configurar().
+activa = False
+solo_cache = False
+ttl = TTL_POR_DEFECTO
+
+
+class SinRespuestaEnCache(requests.exceptions.RequestException):
+    """En modo replay, la petición no está en la caché."""
+
+
+def configurar(usar_cache=False, replay=False, ttl_segundos=TTL_POR_DEFECTO):
+    """Activa la caché. El modo replay implica caché activa y sin caducidad."""
+    global activa, solo_cache, ttl
+    activa = usar_cache or replay
+    solo_cache = replay
+    ttl = ttl_segundos
+
+
+def agregar_argumentos(parser):
+    """Añade las opciones --cache, --replay y --ttl-cache a un ArgumentParser."""
+    parser.add_argument('--cache', action='store_true',
+                        help="Guarda las respuestas en disco y las reutiliza mientras no caduquen.")
+    parser.add_argument('--replay', action='store_true',
+                        help="Sirve todas las peticiones desde la caché, sin usar la red.")
+    parser.add_argument('--ttl-cache', type=float, default=TTL_POR_DEFECTO / 3600,
+                        help="Horas que una respuesta en caché se considera vigente (por defecto 24).")
+
+
+def configurar_desde_argumentos(args):
+    configurar(args.cache, args.replay, args.ttl_cache * 3600)
+    if args.replay:
+        print(f"Modo replay: las respuestas se leen solo desde '{RUTA_CACHE}'.")
+    elif args.cache:
+        print(f"Caché de respuestas activada (TTL: {args.ttl_cache:g} h).")
+
+
+def sin_credenciales(url):
+    """Quita de la query de 'url' los parámetros de PARAMETROS_EXCLUIDOS."""
+    partes = urlsplit(url)
+    if not partes.query:
+        return url
+    query = [(k, v) for k, v in parse_qsl(partes.query, keep_blank_values=True) if k not in PARAMETROS_EXCLUIDOS]
+    return urlunsplit(partes._replace(query=urlencode(query)))
+
+
+def clave(metodo, url, params=None, cuerpo=None):
+    """Hash estable de la petición: el orden de los parámetros y las credenciales no influyen."""
+    params = {k: v for k, v in (params or {}).items() if k not in PARAMETROS_EXCLUIDOS}
+    contenido = json.dumps([metodo.upper(), sin_credenciales(url), params, cuerpo], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(contenido.encode('utf-8')).hexdigest()
+
+
+def contiene(metodo, url, params=None, cuerpo=None):
+    """
+    True si la caché está activa y tiene una respuesta vigente para la
+    petición: quien paga cuota por llamada la consulta antes de reservarla.
+    """
+    return activa and leer(clave(metodo, url, params, cuerpo)) is not None
+
+
+def _ruta(clave_cache):
+    # Subcarpetas por prefijo para no acumular miles de archivos en un directorio.
+    return os.path.join(RUTA_CACHE, clave_cache[:2], clave_cache + '.json')
+
+
+def leer(clave_cache):
+    """Devuelve un Response reconstruido desde disco, o None si no está o caducó."""
+    entrada = archivos_json.leer_json(_ruta(clave_cache))
+    if entrada is None:
+        return None
+    if not solo_cache and time.time() - entrada['guardado'] > ttl:
+        return None
+
+    respuesta = requests.Response()
+    respuesta.status_code = entrada['estado']
+    respuesta.url = entrada['url']
+    respuesta.headers.update(entrada.get('cabeceras', {}))
+    respuesta.encoding = 'utf-8'
+    respuesta._content = entrada['contenido'].encode('utf-8')
+    respuesta.reason = 'OK (caché)'
+    return respuesta
+
+
+def guardar(clave_cache, respuesta, url=None):
+    """
+    Guarda una respuesta correcta. Las de error no se cachean. 'url' sustituye
+    a la de la respuesta cuando esta lleva una credencial en la ruta.
+    """
+    if respuesta.status_code != 200:
+        return
+    entrada = {
+        'guardado': time.time(),
+        'url': sin_credenciales(url or respuesta.url),
+        'estado': respuesta.status_code,
+        'cabeceras': {'Content-Type': respuesta.headers.get('Content-Type', '')},
+        'contenido': respuesta.text,
+    }
+    # Escritura atómica: varios hilos pueden estar guardando a la vez.
+    archivos_json.escribir_json(_ruta(clave_cache), entrada)
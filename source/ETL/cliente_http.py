@@ -0,0 +1,170 @@
+# Cliente HTTP compartido por todos los extractores del ETL.
+#
+# Todas las peticiones pasan por una única requests.Session con un pool de
+# conexiones keep-alive, de modo que las páginas sucesivas a un mismo host
+# reutilizan la conexión TCP/TLS en lugar de abrir una nueva cada vez.
+# Además se negocia compresión (gzip y, si está instalado, brotli), se aplica
+# un timeout por defecto y se reintenta con backoff exponencial respetando la
+# cabecera Retry-After. Cada intento pasa antes por el limitador AIMD del host
+# (limitador_tasa.py), que marca el ritmo de peticiones. Si el script activa la
+# caché de respuestas (cache_respuestas.py), las peticiones repetidas se sirven
+# desde disco.
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import cache_respuestas
+import limitador_tasa
+
+# --- CONFIGURACIÓN PRINCIPAL ---
+
+TIMEOUT_POR_DEFECTO = 20          # Segundos para conectar y para leer la respuesta.
+MAX_REINTENTOS = 4                # Reintentos tras el primer intento fallido.
+BACKOFF_BASE = 0.5                # Espera inicial entre reintentos (se duplica en cada uno).
+BACKOFF_MAXIMO = 60               # Tope de espera entre reintentos, en segundos.
+ESTADOS_REINTENTABLES = {429, 500, 502, 503, 504}
+
+# Tamaño del pool: conexiones abiertas por host y número de hosts distintos.
+CONEXIONES_POR_HOST = 32
+HOSTS_EN_POOL = 16
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+
+def _codificaciones_soportadas():
+    """urllib3 solo descomprime brotli si está instalado 'brotli' o 'brotlicffi'."""
+    try:
+        import brotli  # noqa: F401
+        return 'gzip, deflate, br'
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+            return 'gzip, deflate, br'
+        except ImportError:
+            return 'gzip, deflate'
+
+
+_sesion = None
+_candado_sesion = threading.Lock()
+
+
+def obtener_sesion():
+    """Devuelve la sesión compartida, creándola la primera vez que se usa."""
+    global _sesion
+    if _sesion is None:
+        with _candado_sesion:
+            if _sesion is None:
+                sesion = requests.Session()
+                # Los reintentos los hace solicitar(); el adaptador solo gestiona el pool.
+                adaptador = HTTPAdapter(pool_connections=HOSTS_EN_POOL, pool_maxsize=CONEXIONES_POR_HOST, max_retries=0)
+                sesion.mount('https://', adaptador)
+                sesion.mount('http://', adaptador)
+                sesion.headers.update({
+                    'User-Agent': USER_AGENT,
+                    'Accept-Encoding': _codificaciones_soportadas(),
+                    'Connection': 'keep-alive',
+                })
+                _sesion = sesion
+    return _sesion
+
+
+def _segundos_retry_after(respuesta):
+    """Interpreta Retry-After, que puede venir en segundos o como fecha HTTP."""
+    valor = respuesta.headers.get('Retry-After')
+    if not valor:
+        return None
+    try:
+        return max(0.0, float(valor))
+    except ValueError:
+        pass
+    try:
+        fecha = parsedate_to_datetime(valor)
+    except (TypeError, ValueError):
+        return None
+    if fecha.tzinfo is None:
+        fecha = fecha.replace(tzinfo=timezone.utc)
+    return max(0.0, (fecha - datetime.now(timezone.utc)).total_seconds())
+
+
+def _espera_backoff(intento):
+    """Backoff exponencial con un poco de aleatoriedad para no sincronizar reintentos."""
+    espera = min(BACKOFF_MAXIMO, BACKOFF_BASE * (2 ** intento))
+    return espera + random.uniform(0, espera / 2)
+
+
+def solicitar(metodo, url, params=None, json=None, data=None, headers=None,
+              timeout=TIMEOUT_POR_DEFECTO, max_reintentos=MAX_REINTENTOS, limitar=True, usar_cache=True, url_cache=None):
+    """
+    Realiza una petición con la sesión compartida y devuelve el objeto Response.
+
+    Los errores de conexión y los códigos de ESTADOS_REINTENTABLES se reintentan
+    hasta 'max_reintentos' veces. Si el servidor envía Retry-After se espera ese
+    tiempo; si no, se aplica backoff exponencial. Agotados los reintentos se
+    devuelve la última respuesta (o se relanza la última excepción), de modo que
+    el extractor decide qué hacer con ella como antes.
+
+    Con 'limitar' (por defecto) cada intento espera su turno en el limitador del
+    host y le informa del resultado para que ajuste la tasa.
+
+    Si la caché de respuestas está activa (y 'usar_cache' lo permite), primero
+    se busca la petición en disco; en modo replay nunca se sale a la red.
+    Si la URL lleva una credencial en la ruta (Jooble), 'url_cache' es el
+    endpoint sin ella, que es el que se usa para la clave y se guarda en disco.
+    """
+    clave_cache = None
+    if usar_cache and cache_respuestas.activa:
+        clave_cache = cache_respuestas.clave(metodo, url_cache or url, params, json if json is not None else data)
+        respuesta = cache_respuestas.leer(clave_cache)
+        if respuesta is not None:
+            return respuesta
+        if cache_respuestas.solo_cache:
+            raise cache_respuestas.SinRespuestaEnCache(f"Modo replay: no hay respuesta en caché para {metodo} {url_cache or url}")
+
+    sesion = obtener_sesion()
+    limitador = limitador_tasa.obtener_limitador(url) if limitar else None
+    for intento in range(max_reintentos + 1):
+        if limitador:
+            limitador.adquirir()
+        try:
+            respuesta = sesion.request(metodo, url, params=params, json=json, data=data,
+                                       headers=headers, timeout=timeout)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            if limitador:
+                limitador.registrar_respuesta(None)
+            if intento == max_reintentos:
+                raise
+            espera = _espera_backoff(intento)
+            print(f"   Error de conexión con {url} ({e.__class__.__name__}). Reintentando en {espera:.1f}s...")
+            time.sleep(espera)
+            continue
+
+        if limitador:
+            limitador.registrar_respuesta(respuesta.status_code)
+        if respuesta.status_code not in ESTADOS_REINTENTABLES or intento == max_reintentos:
+            if clave_cache:
+                cache_respuestas.guardar(clave_cache, respuesta, url_cache)
+            return respuesta
+
+        espera = _segundos_retry_after(respuesta)
+        if espera is None:
+            espera = _espera_backoff(intento)
+        espera = min(espera, BACKOFF_MAXIMO)
+        print(f"   Respuesta {respuesta.status_code} de {url}. Reintentando en {espera:.1f}s...")
+        respuesta.close()
+        time.sleep(espera)
+
+
+def obtener(url, **kwargs):
+    """Petición GET con la sesión compartida. Acepta los mismos argumentos que solicitar()."""
+    return solicitar('GET', url, **kwargs)
+
+
+def publicar(url, **kwargs):
+    """Petición POST con la sesión compartida. Acepta los mismos argumentos que solicitar()."""
+    return solicitar('POST', url, **kwargs)
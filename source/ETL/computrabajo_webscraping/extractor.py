@@ -1,7 +1,38 @@
 import requests
-from bs4 import BeautifulSoup
-import pandas as pd
-import time
+from bs4 import BeautifulSoup, SoupStrainer
+import argparse
+import csv
+import os
+import re
+import shutil
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+import archivos_json
+import cache_condicional
+import cache_respuestas
+import cliente_http
+import limitador_tasa
+import progreso
+
+# Motores de análisis HTML opcionales: si están instalados se usan en lugar de
+# 'html.parser', que es el más lento.
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser  # Versiones de selectolax anteriores a la 0.3.
+    except ImportError:
+        HTMLParser = None
+
+try:
+    import lxml  # noqa: F401  (lo usa BeautifulSoup como motor)
+except ImportError:
+    lxml = None
 
 # --- CONFIGURACIÓN PRINCIPAL ---
 PAISES = ['pe', 'co', 'cl', 'mx', 'ar']
@@ -37,44 +68,94 @@ MONEDAS_PAISES = {
     'ar': 'ARS'   # Peso Argentino
 }
 
+# Cada país es un host distinto (pe.computrabajo.com, co.computrabajo.com...).
+URL_BASE_PAIS = "https://{pais}.computrabajo.com"
+
+# Países que se recorren a la vez, cada uno en su hilo. El techo de peticiones
+# por segundo contra cada host es el de computrabajo.com en limitador_tasa.py.
+MAX_CONCURRENCIA = len(PAISES)
+
+ARCHIVO_SALIDA = "datos/crudos/computrabajo_multipaís.csv"
+# Las páginas se van escribiendo aquí y solo pasan a ARCHIVO_SALIDA al terminar el recorrido.
+ARCHIVO_PARCIAL = ARCHIVO_SALIDA + '.parcial'
+# Última página terminada de cada búsqueda, para reanudar un recorrido cortado.
+RUTA_AVANCE = os.path.join('datos', 'estado', 'computrabajo_avance.json')
+# Ejecuciones seguidas en las que puede fallar la misma página antes de dar su
+# búsqueda por terminada (fallida), para que el recorrido pueda completarse.
+MAX_FALLOS_POR_PAGINA = 3
+
+COLUMNAS_CSV = [
+    'puesto_trabajo', 'nombre_empresa', 'pais', 'region_estado', 'categoria_busqueda', 'tipo_contrato',
+    'salario', 'moneda_salario', 'periodo_salario', 'plataforma_origen', 'tipo_fuente_datos', 'enlace_oferta',
+]
 
-def peticion_pagina(url):
+# Ids de las ofertas ya guardadas, por búsqueda, para el recorrido incremental.
+RUTA_CONOCIDAS = os.path.join('datos', 'estado', 'computrabajo_ofertas_conocidas.json')
+# Los listados van de más nuevo a más antiguo: si en una página al menos esta
+# fracción de ofertas ya era conocida, lo que sigue también lo es y se deja de paginar.
+UMBRAL_CONOCIDAS = 0.8
+
+# El enlace de cada oferta termina en un id hexadecimal estable (antes de '#' o '?').
+_PATRON_ID = re.compile(r'-([0-9A-Fa-f]{32})(?:[#?]|$)')
+
+
+def peticion_pagina(url, cabeceras=None):
     """
-    Realiza una petición GET a la URL proporcionada con un User-Agent.
+    Realiza una petición GET a la URL proporcionada con el cliente HTTP
+    compartido (que ya envía un User-Agent de navegador).
     Maneja posibles errores de conexión.
     """
-    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
     try:
-        respuesta = requests.get(url, headers=headers, timeout=15)
+        respuesta = cliente_http.obtener(url, headers=cabeceras, timeout=15)
         respuesta.raise_for_status()  # Lanza un error para códigos de estado HTTP 4xx/5xx.
         return respuesta
+    except requests.exceptions.HTTPError as e:
+        if e.response is not None and e.response.status_code == 404:
+            # Una página de resultados que no existe marca el final de la búsqueda, no un fallo.
+            return e.response
+        print(f"Error al hacer la petición a la URL {url}: {e}")
+        return None
     except requests.exceptions.RequestException as e:
         print(f"Error al hacer la petición a la URL {url}: {e}")
         return None
 
-def extraer_datos_pagina(url, pais_codigo, categoria):
-    """
-    Extrae la información de todas las ofertas de una única página.
-    Recibe el código del país para construir las URLs de las ofertas correctamente.
-    """
-    respuesta = peticion_pagina(url)
-    if not respuesta:
-        return []
+# --- ANÁLISIS DEL HTML ---
 
-    sopa = BeautifulSoup(respuesta.text, 'html.parser')
-    contenedores_ofertas = sopa.find_all('article', class_='box_offer')
-    
-    if not contenedores_ofertas:
-        return []
+# Del más rápido al más lento. 'selectolax' no pasa por BeautifulSoup; 'lxml' y
+# 'html.parser' son motores de BeautifulSoup.
+MOTORES_HTML = ('selectolax', 'lxml', 'html.parser')
 
-    lista_ofertas = []
-    # Itera sobre cada oferta para extraer sus datos
-    for oferta in contenedores_ofertas:
+def motores_disponibles():
+    """Motores de MOTORES_HTML instalados, del más rápido al más lento."""
+    instalados = {'selectolax': HTMLParser is not None, 'lxml': lxml is not None, 'html.parser': True}
+    return [motor for motor in MOTORES_HTML if instalados[motor]]
+
+# Motor con el que se analizan las páginas (se puede cambiar con --motor-html).
+MOTOR_HTML = motores_disponibles()[0]
+
+# Carpeta donde guardar el HTML de cada página descargada (--guardar-html), p.
+# ej. para el benchmark de análisis. None = no se guarda.
+CARPETA_HTML = None
+
+# GET condicional (ver cache_condicional.py): una página que no ha cambiado
+# desde el último recorrido responde 304 y se reutilizan sus ofertas ya
+# analizadas. Se desactiva con --sin-cache-condicional.
+USAR_CACHE_CONDICIONAL = True
+# Versión de lo que devuelve analizar_pagina: cambiarla invalida lo guardado.
+CLAVE_ANALISIS = 'computrabajo-ofertas-v1'
+
+# BeautifulSoup solo construye el árbol de los contenedores de oferta; el resto
+# de la página (cabecera, filtros, scripts...) se descarta al leerla.
+_SOLO_OFERTAS = SoupStrainer('article', class_='box_offer')
+
+def _campos_bs4(html, motor):
+    """Recorre las ofertas de la página con BeautifulSoup y devuelve sus campos en bruto."""
+    sopa = BeautifulSoup(html, motor, parse_only=_SOLO_OFERTAS)
+    for oferta in sopa.find_all('article', class_='box_offer'):
         titulo_tag = oferta.find('a', class_='js-o-link fc_base')
         titulo = titulo_tag.get_text(strip=True) if titulo_tag else "NA"
-        # Construcción dinámica de la URL de la oferta
-        url_oferta = f"https://{pais_codigo}.computrabajo.com{titulo_tag['href']}" if titulo_tag and titulo_tag.has_attr('href') else "NA"
-        
+        href = titulo_tag['href'] if titulo_tag and titulo_tag.has_attr('href') else None
+
         empresa_tag = oferta.find('a', class_='fc_base t_ellipsis')
         empresa = empresa_tag.get_text(strip=True) if empresa_tag else "NA"
 
@@ -92,6 +173,56 @@ def extraer_datos_pagina(url, pais_codigo, categoria):
                 elif span.find('span', class_='i_home_office'):
                     modalidad = span.get_text(strip=True)
 
+        yield titulo, href, empresa, ubicacion, salario, modalidad
+
+def _texto(nodo):
+    # Igual que get_text(strip=True) de BeautifulSoup: cada trozo de texto recortado y unidos sin separador.
+    return nodo.text(deep=True, separator='', strip=True)
+
+def _campos_selectolax(html):
+    """
+    Lo mismo que _campos_bs4 con selectolax. Las clases de varias palabras se
+    buscan con [class="..."] porque BeautifulSoup las compara como texto exacto.
+    """
+    for oferta in HTMLParser(html).css('article.box_offer'):
+        titulo_tag = oferta.css_first('a[class="js-o-link fc_base"]')
+        titulo = _texto(titulo_tag) if titulo_tag else "NA"
+        href = titulo_tag.attributes.get('href') if titulo_tag and 'href' in titulo_tag.attributes else None
+
+        empresa_tag = oferta.css_first('a[class="fc_base t_ellipsis"]')
+        empresa = _texto(empresa_tag) if empresa_tag else "NA"
+
+        # Como en bs4: el primer <p> de ubicación y luego su primer span (si ese <p> no tiene, NA).
+        ubicacion_p = oferta.css_first('p[class="fs16 fc_base mt5"]')
+        ubicacion_span = ubicacion_p.css_first('span') if ubicacion_p else None
+        ubicacion = _texto(ubicacion_span) if ubicacion_span else "NA"
+
+        div_1 = oferta.css_first('div[class="fs13 mt15"]')
+        salario, modalidad = "NA", "NA"
+        if div_1:
+            for span in div_1.css('span[class="dIB mr10"]'):
+                if span.css_first('span.i_salary'):
+                    salario = _texto(span)
+                elif span.css_first('span.i_home_office'):
+                    modalidad = _texto(span)
+
+        yield titulo, href, empresa, ubicacion, salario, modalidad
+
+def analizar_pagina(html, pais_codigo, categoria, motor=None):
+    """
+    Extrae la información de todas las ofertas del HTML de una página de
+    resultados con el motor indicado (por defecto MOTOR_HTML). Todos los
+    motores devuelven las mismas ofertas.
+    """
+    motor = motor or MOTOR_HTML
+    campos = _campos_selectolax(html) if motor == 'selectolax' else _campos_bs4(html, motor)
+
+    lista_ofertas = []
+    # Itera sobre cada oferta para armar su registro
+    for titulo, href, empresa, ubicacion, salario, modalidad in campos:
+        # Construcción dinámica de la URL de la oferta
+        url_oferta = f"{URL_BASE_PAIS.format(pais=pais_codigo)}{href}" if href is not None else "NA"
+
         oferta_dict = {
             'puesto_trabajo': titulo,
             'nombre_empresa': empresa,
@@ -107,53 +238,412 @@ def extraer_datos_pagina(url, pais_codigo, categoria):
             'enlace_oferta': url_oferta,
         }
         lista_ofertas.append(oferta_dict)
-        
+
     return lista_ofertas
 
-# --- PUNTO DE ENTRADA DEL SCRIPT ---
-if __name__ == "__main__":
-    datos_finales = []
-    
-    # Bucle principal que itera sobre cada país
-    for pais in PAISES:
-        # Bucle anidado que itera sobre cada palabra clave
-        for palabra in PALABRAS_CLAVE:
-            
-            # Construye la URL base para la búsqueda actual
-            url_base_busqueda = f"https://{pais}.computrabajo.com/trabajo-de-{palabra}"
-            print(f"\n--- Iniciando scraping para '{palabra}' en '{MAPEO_PAISES.get(pais, pais)}' ---")
-            
-            numero_pagina = 1
-            while True:
-                if numero_pagina == 1:
-                    url_actual = url_base_busqueda
-                else:
-                    # La paginación se maneja con ?p=NUMERO
-                    url_actual = f"{url_base_busqueda}?p={numero_pagina}"
-                
-                print(f"Extrayendo datos de: {url_actual}")
-                
-                datos_de_la_pagina = extraer_datos_pagina(url_actual, pais, palabra)
-                
-                # Si la página no devuelve datos, rompemos el bucle para pasar a la siguiente categoría
-                if not datos_de_la_pagina:
-                    print(f"No se encontraron más ofertas para '{palabra}' en '{MAPEO_PAISES.get(pais, pais)}'. Pasando a la siguiente búsqueda.")
-                    break
-                    
-                datos_finales.extend(datos_de_la_pagina)
-                
-                numero_pagina += 1
-                #time.sleep(1) # Pausa cortés para no sobrecargar el servidor
-
-    if datos_finales:
-        df = pd.DataFrame(datos_finales)
-        # Se recomienda guardar en un formato que soporte bien UTF-8, como CSV con la codificación especificada.
-        nombre_archivo = "datos/crudos/computrabajo_multipaís.csv"
-        try:
-            # Asegúrate de que el directorio 'datos/crudos/' exista o guarda en el directorio actual.
-            df.to_csv(nombre_archivo, index=False, encoding='utf-8-sig')
-            print(f"\n✅ ¡Éxito! {len(df)} ofertas extraídas y guardadas en '{nombre_archivo}'.")
-        except Exception as e:
-            print(f"Error al guardar el archivo CSV: {e}")
+def _guardar_html(url, html):
+    nombre = url.split('://', 1)[-1].replace('/', '_').replace('?', '_').replace(':', '_') + '.html'
+    os.makedirs(CARPETA_HTML, exist_ok=True)
+    with open(os.path.join(CARPETA_HTML, nombre), 'w', encoding='utf-8') as f:
+        f.write(html)
+
+def extraer_datos_pagina(url, pais_codigo, categoria):
+    """
+    Extrae la información de todas las ofertas de una única página.
+    Recibe el código del país para construir las URLs de las ofertas correctamente.
+    Devuelve None si la página no se pudo descargar (para reintentarla al
+    reanudar) y una lista vacía si ya no hay más resultados.
+    Si la página no ha cambiado desde la última vez (304), devuelve las
+    ofertas que se analizaron entonces, sin volver a analizar el HTML.
+    """
+    entrada = cache_condicional.leer(url, CLAVE_ANALISIS) if USAR_CACHE_CONDICIONAL else None
+    respuesta = peticion_pagina(url, cache_condicional.cabeceras_condicionales(entrada))
+    if respuesta is None:
+        return None
+    if respuesta.status_code == 304 and entrada is not None:
+        cache_condicional.contar(no_modificada=True)
+        return entrada['resultados']
+    if respuesta.status_code == 404:
+        return []
+
+    if CARPETA_HTML:
+        _guardar_html(url, respuesta.text)
+    ofertas = analizar_pagina(respuesta.text, pais_codigo, categoria)
+    if USAR_CACHE_CONDICIONAL:
+        cache_condicional.contar(no_modificada=False)
+        cache_condicional.guardar(url, respuesta, ofertas, CLAVE_ANALISIS)
+    return ofertas
+
+class SumideroOfertas:
+    """
+    Escribe en un CSV, página a página, las ofertas que van llegando de todos
+    los hilos. Cada página queda en disco en cuanto se agrega, así que un
+    corte solo pierde las páginas que se estaban descargando.
+    """
+
+    def __init__(self, ruta=ARCHIVO_PARCIAL, reanudar=False):
+        self.ruta = ruta
+        self.filas = 0
+        reanudar = reanudar and os.path.exists(ruta)
+        if reanudar:
+            with open(ruta, 'r', encoding='utf-8-sig', newline='') as f:
+                self.filas = sum(1 for _ in csv.reader(f)) - 1
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        self._archivo = open(ruta, 'a' if reanudar else 'w', encoding='utf-8-sig', newline='')
+        self._escritor = csv.DictWriter(self._archivo, fieldnames=COLUMNAS_CSV, lineterminator='\n')
+        if not reanudar:
+            self._escritor.writeheader()
+            self._archivo.flush()
+        self._candado = threading.Lock()
+
+    def agregar(self, ofertas):
+        if not ofertas:
+            return
+        with self._candado:
+            self._escritor.writerows(ofertas)
+            self._archivo.flush()
+            self.filas += len(ofertas)
+
+    def ofertas_escritas(self):
+        """Lee las ofertas ya escritas (p. ej. las de un recorrido anterior que se reanuda)."""
+        with self._candado:
+            self._archivo.flush()
+            with open(self.ruta, 'r', encoding='utf-8-sig', newline='') as f:
+                return list(csv.DictReader(f))
+
+    def cerrar(self):
+        with self._candado:
+            self._archivo.close()
+
+class AvanceRecorrido:
+    """
+    Checkpoint del recorrido en datos/estado/computrabajo_avance.json: el modo
+    (incremental o completo) y, por búsqueda (país|palabra clave), la última
+    página terminada, si la búsqueda ya acabó y cuántas veces seguidas ha
+    fallado la página siguiente. Una búsqueda que llega a
+    MAX_FALLOS_POR_PAGINA fallos se da por terminada y queda como 'fallida'.
+    """
+
+    def __init__(self, ruta=RUTA_AVANCE):
+        self.ruta = ruta
+        self.incremental = None
+        self.busquedas = {}
+        datos = archivos_json.leer_json(ruta, {})
+        if 'incremental' in datos and 'busquedas' in datos:
+            self.incremental = datos['incremental']
+            self.busquedas = datos['busquedas']
+        self._candado = threading.Lock()
+
+    @property
+    def pendiente(self):
+        """True si hay un recorrido anterior cortado que se puede reanudar."""
+        return self.incremental is not None
+
+    def empezar(self, incremental):
+        self.incremental = incremental
+        self.busquedas = {}
+        self._guardar()
+
+    def pagina_inicial(self, pais, palabra):
+        """Página por la que seguir una búsqueda, o None si ya terminó."""
+        avance = self.busquedas.get(OfertasConocidas.clave(pais, palabra), {})
+        return None if avance.get('terminada') else avance.get('pagina', 0) + 1
+
+    def marcar(self, pais, palabra, pagina, terminada=False):
+        with self._candado:
+            self.busquedas[OfertasConocidas.clave(pais, palabra)] = {'pagina': pagina, 'terminada': terminada}
+            self._guardar()
+
+    def fallo(self, pais, palabra):
+        """Anota que falló la página siguiente a la última terminada; devuelve los fallos seguidos."""
+        with self._candado:
+            avance = self.busquedas.setdefault(OfertasConocidas.clave(pais, palabra), {'pagina': 0, 'terminada': False})
+            avance['fallos'] = avance.get('fallos', 0) + 1
+            if avance['fallos'] >= MAX_FALLOS_POR_PAGINA:
+                avance['terminada'] = avance['fallida'] = True
+            self._guardar()
+            return avance['fallos']
+
+    def fallidas(self):
+        return sorted(clave for clave, avance in self.busquedas.items() if avance.get('fallida'))
+
+    def completo(self):
+        return all(
+            self.busquedas.get(OfertasConocidas.clave(pais, palabra), {}).get('terminada')
+            for pais in PAISES for palabra in PALABRAS_CLAVE
+        )
+
+    def _guardar(self):
+        archivos_json.escribir_json(self.ruta, {'incremental': self.incremental, 'busquedas': self.busquedas}, indent=4)
+
+    def borrar(self):
+        if os.path.exists(self.ruta):
+            os.remove(self.ruta)
+
+    def finalizar(self):
+        """
+        Al terminar el recorrido ya no hay nada que reanudar: se borra el
+        checkpoint, salvo las búsquedas fallidas, que quedan anotadas en él
+        (sin modo, así la próxima ejecución empieza un recorrido nuevo).
+        """
+        fallidas = {clave: avance for clave, avance in self.busquedas.items() if avance.get('fallida')}
+        if not fallidas:
+            self.borrar()
+            return
+        self.incremental = None
+        self.busquedas = fallidas
+        self._guardar()
+
+def id_oferta(oferta):
+    """Id hexadecimal de la oferta sacado de su enlace, o None si no lo tiene."""
+    encontrado = _PATRON_ID.search(oferta.get('enlace_oferta', ''))
+    return encontrado.group(1).upper() if encontrado else None
+
+class OfertasConocidas:
+    """
+    Ids de las ofertas ya guardadas, por búsqueda (país|palabra clave), en
+    datos/estado/computrabajo_ofertas_conocidas.json. En modo incremental
+    filtrar() descarta las ofertas conocidas; en un recorrido completo solo
+    anota sus ids para la próxima ejecución incremental.
+    """
+
+    def __init__(self, incremental=True, ruta=RUTA_CONOCIDAS):
+        self.ruta = ruta
+        self.incremental = incremental
+        self.ids = {}
+        if incremental:
+            self.ids = {clave: set(ids) for clave, ids in archivos_json.leer_json(ruta, {}).items()}
+        self._candado = threading.Lock()
+
+    @staticmethod
+    def clave(pais, palabra):
+        return f"{pais}|{palabra}"
+
+    def filtrar(self, pais, palabra, ofertas):
+        """Anota los ids de la página y devuelve las ofertas a guardar (en modo incremental, solo las nuevas)."""
+        with self._candado:
+            conocidos = self.ids.setdefault(self.clave(pais, palabra), set())
+            nuevas = []
+            for oferta in ofertas:
+                id_ = id_oferta(oferta)
+                if id_ is None or id_ not in conocidos:
+                    nuevas.append(oferta)
+                if id_ is not None:
+                    conocidos.add(id_)
+            return nuevas if self.incremental else list(ofertas)
+
+    def anotar_filas(self, filas):
+        """Anota como conocidas las ofertas de filas del CSV (con el nombre del país, no su código)."""
+        codigos = {nombre: codigo for codigo, nombre in MAPEO_PAISES.items()}
+        for fila in filas:
+            self.filtrar(codigos.get(fila['pais'], fila['pais']), fila['categoria_busqueda'], [fila])
+
+    def guardar(self):
+        with self._candado:
+            datos = {clave: sorted(ids) for clave, ids in self.ids.items()}
+        archivos_json.escribir_json(self.ruta, datos)
+
+def recorrer_busqueda(pais, palabra, sumidero, conocidas, avance, detener):
+    """
+    Recorre página a página una búsqueda (palabra clave en país) hasta que una
+    página llega vacía o, en modo incremental, hasta que una página es casi
+    toda de ofertas ya conocidas. Empieza en la página siguiente a la última
+    terminada según 'avance' y anota cada página en cuanto queda escrita. Si
+    una página no se puede descargar, la búsqueda queda pendiente desde ella,
+    salvo que ya haya fallado MAX_FALLOS_POR_PAGINA veces seguidas: entonces
+    se da por terminada (fallida). Devuelve el número de ofertas guardadas.
+    """
+    nombre_pais = MAPEO_PAISES.get(pais, pais)
+    numero_pagina = avance.pagina_inicial(pais, palabra)
+    if numero_pagina is None:
+        print(f"'{palabra}' en '{nombre_pais}' ya se terminó en la ejecución anterior.")
+        return 0
+
+    # Construye la URL base para la búsqueda actual
+    url_base_busqueda = f"{URL_BASE_PAIS.format(pais=pais)}/trabajo-de-{palabra}"
+    if numero_pagina == 1:
+        print(f"\n--- Iniciando scraping para '{palabra}' en '{nombre_pais}' ---")
+    else:
+        print(f"\n--- Reanudando scraping para '{palabra}' en '{nombre_pais}' desde la página {numero_pagina} ---")
+
+    total = 0
+    while not detener.is_set():
+        if numero_pagina == 1:
+            url_actual = url_base_busqueda
+        else:
+            # La paginación se maneja con ?p=NUMERO
+            url_actual = f"{url_base_busqueda}?p={numero_pagina}"
+
+        print(f"Extrayendo datos de: {url_actual}")
+
+        datos_de_la_pagina = extraer_datos_pagina(url_actual, pais, palabra)
+
+        if datos_de_la_pagina is None:
+            fallos = avance.fallo(pais, palabra)
+            if fallos >= MAX_FALLOS_POR_PAGINA:
+                print(f"La página {numero_pagina} de '{palabra}' en '{nombre_pais}' ha fallado {fallos} veces seguidas. "
+                      "Se da la búsqueda por terminada (fallida).")
+            else:
+                print(f"No se pudo descargar la página {numero_pagina} de '{palabra}' en '{nombre_pais}'. "
+                      f"Queda pendiente para la próxima ejecución (fallo {fallos} de {MAX_FALLOS_POR_PAGINA}).")
+            break
+
+        # Si la página no devuelve datos, rompemos el bucle para pasar a la siguiente categoría
+        if not datos_de_la_pagina:
+            print(f"No se encontraron más ofertas para '{palabra}' en '{nombre_pais}'. Pasando a la siguiente búsqueda.")
+            avance.marcar(pais, palabra, numero_pagina - 1, terminada=True)
+            break
+
+        nuevas = conocidas.filtrar(pais, palabra, datos_de_la_pagina)
+        sumidero.agregar(nuevas)
+        progreso.sumar('computrabajo', len(nuevas))
+        total += len(nuevas)
+
+        repetidas = len(datos_de_la_pagina) - len(nuevas)
+        al_dia = conocidas.incremental and repetidas >= UMBRAL_CONOCIDAS * len(datos_de_la_pagina)
+        # La página ya está en disco: a partir de aquí una reanudación sigue por la siguiente.
+        avance.marcar(pais, palabra, numero_pagina, terminada=al_dia)
+        if al_dia:
+            print(f"La página {numero_pagina} de '{palabra}' en '{nombre_pais}' ya era conocida "
+                  f"({repetidas}/{len(datos_de_la_pagina)} ofertas). Lo que sigue ya está guardado.")
+            break
+
+        # La pausa cortés la aplica el limitador por host del cliente HTTP.
+        numero_pagina += 1
+    return total
+
+def recorrer_pais(pais, sumidero, conocidas, avance, detener):
+    """Recorre todas las palabras clave de un país, una detrás de otra (un solo host)."""
+    return sum(recorrer_busqueda(pais, palabra, sumidero, conocidas, avance, detener) for palabra in PALABRAS_CLAVE)
+
+def _anadir_al_csv(origen, destino):
+    """Añade al final de 'destino' las filas de 'origen', sin su cabecera."""
+    with open(origen, 'r', encoding='utf-8-sig', newline='') as entrada, \
+            open(destino, 'a', encoding='utf-8', newline='') as salida:
+        next(entrada, None)
+        shutil.copyfileobj(entrada, salida)
+
+def ejecutar(max_concurrencia=MAX_CONCURRENCIA, tasa_maxima=None, incremental=True, reiniciar=False):
+    """
+    Recorre cada país y palabra clave página a página y guarda las ofertas en
+    computrabajo_multipaís.csv. Devuelve el número de ofertas guardadas.
+    Con 'incremental' (y si el CSV ya existe) solo se añaden al CSV las
+    ofertas nuevas y cada búsqueda se corta en cuanto llega a ofertas ya
+    conocidas; si no, se recorre todo y el CSV se reescribe.
+    Las ofertas se escriben página a página en computrabajo_multipaís.csv.parcial
+    y el avance de cada búsqueda se anota en datos/estado/computrabajo_avance.json:
+    si el recorrido se corta (error de red, Ctrl-C...), la siguiente ejecución
+    lo reanuda donde quedó, salvo con 'reiniciar'. El CSV final solo se
+    actualiza cuando todas las búsquedas han terminado.
+    Los países se reparten en un pool de 'max_concurrencia' hilos: como cada
+    país es un host distinto, van en paralelo sin cargar más a ninguno, y el
+    limitador de cada host mantiene la pausa cortés entre sus peticiones
+    ('tasa_maxima', si se indica, baja o sube su techo de peticiones/s).
+    """
+    print(f"Concurrencia: {max_concurrencia} país(es) a la vez")
+    if tasa_maxima is not None:
+        for pais in PAISES:
+            limitador_tasa.fijar_tasa_maxima(URL_BASE_PAIS.format(pais=pais), tasa_maxima)
+
+    avance = AvanceRecorrido()
+    reanudar = avance.pendiente and os.path.exists(ARCHIVO_PARCIAL) and not reiniciar
+    if reanudar:
+        # Se sigue en el modo con el que empezó el recorrido cortado.
+        incremental = avance.incremental
+        print("Reanudando el recorrido anterior donde quedó.")
+    else:
+        # Sin el CSV anterior no hay de qué partir: se hace un recorrido completo.
+        incremental = incremental and os.path.exists(ARCHIVO_SALIDA)
+        avance.empezar(incremental)
+    print("Modo: incremental (solo ofertas nuevas)" if incremental else "Modo: recorrido completo")
+    conocidas = OfertasConocidas(incremental)
+    if incremental and not os.path.exists(conocidas.ruta) and os.path.exists(ARCHIVO_SALIDA):
+        # El CSV existe pero no los ids (p. ej. es de antes del modo
+        # incremental o se borró datos/estado): se sacan del propio CSV.
+        with open(ARCHIVO_SALIDA, 'r', encoding='utf-8-sig', newline='') as f:
+            conocidas.anotar_filas(csv.DictReader(f))
+        print(f"Ids de ofertas conocidas tomados de '{ARCHIVO_SALIDA}'.")
+
+    sumidero = SumideroOfertas(reanudar=reanudar)
+    if reanudar:
+        # Lo que ya se escribió antes del corte cuenta como conocido.
+        conocidas.anotar_filas(sumidero.ofertas_escritas())
+        print(f"{sumidero.filas} ofertas ya guardadas antes del corte.")
+
+    cache_al_empezar = cache_condicional.resumen()
+    detener = threading.Event()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrencia)) as pool:
+            futuros = [pool.submit(recorrer_pais, pais, sumidero, conocidas, avance, detener) for pais in PAISES]
+            try:
+                # result() para que un error en un país se propague aquí.
+                for futuro in futuros:
+                    futuro.result()
+            except KeyboardInterrupt:
+                # Cada hilo termina su página en curso; lo escrito y el avance ya están en disco.
+                detener.set()
+                print(f"\nInterrumpido. Vuelve a ejecutar para reanudar desde '{avance.ruta}'.")
+                raise
+    finally:
+        sumidero.cerrar()
+
+    if USAR_CACHE_CONDICIONAL:
+        no_modificadas, descargadas = (
+            ahora - antes for ahora, antes in zip(cache_condicional.resumen(), cache_al_empezar)
+        )
+        print(f"\nPáginas sin cambios (304, servidas desde la caché): {no_modificadas} | descargadas: {descargadas}")
+
+    if not avance.completo():
+        print(f"\nRecorrido incompleto: {sumidero.filas} ofertas guardadas por ahora en '{ARCHIVO_PARCIAL}'. "
+              "Vuelve a ejecutar para reanudar las búsquedas pendientes.")
+        return sumidero.filas
+
+    nombre_archivo = ARCHIVO_SALIDA
+    if sumidero.filas:
+        if incremental and os.path.exists(nombre_archivo):
+            # Se añaden al final, sin cabecera ni BOM (ya los tiene el archivo).
+            _anadir_al_csv(ARCHIVO_PARCIAL, nombre_archivo)
+        else:
+            os.replace(ARCHIVO_PARCIAL, nombre_archivo)
+        conocidas.guardar()
+        print(f"\n✅ ¡Éxito! {sumidero.filas} ofertas extraídas y guardadas en '{nombre_archivo}'.")
+    elif incremental:
+        print("\nNo hay ofertas nuevas desde la última ejecución.")
     else:
         print("\nNo se pudo extraer ninguna oferta de trabajo.")
+    fallidas = avance.fallidas()
+    if fallidas:
+        print(f"Búsquedas abandonadas tras {MAX_FALLOS_POR_PAGINA} fallos seguidos: {', '.join(fallidas)} "
+              f"(anotadas en '{avance.ruta}').")
+    if os.path.exists(ARCHIVO_PARCIAL):
+        os.remove(ARCHIVO_PARCIAL)
+    avance.finalizar()
+    return sumidero.filas
+
+# --- PUNTO DE ENTRADA DEL SCRIPT ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scraping de ofertas de Computrabajo en varios países.")
+    parser.add_argument('--concurrencia', type=int, default=MAX_CONCURRENCIA,
+                        help=f"Países que se recorren a la vez (por defecto {MAX_CONCURRENCIA}).")
+    parser.add_argument('--tasa-maxima', type=float, default=None,
+                        help="Techo de peticiones por segundo contra cada host (por defecto el de limitador_tasa.py).")
+    parser.add_argument('--completo', action='store_true',
+                        help="Recorre todas las páginas y reescribe el CSV, aunque las ofertas ya se conozcan.")
+    parser.add_argument('--reiniciar', action='store_true',
+                        help="Descarta el avance de un recorrido anterior cortado y empieza de cero.")
+    parser.add_argument('--sin-cache-condicional', action='store_true',
+                        help="Descarga siempre el HTML completo, sin revalidar con ETag/Last-Modified.")
+    parser.add_argument('--motor-html', choices=MOTORES_HTML, default=MOTOR_HTML,
+                        help=f"Motor de análisis del HTML (por defecto el más rápido instalado: {MOTOR_HTML}).")
+    parser.add_argument('--guardar-html', metavar='CARPETA', default=None,
+                        help="Guarda el HTML de cada página descargada en CARPETA (p. ej. para el benchmark de análisis).")
+    cache_respuestas.agregar_argumentos(parser)
+    args = parser.parse_args()
+    cache_respuestas.configurar_desde_argumentos(args)
+    if args.motor_html not in motores_disponibles():
+        parser.error(f"El motor '{args.motor_html}' no está instalado. Disponibles: {', '.join(motores_disponibles())}")
+    MOTOR_HTML = args.motor_html
+    CARPETA_HTML = args.guardar_html
+    USAR_CACHE_CONDICIONAL = not args.sin_cache_condicional
+
+    ejecutar(args.concurrencia, args.tasa_maxima, incremental=not args.completo, reiniciar=args.reiniciar)
@@ -0,0 +1,137 @@
+# Ejecutor único de todas las fuentes de extracción.
+#
+# Lanza Adzuna, Jooble, JSearch y Computrabajo a la vez, cada uno en su propio
+# hilo y con su propio límite de concurrencia interna. Como casi todo el tiempo
+# de cada extractor es espera de red, el tiempo total pasa a ser el de la
+# fuente más lenta en lugar de la suma de todas.
+#
+# Uso (desde la raíz del proyecto):
+#   python source/ETL/ejecutar_extraccion.py
+#   python source/ETL/ejecutar_extraccion.py --fuentes adzuna,jooble --silencioso
+
+import argparse
+import contextlib
+import importlib.util
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(current_dir)
+
+import cache_respuestas
+import progreso
+
+# --- CONFIGURACIÓN PRINCIPAL ---
+
+# Ruta de cada extractor (relativa a source/ETL) y cómo lanzarlo con un límite de concurrencia.
+FUENTES = {
+    'adzuna': (os.path.join('adzuna_API', 'getdata.py'),
+               lambda modulo, concurrencia: modulo.ejecutar(max_concurrencia=concurrencia)),
+    'jsearch': (os.path.join('JSearch_API', 'extract_jsearch.py'),
+                lambda modulo, concurrencia: modulo.ejecutar(max_concurrencia=concurrencia)),
+    'jooble': (os.path.join('jooble_API', 'extractor.py'),
+               lambda modulo, concurrencia: modulo.ejecutar(max_concurrencia=concurrencia)),
+    'computrabajo': (os.path.join('computrabajo_webscraping', 'extractor.py'),
+                     lambda modulo, concurrencia: modulo.ejecutar(max_concurrencia=concurrencia)),
+}
+
+# Peticiones simultáneas que se permite cada fuente dentro de su hilo.
+CONCURRENCIA_POR_FUENTE = {
+    'adzuna': 8,
+    'jsearch': 2,
+    'jooble': 4,
+    'computrabajo': 5,
+}
+
+
+def _cargar_extractor(nombre, ruta_relativa):
+    """Importa un extractor por ruta (hay varios archivos llamados extractor.py)."""
+    ruta = os.path.join(current_dir, ruta_relativa)
+    carpeta = os.path.dirname(ruta)
+    # Algunos extractores importan módulos de su propia carpeta (p. ej. config.py).
+    if carpeta not in sys.path:
+        sys.path.insert(0, carpeta)
+    spec = importlib.util.spec_from_file_location(f"extractor_{nombre}", ruta)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def _ejecutar_fuente(nombre):
+    """Corre una fuente completa y devuelve (registros, error)."""
+    ruta_relativa, lanzar = FUENTES[nombre]
+    progreso.iniciar(nombre)
+    try:
+        modulo = _cargar_extractor(nombre, ruta_relativa)
+        return lanzar(modulo, CONCURRENCIA_POR_FUENTE.get(nombre, 1)), None
+    except Exception as e:  # Una fuente caída no debe detener a las demás.
+        return None, f"{e.__class__.__name__}: {e}"
+    finally:
+        progreso.terminar(nombre)
+
+
+def _informar(detener, intervalo):
+    """Muestra cada 'intervalo' segundos el avance conjunto de todas las fuentes."""
+    while not detener.wait(intervalo):
+        partes = [
+            f"{fuente}: {registros} ({'listo' if terminada else f'{segundos:.0f}s'})"
+            for fuente, (registros, segundos, terminada) in progreso.resumen().items()
+        ]
+        # Se escribe en la salida original para que se vea aunque se silencien los extractores.
+        print(f"[progreso] {' | '.join(partes)}", file=sys.__stdout__, flush=True)
+
+
+def ejecutar(fuentes, intervalo=10, silencioso=False):
+    """Lanza las fuentes indicadas en paralelo y devuelve {fuente: (registros, error)}."""
+    detener = threading.Event()
+    informe = threading.Thread(target=_informar, args=(detener, intervalo), daemon=True)
+    inicio = time.monotonic()
+    informe.start()
+
+    salida = open(os.devnull, 'w') if silencioso else None
+    try:
+        with contextlib.redirect_stdout(salida) if silencioso else contextlib.nullcontext():
+            with ThreadPoolExecutor(max_workers=len(fuentes)) as pool:
+                futuros = {fuente: pool.submit(_ejecutar_fuente, fuente) for fuente in fuentes}
+                resultados = {fuente: futuro.result() for fuente, futuro in futuros.items()}
+    finally:
+        detener.set()
+        if salida:
+            salida.close()
+
+    duracion_total = time.monotonic() - inicio
+    resumen = progreso.resumen()
+
+    print("\n--- Resumen de la extracción ---")
+    print(f"{'fuente':<14}{'registros':>11}{'tiempo (s)':>12}  estado")
+    for fuente in fuentes:
+        registros, error = resultados[fuente]
+        segundos = resumen.get(fuente, (0, 0.0, True))[1]
+        estado = f"ERROR - {error}" if error else "ok"
+        print(f"{fuente:<14}{registros if registros is not None else '-':>11}{segundos:>12.1f}  {estado}")
+    suma = sum(resumen.get(fuente, (0, 0.0, True))[1] for fuente in fuentes)
+    print(f"Tiempo total: {duracion_total:.1f}s (en secuencia habría sido ~{suma:.1f}s).")
+    return resultados
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ejecuta todos los extractores a la vez.")
+    parser.add_argument('--fuentes', default=','.join(FUENTES),
+                        help="Fuentes a ejecutar, separadas por comas (por defecto, todas).")
+    parser.add_argument('--intervalo', type=float, default=10,
+                        help="Segundos entre informes de progreso (por defecto 10).")
+    parser.add_argument('--silencioso', action='store_true',
+                        help="Oculta la salida de cada extractor y muestra solo el progreso conjunto.")
+    cache_respuestas.agregar_argumentos(parser)
+    args = parser.parse_args()
+    cache_respuestas.configurar_desde_argumentos(args)
+
+    fuentes = [f.strip() for f in args.fuentes.split(',') if f.strip()]
+    desconocidas = [f for f in fuentes if f not in FUENTES]
+    if desconocidas:
+        parser.error(f"Fuentes desconocidas: {', '.join(desconocidas)}. Disponibles: {', '.join(FUENTES)}")
+
+    ejecutar(fuentes, args.intervalo, args.silencioso)
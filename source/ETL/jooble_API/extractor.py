@@ -1,102 +1,199 @@
 # EXTRACTOR DE JOOBLE API
-import http.client
-import json
+import argparse
 import os
-import time
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+import almacen_crudos
+import cache_respuestas
+import cliente_http
+import limitador_tasa
+import progreso
+import rendimiento_consultas
 #from config import JOOBLE_API_KEY # Asumo que tu clave está en config.py
 JOOBLE_API_KEY = "clave api"  # Reemplaza con tu clave real
-def obtener_ofertas_jooble(keywords, location="Peru"):
+# URL base de la API (se puede apuntar a un servidor simulado para pruebas de carga).
+JOOBLE_URL_BASE = "https://es.jooble.org"
+# Ofertas por página que se piden a la API y máximo de páginas por búsqueda.
+RESULTADOS_POR_PAGINA = 50
+MAX_PAGINAS = 10
+def obtener_ofertas_jooble(keywords, location="Peru", pagina=1, resultados_por_pagina=RESULTADOS_POR_PAGINA):
     """
-    Realiza una petición POST a la API de Jooble usando http.client.
+    Realiza una petición POST a la API de Jooble usando el cliente HTTP compartido,
+    que reutiliza la conexión HTTPS entre peticiones.
     """
-    host = 'es.jooble.org'
-    
     try:
-        # Establecemos la conexión con el host.
-        connection = http.client.HTTPConnection(host)
-        
-        # Cabecera necesaria para la petición.
-        headers = {"Content-type": "application/json"}
-        
         # Creamos el cuerpo de la petición como un diccionario de Python.
+        # El cliente lo serializa a JSON y añade la cabecera Content-Type.
         body_dict = {
             "keywords": keywords,
-            "location": location
+            "location": location,
+            "page": str(pagina),
+            "ResultOnPage": str(resultados_por_pagina)
         }
-        # Convertimos el diccionario a un string en formato JSON.
-        body_json = json.dumps(body_dict)
 
-        print(f"Realizando petición a Jooble para: '{keywords}' en '{location}'...")
-        
-        # Realizamos la petición POST.
-        connection.request('POST', '/api/' + JOOBLE_API_KEY, body_json, headers)
-        response = connection.getresponse()
+        print(f"Realizando petición a Jooble para: '{keywords}' en '{location}' (Página {pagina})...")
         
-        # Leemos y decodificamos la respuesta.
-        data = response.read().decode("utf-8")
-        connection.close()
+        # Realizamos la petición POST. La clave va en la ruta: la caché usa el endpoint sin ella.
+        response = cliente_http.publicar(f"{JOOBLE_URL_BASE}/api/{JOOBLE_API_KEY}", json=body_dict,
+                                         url_cache=f"{JOOBLE_URL_BASE}/api/")
         
         # Verificamos que la respuesta sea exitosa (código 200).
-        if response.status == 200:
-            return json.loads(data) # Convertimos el string JSON de la respuesta a un diccionario.
+        if response.status_code == 200:
+            return response.json() # Convertimos el JSON de la respuesta a un diccionario.
         else:
-            print(f"Error en la respuesta de la API: {response.status} {response.reason}")
+            print(f"Error en la respuesta de la API: {response.status_code} {response.reason}")
             return None
 
     except Exception as e:
         print(f"Ocurrió un error de conexión: {e}")
         return None
 
-# --- PUNTO DE ENTRADA DEL SCRIPT ---
-if _name_ == "_main_":
-    
-    # Lista de países de América para realizar la búsqueda.
-    PAISES_DE_AMERICA = [
-        "Peru", "Mexico", "Colombia", "Chile", "Argentina", "Ecuador", "United States"
-    ]
-
-    # Lista extendida de términos de búsqueda para el sector de informática.
-    TERMINOS_DE_BUSQUEDA = [
-        "informatica", "sistemas", "programacion", "desarrollador", "software",
-        "analista de datos", "data scientist", "ingeniero de datos", "ciberseguridad",
-        "soporte tecnico", "redes y telecomunicaciones", "devops", "cloud", "arquitecto de software",
-        "frontend", "backend", "fullstack", "mobile developer", "analista funcional",
-        "jefe de proyecto ti", "product owner", "scrum master", "qa tester"
-    ]
-
-    # Lista para acumular todos los resultados.
-    todos_los_resultados = []
+# --- CONFIGURACIÓN DE LA EXTRACCIÓN ---
+
+# Lista de países de América para realizar la búsqueda.
+PAISES_DE_AMERICA = [
+    "Peru", "Mexico", "Colombia", "Chile", "Argentina", "Ecuador", "United States"
+]
+
+# Lista extendida de términos de búsqueda para el sector de informática.
+TERMINOS_DE_BUSQUEDA = [
+    "informatica", "sistemas", "programacion", "desarrollador", "software",
+    "analista de datos", "data scientist", "ingeniero de datos", "ciberseguridad",
+    "soporte tecnico", "redes y telecomunicaciones", "devops", "cloud", "arquitecto de software",
+    "frontend", "backend", "fullstack", "mobile developer", "analista funcional",
+    "jefe de proyecto ti", "product owner", "scrum master", "qa tester"
+]
 
+# Peticiones simultáneas y techo de peticiones por segundo contra Jooble.
+MAX_CONCURRENCIA = 4
+TASA_MAXIMA = 4.0
+
+class OfertasVistas:
+    """
+    Conjunto compartido de ofertas ya guardadas en esta ejecución. Los términos
+    se solapan ("software", "desarrollador", "backend"...) y la misma oferta
+    vuelve en varias búsquedas; así solo se guarda la primera vez.
+    """
+
+    def __init__(self):
+        self._claves = set()
+        self._candado = threading.Lock()
+
+    @staticmethod
+    def clave(oferta):
+        # El id de Jooble identifica la oferta; si falta, el enlace sirve igual.
+        return oferta.get('id') or oferta.get('link')
+
+    def filtrar_nuevas(self, ofertas):
+        with self._candado:
+            nuevas = []
+            for oferta in ofertas:
+                clave = self.clave(oferta)
+                if clave is None or clave not in self._claves:
+                    self._claves.add(clave)
+                    nuevas.append(oferta)
+            return nuevas
+
+def buscar_termino(pais, termino, vistas=None, max_paginas=MAX_PAGINAS, historial=None):
+    """
+    Recorre las páginas de una búsqueda (término en país) y devuelve las
+    ofertas que no se habían visto antes en esta ejecución. Si se pasa un
+    'historial', se anota cuántas aportó y cuántas páginas costó.
+    """
+    vistas = vistas if vistas is not None else OfertasVistas()
+    resultados_termino = []
+    recibidas = 0
+    paginas_pedidas = 0
+
+    for pagina in range(1, max_paginas + 1):
+        datos = obtener_ofertas_jooble(termino, location=pais, pagina=pagina)
+        paginas_pedidas += 1
+
+        # La respuesta de Jooble está dentro de la clave 'jobs'.
+        if not datos or not datos.get('jobs'):
+            break
+        resultados = datos['jobs']
+        recibidas += len(resultados)
+        resultados_termino.extend(vistas.filtrar_nuevas(resultados))
+
+        # Última página: vino incompleta o ya se cubrió el total anunciado (si
+        # la respuesta no trae 'totalCount' se sigue hasta una página incompleta).
+        if len(resultados) < RESULTADOS_POR_PAGINA or recibidas >= (datos.get('totalCount') or float('inf')):
+            break
+
+    if resultados_termino or recibidas:
+        print(f" -> '{termino}' en {pais}: {recibidas} ofertas recibidas, {len(resultados_termino)} nuevas.")
+    else:
+        print(f" -> No se encontraron ofertas para '{termino}' en {pais}.")
+    progreso.sumar('jooble', len(resultados_termino))
+    if historial is not None:
+        historial.registrar(historial.clave(pais, termino), len(resultados_termino), paginas_pedidas)
+    return resultados_termino
+
+def ejecutar(max_concurrencia=MAX_CONCURRENCIA, tasa_maxima=TASA_MAXIMA, podar=True):
+    """
+    Busca cada término en cada país y guarda todo en la partición del día de
+    datos/crudos/jooble (ver almacen_crudos.py).
+    La matriz país × término se reparte en un pool de 'max_concurrencia' hilos
+    que comparten la conexión HTTPS del cliente; el limitador del host no deja
+    pasar de 'tasa_maxima' peticiones por segundo. Las búsquedas se lanzan
+    de mayor a menor rendimiento histórico y, con 'podar', se saltan las que
+    llevan varias ejecuciones sin aportar ofertas nuevas. Devuelve el número
+    de ofertas extraídas.
+    """
     print("--- Iniciando extracción masiva de datos de Jooble ---")
+    print(f"Concurrencia: {max_concurrencia} | Techo: {tasa_maxima} peticiones/s")
+
+    limitador_tasa.fijar_tasa_maxima(JOOBLE_URL_BASE, tasa_maxima)
     
-    # Iteramos sobre cada país y cada término de búsqueda.
-    for pais in PAISES_DE_AMERICA:
-        print(f"\n--- Buscando en {pais} ---")
-        for termino in TERMINOS_DE_BUSQUEDA:
-            datos = obtener_ofertas_jooble(termino, location=pais)
-            
-            # La respuesta de Jooble está dentro de la clave 'jobs'.
-            if datos and datos.get('jobs'):
-                resultados = datos['jobs']
-                print(f" -> Se encontraron {len(resultados)} ofertas para '{termino}'.")
+    # Cada país con cada término de búsqueda.
+    combinaciones = {
+        rendimiento_consultas.HistorialRendimiento.clave(pais, termino): (pais, termino)
+        for pais in PAISES_DE_AMERICA for termino in TERMINOS_DE_BUSQUEDA
+    }
+    historial = rendimiento_consultas.HistorialRendimiento('jooble')
+    claves, omitidas = historial.priorizar(list(combinaciones), podar)
+    if omitidas:
+        print(f"Se omiten {len(omitidas)} de {len(combinaciones)} búsquedas por bajo rendimiento en las últimas ejecuciones.")
+
+    # Lista para acumular todos los resultados; los duplicados se descartan al extraer.
+    todos_los_resultados = []
+    vistas = OfertasVistas()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrencia)) as pool:
+            # Las búsquedas más productivas van primero: ellas se quedan con cada oferta repetida.
+            buscar = lambda clave: buscar_termino(*combinaciones[clave], vistas, historial=historial)
+            for resultados in pool.map(buscar, claves):
                 todos_los_resultados.extend(resultados)
-            else:
-                print(f" -> No se encontraron ofertas para '{termino}'.")
-            
-            # Pausa de 1 segundo para no sobrecargar la API.
-            time.sleep(1)
+    finally:
+        historial.guardar()
     
-    # Guardamos todos los resultados consolidados en un único archivo JSON.
+    # Guardamos todos los resultados consolidados en la partición del día.
     if todos_los_resultados:
         print(f"\n--- Proceso completado. Total de ofertas extraídas: {len(todos_los_resultados)} ---")
-        ruta_salida = os.path.join('datos', 'crudos')
-        os.makedirs(ruta_salida, exist_ok=True)
-        nombre_archivo = "jooble_datos_crudos.json"
-        
-        with open(os.path.join(ruta_salida, nombre_archivo), 'w', encoding='utf-8') as f:
-            json.dump(todos_los_resultados, f, ensure_ascii=False, indent=4)
-        
-        print(f"Todos los datos han sido guardados en: '{os.path.join(ruta_salida, nombre_archivo)}'")
+        with almacen_crudos.EscritorCrudos('jooble') as salida:
+            salida.escribir(todos_los_resultados)
+        print(f"Todos los datos han sido guardados en: '{salida.ruta}'")
     else:
         print("\nNo se extrajo ningún dato de la API en ninguna de las búsquedas.")
-        
+    return len(todos_los_resultados)
+
+# --- PUNTO DE ENTRADA DEL SCRIPT ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extracción de ofertas desde la API de Jooble.")
+    parser.add_argument('--concurrencia', type=int, default=MAX_CONCURRENCIA,
+                        help=f"Peticiones simultáneas (por defecto {MAX_CONCURRENCIA}).")
+    parser.add_argument('--tasa-maxima', type=float, default=TASA_MAXIMA,
+                        help=f"Techo de peticiones por segundo (por defecto {TASA_MAXIMA}).")
+    parser.add_argument('--sin-poda', action='store_true',
+                        help="Lanza todas las búsquedas, aunque tengan bajo rendimiento histórico.")
+    cache_respuestas.agregar_argumentos(parser)
+    args = parser.parse_args()
+    cache_respuestas.configurar_desde_argumentos(args)
+
+    ejecutar(args.concurrencia, args.tasa_maxima, podar=not args.sin_poda)
@@ -1,6 +1,20 @@
 import pandas as pd
+import argparse
 import json
 import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+import almacen_crudos
+
+# pyarrow es opcional: sin él no se genera el Parquet.
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
 
 def cargar_datos_json(ruta_archivo):
     """Carga un archivo JSON y devuelve su contenido."""
@@ -13,20 +27,117 @@ def cargar_datos_json(ruta_archivo):
         datos = json.load(f)
     return datos
 
-def _flatten_dict(data, parent_key="", sep="_"):
+# --- APLANADO POR COLUMNAS ---
+
+def inferir_esquema(registros, sep="_"):
+    """
+    Recorre los registros una sola vez y devuelve
+    (esquema, columnas_lista): el esquema asocia cada columna plana (claves
+    anidadas unidas con 'sep') a su ruta dentro del registro, en orden
+    alfabético, y columnas_lista son las columnas cuyo valor es una lista.
+    """
+    rutas = {}
+    columnas_lista = set()
+    # Forma de cada diccionario ya visto (ruta, claves y tipos de sus valores)
+    # -> claves cuyo valor es un dict. Casi todos los registros repiten forma:
+    # solo la primera vez se miran sus claves una a una.
+    formas = {}
+
+    def registrar_forma(datos, ruta):
+        anidadas = []
+        for clave, valor in datos.items():
+            ruta_clave = ruta + (clave,)
+            if isinstance(valor, dict):
+                anidadas.append(clave)
+                continue
+            columna = sep.join(str(parte) for parte in ruta_clave)
+            rutas.setdefault(columna, ruta_clave)
+            if isinstance(valor, list):
+                columnas_lista.add(columna)
+        return tuple(anidadas)
+
+    def recorrer(datos, ruta):
+        forma = (ruta, tuple(datos), tuple(map(type, datos.values())))
+        anidadas = formas.get(forma)
+        if anidadas is None:
+            anidadas = formas[forma] = registrar_forma(datos, ruta)
+        for clave in anidadas:
+            recorrer(datos[clave], ruta + (clave,))
+
+    for registro in registros:
+        recorrer(registro, ())
+    return {columna: rutas[columna] for columna in sorted(rutas)}, columnas_lista
+
+def _valor_en(registro, ruta):
+    for clave in ruta:
+        if not isinstance(registro, dict):
+            return None
+        registro = registro.get(clave)
+    # Un dict en una ruta hoja es otra forma del registro: sus claves tienen sus propias columnas.
+    return None if isinstance(registro, dict) else registro
+
+def aplanar_en_columnas(registros, esquema):
+    """
+    Llena una lista por columna. Cada columna de primer nivel sale de una
+    sola pasada de registro.get sobre los registros; las anidadas siguen su ruta.
+    """
+    columnas = {}
+    for columna, ruta in esquema.items():
+        if len(ruta) > 1:
+            columnas[columna] = [_valor_en(registro, ruta) for registro in registros]
+            continue
+        clave = ruta[0]
+        valores = [registro.get(clave) for registro in registros]
+        # Un dict en una ruta hoja tiene sus propias columnas (ver _valor_en).
+        if any(issubclass(tipo, dict) for tipo in set(map(type, valores))):
+            valores = [None if isinstance(valor, dict) else valor for valor in valores]
+        columnas[columna] = valores
+    return columnas
+
+# Un único codificador reutilizado: json.dumps con opciones crea uno nuevo en cada llamada.
+_CODIFICADOR_JSON = json.JSONEncoder(ensure_ascii=False)
+
+def _listas_a_json(valores):
+    codificar = _CODIFICADOR_JSON.encode
+    return [codificar(v) if isinstance(v, list) else v for v in valores]
+
+def columnas_a_dataframe(columnas, columnas_lista):
+    """
+    DataFrame plano para el CSV: las listas se guardan como texto JSON. Con
+    dtype=object cada valor se escribe tal cual, sin inferir un tipo por columna.
+    """
+    return pd.DataFrame({
+        columna: _listas_a_json(valores) if columna in columnas_lista else valores
+        for columna, valores in columnas.items()
+    }, dtype=object)
+
+def columnas_a_tabla(columnas, columnas_lista):
+    """
+    Tabla de Arrow en la que las listas se conservan como columnas de tipo
+    lista, para poder filtrar por ellas sin volver a parsear texto. Una
+    columna con tipos mezclados que Arrow no admite se guarda como texto.
     """
-    Aplana un diccionario recursivamente. Las listas se convierten en strings JSON.
+    arrays = {}
+    for columna, valores in columnas.items():
+        try:
+            arrays[columna] = pa.array(valores)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+            if columna in columnas_lista:
+                valores = _listas_a_json(valores)
+            arrays[columna] = pa.array([None if v is None else str(v) for v in valores], type=pa.string())
+    return pa.table(arrays)
+
+def aplanar(registros, sep="_"):
     """
-    items = {}
-    for k, v in data.items():
-        new_key = f"{parent_key}{sep}{k}" if parent_key else k
-        if isinstance(v, dict):
-            items.update(_flatten_dict(v, new_key, sep=sep))
-        elif isinstance(v, list):
-            items[new_key] = json.dumps(v, ensure_ascii=False)
-        else:
-            items[new_key] = v
-    return items
+    Aplana los registros y devuelve (df, tabla): el DataFrame para el CSV
+    (listas como texto JSON) y la tabla de Arrow con las listas como columnas
+    de tipo lista (None si no está instalado pyarrow). Ambos salen de los
+    mismos buffers por columna, llenados en una sola pasada.
+    """
+    esquema, columnas_lista = inferir_esquema(registros, sep)
+    columnas = aplanar_en_columnas(registros, esquema)
+    tabla = columnas_a_tabla(columnas, columnas_lista) if pa is not None else None
+    return columnas_a_dataframe(columnas, columnas_lista), tabla
 
 def transformar_json_a_dataframe(datos_json):
     if not datos_json:
@@ -35,30 +146,32 @@ def transformar_json_a_dataframe(datos_json):
 
     print(f"Procesando {len(datos_json)} registros...")
 
-    registros_planos = [_flatten_dict(reg) for reg in datos_json]
-    df = pd.DataFrame(registros_planos)
-    df = df.reindex(sorted(df.columns), axis=1)  # Ordenar columnas opcionalmente
-
-    return df
+    return aplanar(datos_json)[0]
 
 # --- PUNTO DE ENTRADA DEL SCRIPT ---
 if __name__ == "__main__":
 
-    # Ruta completa al archivo JSON
-    ruta_archivo_entrada = r"C:\Users\LENOVO\Documents\FINAL LP2 ANITA\Trabajo-Final-Lp2-\datos\crudos\jooble_datos_crudos.json"
+    parser = argparse.ArgumentParser(description="Transforma las ofertas crudas de Jooble a CSV.")
+    parser.add_argument('--desde', help="Primera fecha de extracción a incluir (AAAA-MM-DD).")
+    parser.add_argument('--hasta', help="Última fecha de extracción a incluir (AAAA-MM-DD).")
+    args = parser.parse_args()
 
-    # Ruta de salida para el CSV
-    ruta_archivo_salida = r"C:\Users\LENOVO\Documents\FINAL LP2 ANITA\Trabajo-Final-Lp2-\datos\procesados\datos_procesados_jooble.csv"
+    # Ruta de salida para el CSV (relativa a la raíz del proyecto)
+    ruta_archivo_salida = os.path.join('datos', 'procesados', 'datos_procesados_jooble.csv')
 
     # Aseguramos que la carpeta de salida exista
     os.makedirs(os.path.dirname(ruta_archivo_salida), exist_ok=True)
 
-    # Cargar JSON
-    datos_crudos = cargar_datos_json(ruta_archivo_entrada)
+    # Cargar los datos crudos de las particiones pedidas (y del JSON antiguo, si sigue ahí).
+    # Una oferta extraída en varias fechas solo se carga una vez, con su versión más reciente.
+    print("Cargando datos crudos de Jooble...")
+    datos_crudos = list(almacen_crudos.leer_sin_duplicados(
+        'jooble', lambda oferta: oferta.get('id') or oferta.get('link'), args.desde, args.hasta))
 
     if datos_crudos:
-        # Transformar
-        df_procesado = transformar_json_a_dataframe(datos_crudos)
+        # Transformar: el esquema se infiere una vez y los registros se vuelcan por columnas
+        print(f"Procesando {len(datos_crudos)} registros...")
+        df_procesado, tabla = aplanar(datos_crudos)
 
         # Guardar CSV
         df_procesado.to_csv(ruta_archivo_salida, index=False, encoding="utf-8")
@@ -66,5 +179,11 @@ if __name__ == "__main__":
         print(f"\n¡Proceso completado! Se han transformado {len(df_procesado)} registros.")
         print(f"Datos guardados en: '{ruta_archivo_salida}'")
 
+        # Guardar Parquet con las listas como columnas de tipo lista
+        if tabla is not None:
+            ruta_parquet = os.path.splitext(ruta_archivo_salida)[0] + '.parquet'
+            pq.write_table(tabla, ruta_parquet)
+            print(f"Versión columnar guardada en: '{ruta_parquet}'")
+
         print("\n--- Vista Previa de los Datos Transformados ---")
         print(df_procesado.head())
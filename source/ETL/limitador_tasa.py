@@ -0,0 +1,134 @@
+# Limitador de tasa adaptativo por host (AIMD) para los extractores del ETL.
+#
+# Cada host tiene un token bucket cuya tasa (peticiones por segundo) se ajusta
+# sola: sube un poco con cada respuesta correcta (aumento aditivo) y se reduce
+# a la mitad cuando el servidor responde 429/503 (disminución multiplicativa).
+# La tasa aprendida de cada host se guarda en disco al terminar, para que la
+# siguiente ejecución arranque a una velocidad razonable.
+
+import atexit
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+import archivos_json
+
+# --- CONFIGURACIÓN PRINCIPAL ---
+
+RUTA_TASAS = os.path.join('datos', 'estado', 'limites_por_host.json')
+
+TASA_INICIAL_POR_DEFECTO = 2.0     # Peticiones por segundo para un host sin historial.
+TASA_MINIMA = 0.1
+INCREMENTO_ADITIVO = 0.1           # Peticiones/s que se suman por cada respuesta correcta.
+FACTOR_MULTIPLICATIVO = 0.5        # Factor que se aplica a la tasa tras un 429/503.
+ESTADOS_DE_FRENADO = {429, 503}
+PAUSA_ENTRE_FRENADOS = 1.0         # Segundos: varios 429 seguidos cuentan como un solo frenado.
+
+# Límites por host (se comparan por sufijo). Los sitios que se scrapean llevan
+# un techo bajo por cortesía, aunque respondan bien.
+TASAS_MAXIMAS = {
+    'computrabajo.com': 2.0,
+    'jooble.org': 5.0,
+    'jsearch.p.rapidapi.com': 5.0,
+    'api.adzuna.com': 10.0,
+    'exchangerate-api.com': 2.0,
+}
+TASA_MAXIMA_POR_DEFECTO = 10.0
+
+# Permite desactivar la persistencia (p. ej. en benchmarks contra servidores locales).
+PERSISTIR_TASAS = True
+
+
+def _valor_por_sufijo(host, tabla, por_defecto):
+    for sufijo, valor in tabla.items():
+        if host == sufijo or host.endswith('.' + sufijo):
+            return valor
+    return por_defecto
+
+
+class LimitadorAIMD:
+    """Token bucket de un host con tasa ajustada por aumento aditivo / disminución multiplicativa."""
+
+    def __init__(self, host, tasa_inicial=TASA_INICIAL_POR_DEFECTO, tasa_maxima=TASA_MAXIMA_POR_DEFECTO):
+        self.host = host
+        self.tasa_maxima = tasa_maxima
+        self.tasa = max(TASA_MINIMA, min(tasa_inicial, tasa_maxima))
+        self._tokens = 1.0
+        self._ultimo_relleno = time.monotonic()
+        self._ultimo_frenado = 0.0
+        self._candado = threading.Lock()
+
+    def adquirir(self):
+        """Bloquea hasta que haya un token disponible para hacer una petición."""
+        with self._candado:
+            ahora = time.monotonic()
+            # La capacidad es de un segundo de tasa: permite ráfagas cortas sin pasarse.
+            capacidad = max(1.0, self.tasa)
+            self._tokens = min(capacidad, self._tokens + (ahora - self._ultimo_relleno) * self.tasa)
+            self._ultimo_relleno = ahora
+            # Se reserva el token aunque deje el saldo en negativo; la deuda fija la espera.
+            self._tokens -= 1.0
+            espera = 0.0 if self._tokens >= 0 else -self._tokens / self.tasa
+        if espera > 0:
+            time.sleep(espera)
+
+    def registrar_respuesta(self, estado):
+        """Ajusta la tasa según el código HTTP recibido (None = error de conexión)."""
+        with self._candado:
+            if estado is None or estado in ESTADOS_DE_FRENADO:
+                ahora = time.monotonic()
+                if ahora - self._ultimo_frenado < PAUSA_ENTRE_FRENADOS:
+                    return
+                self._ultimo_frenado = ahora
+                self.tasa = max(TASA_MINIMA, self.tasa * FACTOR_MULTIPLICATIVO)
+                # Se vacía el bucket para que la reducción tenga efecto inmediato.
+                self._tokens = min(self._tokens, 0.0)
+            elif estado < 400:
+                self.tasa = min(self.tasa_maxima, self.tasa + INCREMENTO_ADITIVO)
+
+
+_limitadores = {}
+_tasas_guardadas = None
+_candado_registro = threading.Lock()
+
+
+def _cargar_tasas():
+    if not PERSISTIR_TASAS:
+        return {}
+    return archivos_json.leer_json(RUTA_TASAS, {})
+
+
+def obtener_limitador(url):
+    """Devuelve el limitador del host de la URL, creándolo con la tasa guardada si la hay."""
+    global _tasas_guardadas
+    host = urlsplit(url).netloc.lower()
+    with _candado_registro:
+        if host not in _limitadores:
+            if _tasas_guardadas is None:
+                _tasas_guardadas = _cargar_tasas()
+            tasa_maxima = _valor_por_sufijo(host.split(':')[0], TASAS_MAXIMAS, TASA_MAXIMA_POR_DEFECTO)
+            tasa_inicial = _tasas_guardadas.get(host, TASA_INICIAL_POR_DEFECTO)
+            _limitadores[host] = LimitadorAIMD(host, tasa_inicial, tasa_maxima)
+        return _limitadores[host]
+
+
+def fijar_tasa_maxima(url, tasa_maxima):
+    """Impone un techo de peticiones/s al host de la URL (la tasa actual se recorta si lo supera)."""
+    limitador = obtener_limitador(url)
+    with limitador._candado:
+        limitador.tasa_maxima = tasa_maxima
+        limitador.tasa = max(TASA_MINIMA, min(limitador.tasa, tasa_maxima))
+    return limitador
+
+
+def guardar_tasas():
+    """Guarda en disco la tasa aprendida de cada host usado en esta ejecución."""
+    if not PERSISTIR_TASAS or not _limitadores:
+        return
+    tasas = _cargar_tasas()
+    tasas.update({host: round(limitador.tasa, 3) for host, limitador in _limitadores.items()})
+    archivos_json.escribir_json(RUTA_TASAS, tasas, indent=4)
+
+
+atexit.register(guardar_tasas)
@@ -0,0 +1,42 @@
+# Contadores de progreso compartidos por los extractores.
+#
+# Cada extractor suma aquí los registros que va guardando bajo el nombre de
+# su fuente. Ejecutados por separado no cambia nada; cuando los lanza
+# ejecutar_extraccion.py en paralelo, el ejecutor lee estos contadores para
+# mostrar un informe conjunto del avance.
+
+import threading
+import time
+
+_candado = threading.Lock()
+_registros = {}
+_inicio = {}
+_fin = {}
+
+
+def iniciar(fuente):
+    with _candado:
+        _registros.setdefault(fuente, 0)
+        _inicio[fuente] = time.monotonic()
+        _fin.pop(fuente, None)
+
+
+def sumar(fuente, registros):
+    """Suma registros guardados por una fuente."""
+    with _candado:
+        _registros[fuente] = _registros.get(fuente, 0) + registros
+
+
+def terminar(fuente):
+    with _candado:
+        _fin[fuente] = time.monotonic()
+
+
+def resumen():
+    """Devuelve {fuente: (registros, segundos transcurridos, terminada)}."""
+    ahora = time.monotonic()
+    with _candado:
+        return {
+            fuente: (registros, _fin.get(fuente, ahora) - _inicio.get(fuente, ahora), fuente in _fin)
+            for fuente, registros in _registros.items()
+        }
@@ -0,0 +1,95 @@
+# Historial de rendimiento de cada celda (país, término) de una matriz de búsqueda.
+#
+# Por cada ejecución se anota cuántas ofertas únicas nuevas aportó cada celda y
+# cuántas llamadas costó. Con ese historial:
+# - las celdas se ordenan por ofertas nuevas esperadas por llamada, y
+# - las que llevan varias ejecuciones seguidas sin aportar casi nada se saltan,
+#   salvo una de cada REVISAR_CADA ejecuciones, para detectar si han revivido.
+# Lo usan los extractores de Jooble y JSearch.
+
+import os
+import threading
+
+import archivos_json
+
+# --- CONFIGURACIÓN PRINCIPAL ---
+
+RUTA_ESTADO = os.path.join('datos', 'estado')
+
+VENTANA = 5                 # Ejecuciones recientes que se conservan por celda.
+MIN_EJECUCIONES = 3         # Ejecuciones seguidas de bajo rendimiento antes de podar una celda.
+UMBRAL_BAJO = 1             # Ofertas nuevas por ejecución que se consideran "casi nada".
+REVISAR_CADA = 4            # Una celda podada se vuelve a probar cada tantas ejecuciones.
+
+# Ofertas nuevas por llamada que se suponen para una celda sin historial.
+# Es optimista a propósito: así las celdas nuevas se prueban pronto.
+RENDIMIENTO_INICIAL = 10.0
+
+
+class HistorialRendimiento:
+    """Rendimiento por celda de una fuente, guardado en datos/estado/rendimiento_<fuente>.json."""
+
+    def __init__(self, fuente, ruta=None):
+        self.ruta = ruta or os.path.join(RUTA_ESTADO, f"rendimiento_{fuente}.json")
+        self.datos = archivos_json.leer_json(self.ruta, {})
+        # Lo aportado por cada celda en la ejecución en curso: clave -> [nuevas, llamadas].
+        self._actual = {}
+        self._candado = threading.Lock()
+
+    @staticmethod
+    def clave(*partes):
+        return '|'.join(str(parte) for parte in partes)
+
+    def registrar(self, clave, nuevas, llamadas=1):
+        """Suma a la ejecución en curso las ofertas nuevas y llamadas de una celda."""
+        with self._candado:
+            actual = self._actual.setdefault(clave, [0, 0])
+            actual[0] += nuevas
+            actual[1] += llamadas
+
+    def _historial(self, clave):
+        return self.datos.get(clave, {}).get('historial', [])
+
+    def rendimiento(self, clave):
+        """Ofertas nuevas esperadas por llamada, suavizado hacia RENDIMIENTO_INICIAL."""
+        historial = self._historial(clave)
+        if not historial:
+            return RENDIMIENTO_INICIAL
+        nuevas = sum(n for n, _ in historial)
+        llamadas = sum(l for _, l in historial)
+        return (nuevas + RENDIMIENTO_INICIAL) / (llamadas + 1)
+
+    def es_improductiva(self, clave):
+        """True si las últimas MIN_EJECUCIONES ejecuciones aportaron como mucho UMBRAL_BAJO cada una."""
+        recientes = self._historial(clave)[-MIN_EJECUCIONES:]
+        return len(recientes) >= MIN_EJECUCIONES and all(n <= UMBRAL_BAJO for n, _ in recientes)
+
+    def priorizar(self, claves, podar=True):
+        """
+        Devuelve (a_ejecutar, omitidas). 'a_ejecutar' va de mayor a menor
+        rendimiento esperado; las celdas improductivas se omiten salvo en su
+        turno de revisión, y entonces van al final.
+        """
+        productivas, revision, omitidas = [], [], []
+        for clave in claves:
+            if not podar or not self.es_improductiva(clave):
+                productivas.append(clave)
+                continue
+            entrada = self.datos.setdefault(clave, {'historial': self._historial(clave)})
+            entrada['omitida'] = entrada.get('omitida', 0) + 1
+            if entrada['omitida'] >= REVISAR_CADA:
+                entrada['omitida'] = 0
+                revision.append(clave)
+            else:
+                omitidas.append(clave)
+        productivas.sort(key=self.rendimiento, reverse=True)
+        return productivas + revision, omitidas
+
+    def guardar(self):
+        """Añade la ejecución en curso al historial de cada celda y lo escribe en disco."""
+        with self._candado:
+            for clave, (nuevas, llamadas) in self._actual.items():
+                entrada = self.datos.setdefault(clave, {})
+                entrada['historial'] = (entrada.get('historial', []) + [[nuevas, llamadas]])[-VENTANA:]
+            self._actual = {}
+            archivos_json.escribir_json(self.ruta, self.datos, indent=4)
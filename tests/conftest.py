@@ -0,0 +1,18 @@
+# Configuración común de las pruebas.
+#
+# config.py no se versiona (lleva las claves de las APIs). Si no está, se usa
+# uno mínimo con claves de prueba: las pruebas simulan las APIs y no salen a la red.
+
+import os
+import sys
+import types
+
+raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(raiz, 'source', 'ETL'))
+
+try:
+    import config  # noqa: F401
+except ImportError:
+    sys.modules['config'] = types.SimpleNamespace(
+        APP_ID='prueba', APP_KEY='prueba', APP_KEY_JSearch='prueba', JOOBLE_API_KEY='prueba',
+    )
@@ -0,0 +1,49 @@
+# Aplanado de Jooble por columnas: mismas columnas y valores que el aplanado registro a registro.
+#
+# Uso (desde la raíz del proyecto):
+#   python -m pytest tests
+
+import os
+import sys
+
+import pytest
+
+pytest.importorskip('pandas')
+
+raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(raiz, 'source', 'ETL', 'jooble_API'))
+import script
+
+REGISTROS = [
+    {'id': 1, 'title': 'Analista', 'salary': '10', 'company': {'name': 'A', 'rating': 4}, 'tags': ['sql']},
+    {'id': 2, 'title': 'Ingeniero', 'salary': None, 'company': None, 'tags': None},
+    {'id': 3, 'title': 'Científico', 'sueldo': 48000.5, 'company': {'name': 'C'}},
+    {'id': 4, 'title': 'Soporte', 'sueldo': 48000, 'company': {'name': 'D', 'sede': {'ciudad': 'Lima'}}},
+    # Misma forma que el primero (claves y tipos): sus columnas ya están registradas.
+    {'id': 5, 'title': 'Tester', 'salary': '20', 'company': {'name': 'E', 'rating': 3}, 'tags': []},
+]
+
+
+def test_columnas_de_todas_las_formas():
+    df, _ = script.aplanar(REGISTROS)
+    assert list(df.columns) == [
+        'company', 'company_name', 'company_rating', 'company_sede_ciudad',
+        'id', 'salary', 'sueldo', 'tags', 'title',
+    ]
+    # "company": null conserva su columna, vacía; donde es un dict, sus claves van en las suyas.
+    assert list(df['company']) == [None] * 5
+    assert list(df['company_name']) == ['A', None, 'C', 'D', 'E']
+    assert list(df['company_sede_ciudad']) == [None, None, None, 'Lima', None]
+
+
+def test_valores_sin_inferir_tipos():
+    df, _ = script.aplanar(REGISTROS)
+    assert list(df['id'].astype(str)) == ['1', '2', '3', '4', '5']
+    assert df['sueldo'].iloc[3] == 48000 and isinstance(df['sueldo'].iloc[3], int)
+
+
+def test_listas_como_texto_en_csv_y_como_listas_en_la_tabla():
+    pytest.importorskip('pyarrow')
+    df, tabla = script.aplanar(REGISTROS)
+    assert list(df['tags']) == ['["sql"]', None, None, None, '[]']
+    assert tabla.column('tags').to_pylist() == [['sql'], None, None, None, []]
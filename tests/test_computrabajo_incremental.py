@@ -0,0 +1,102 @@
+# Recorrido de Computrabajo con páginas simuladas (sin red).
+#
+# Uso (desde la raíz del proyecto):
+#   python -m pytest tests
+
+import importlib.util
+import os
+
+import pytest
+
+pytest.importorskip('bs4')
+
+# Se carga por ruta: jooble_API también tiene un 'extractor'.
+raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_spec = importlib.util.spec_from_file_location(
+    'extractor_computrabajo', os.path.join(raiz, 'source', 'ETL', 'computrabajo_webscraping', 'extractor.py'))
+extractor = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(extractor)
+
+
+def _oferta(numero):
+    return {
+        'puesto_trabajo': f"Analista SQL {numero}", 'nombre_empresa': 'Empresa', 'pais': 'Perú',
+        'region_estado': 'Lima', 'categoria_busqueda': 'sql', 'tipo_contrato': 'NA', 'salario': 'NA',
+        'moneda_salario': 'PEN', 'periodo_salario': 'Mensual', 'plataforma_origen': 'Computrabajo',
+        'tipo_fuente_datos': 'Web Scraping',
+        'enlace_oferta': f"https://pe.computrabajo.com/ofertas-de-trabajo/oferta-de-trabajo-de-analista-{numero:032X}",
+    }
+
+
+@pytest.fixture
+def portal(tmp_path, monkeypatch):
+    """Un solo país y palabra clave; 'paginas' son las páginas de resultados que devuelve el portal."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(extractor, 'PAISES', ['pe'])
+    monkeypatch.setattr(extractor, 'PALABRAS_CLAVE', ['sql'])
+    paginas = [[_oferta(i) for i in range(10)], [_oferta(i) for i in range(10, 20)]]
+
+    def extraer_datos_pagina(url, pais, palabra):
+        numero = int(url.split('?p=')[1]) if '?p=' in url else 1
+        if numero <= len(paginas):
+            # None: la página no se pudo descargar.
+            return None if paginas[numero - 1] is None else list(paginas[numero - 1])
+        return []
+
+    monkeypatch.setattr(extractor, 'extraer_datos_pagina', extraer_datos_pagina)
+    return paginas
+
+
+def _filas_csv():
+    with open(extractor.ARCHIVO_SALIDA, 'r', encoding='utf-8-sig') as f:
+        return len(f.read().splitlines()) - 1
+
+
+def test_csv_sin_archivo_de_ids_no_duplica(portal):
+    assert extractor.ejecutar(1, incremental=False) == 20
+    os.remove(extractor.RUTA_CONOCIDAS)
+
+    assert extractor.ejecutar(1, incremental=True) == 0
+    assert _filas_csv() == 20
+
+
+def test_csv_sin_archivo_de_ids_solo_anade_las_nuevas(portal):
+    extractor.ejecutar(1, incremental=False)
+    os.remove(extractor.RUTA_CONOCIDAS)
+    portal[0][:0] = [_oferta(100), _oferta(101)]
+
+    assert extractor.ejecutar(1, incremental=True) == 2
+    assert _filas_csv() == 22
+
+
+def test_pagina_que_siempre_falla_acaba_como_busqueda_fallida(portal):
+    portal[1] = None
+    for _ in range(extractor.MAX_FALLOS_POR_PAGINA - 1):
+        extractor.ejecutar(1, incremental=False)
+        assert not os.path.exists(extractor.ARCHIVO_SALIDA)
+
+    assert extractor.ejecutar(1, incremental=False) == 10
+    assert _filas_csv() == 10
+    avance = extractor.AvanceRecorrido()
+    assert not avance.pendiente
+    assert avance.fallidas() == ['pe|sql']
+
+
+def test_todos_los_motores_leen_igual_la_ubicacion():
+    # El primer <p> de ubicación no tiene span; el segundo sí. bs4 se queda con el primero (NA).
+    html = '''<html><body>
+    <article class="box_offer">
+      <a class="js-o-link fc_base" href="/ofertas-de-trabajo/oferta-de-trabajo-de-analista-{id1}">Analista</a>
+      <p class="fs16 fc_base mt5">Lima</p>
+      <p class="fs16 fc_base mt5"><span>Cusco</span></p>
+    </article>
+    <article class="box_offer">
+      <a class="js-o-link fc_base" href="/ofertas-de-trabajo/oferta-de-trabajo-de-analista-{id2}">Analista</a>
+      <p class="fs16 fc_base mt5"><span> Arequipa </span></p>
+    </article>
+    </body></html>'''.format(id1='A' * 32, id2='B' * 32)
+    ubicaciones = {
+        motor: [oferta['region_estado'] for oferta in extractor.analizar_pagina(html, 'pe', 'sql', motor)]
+        for motor in extractor.motores_disponibles()
+    }
+    assert all(valores == ['NA', 'Arequipa'] for valores in ubicaciones.values()), ubicaciones
@@ -0,0 +1,93 @@
+# Corte adaptativo de JSearch por novedad, con la API simulada (sin red ni cuota real).
+#
+# Uso (desde la raíz del proyecto):
+#   python -m pytest tests
+
+import json
+import os
+import sys
+
+import pytest
+import requests
+
+raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(raiz, 'source', 'ETL', 'JSearch_API'))
+import cache_respuestas
+import cliente_http
+import extract_jsearch
+import planificador_cuota
+
+# Antes se pedían siempre 5 páginas por consulta (una llamada por página).
+TOPE_ANTERIOR = 5
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """Simula JSearch: 10 ofertas por página; devuelve las llamadas hechas como (página, num_pages)."""
+    llamadas = []
+
+    def obtener(query, pais, pagina=1, num_paginas=1):
+        llamadas.append((pagina, num_paginas))
+        return {'data': [{'job_id': f"{p}-{i}"} for p in range(pagina, pagina + num_paginas) for i in range(10)]}
+
+    monkeypatch.setattr(extract_jsearch, 'obtener_ofertas_jsearch', obtener)
+    monkeypatch.setattr(extract_jsearch, 'COSTE_PAGINA_EXTRA', 1.0)
+    return llamadas
+
+
+def _cuota(tmp_path):
+    return planificador_cuota.ContadorCuota(1000, ruta=str(tmp_path / 'cuota.json'))
+
+
+def test_consulta_sin_novedad_cuesta_menos_que_el_tope_anterior(api, tmp_path):
+    vistos = extract_jsearch._IdsVistos({'job_id': f"{p}-{i}"} for p in range(1, 20) for i in range(10))
+    cuota = _cuota(tmp_path)
+
+    nuevas, pendiente = extract_jsearch.extraer_consulta('q', 'us', cuota=cuota, vistos=vistos)
+
+    assert nuevas == [] and pendiente is None
+    assert api == [(1, 1)]
+    assert cuota.llamadas < TOPE_ANTERIOR
+
+
+def test_consulta_con_novedad_no_pasa_del_tope(api, tmp_path):
+    cuota = _cuota(tmp_path)
+
+    nuevas, _ = extract_jsearch.extraer_consulta('q', 'us', cuota=cuota)
+
+    assert len(nuevas) == 50
+    assert api == [(1, 1), (2, 2), (4, 2)]
+    assert cuota.llamadas <= TOPE_ANTERIOR
+
+
+def test_respuestas_en_cache_no_gastan_cuota(monkeypatch, tmp_path):
+    class Sesion:
+        """Sesión HTTP simulada: 10 ofertas por página pedida."""
+        def __init__(self):
+            self.peticiones = 0
+
+        def request(self, metodo, url, params=None, **kwargs):
+            self.peticiones += 1
+            pagina, num_paginas = int(params['page']), int(params['num_pages'])
+            datos = [{'job_id': f"{p}-{i}"} for p in range(pagina, pagina + num_paginas) for i in range(10)]
+            respuesta = requests.Response()
+            respuesta.status_code = 200
+            respuesta.url = url
+            respuesta._content = json.dumps({'data': datos}).encode('utf-8')
+            return respuesta
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(extract_jsearch, 'COSTE_PAGINA_EXTRA', 1.0)
+    monkeypatch.setattr(cliente_http, '_sesion', Sesion())
+    monkeypatch.setattr(cache_respuestas, 'activa', True)
+    monkeypatch.setattr(cache_respuestas, 'solo_cache', False)
+
+    primera = planificador_cuota.ContadorCuota(1000, ruta=str(tmp_path / 'cuota_1.json'))
+    nuevas, _ = extract_jsearch.extraer_consulta('q', 'us', cuota=primera)
+    assert len(nuevas) == 50 and primera.llamadas == 5
+
+    # La misma consulta otra vez: todo sale de la caché, sin red ni cuota.
+    segunda = planificador_cuota.ContadorCuota(1000, ruta=str(tmp_path / 'cuota_2.json'))
+    nuevas, _ = extract_jsearch.extraer_consulta('q', 'us', cuota=segunda)
+    assert len(nuevas) == 50 and segunda.llamadas == 0
+    assert cliente_http._sesion.peticiones == 3
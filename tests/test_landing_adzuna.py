@@ -0,0 +1,64 @@
+# El modo asíncrono de Adzuna debe dejar el landing en el mismo orden que el secuencial.
+#
+# Uso (desde la raíz del proyecto):
+#   python -m pytest tests
+
+import asyncio
+import os
+import random
+import sys
+import time
+
+import pytest
+
+raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(raiz, 'source', 'ETL', 'adzuna_API'))
+import almacen_crudos
+import getdata
+
+BUSQUEDAS = [{'que': que, 'donde': 'lima', 'pais': 'us'} for que in ('a', 'b', 'c')]
+OFERTAS_POR_BUSQUEDA = 120
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """Adzuna simulada: cada petición tarda un tiempo al azar, así las respuestas llegan desordenadas."""
+    azar = random.Random(3)
+
+    def obtener(que, donde, pais='us', pagina=1, por_pagina=50, filtros=None):
+        time.sleep(azar.random() * 0.02)
+        inicio = (pagina - 1) * por_pagina
+        ids = range(inicio, min(inicio + por_pagina, OFERTAS_POR_BUSQUEDA))
+        return {'count': OFERTAS_POR_BUSQUEDA, 'results': [{'id': f"{que}-{i}", 'created': '2026-01-01'} for i in ids]}
+
+    monkeypatch.setattr(getdata, 'obtener_ofertas_adzuna', obtener)
+
+
+def _landing(tmp_path, nombre):
+    return getdata.LandingAdzuna(str(tmp_path / nombre), str(tmp_path / f"{nombre}.checkpoint.jsonl"))
+
+
+def _ids(tmp_path, nombre):
+    return [oferta['id'] for oferta in almacen_crudos.leer('adzuna', raiz=str(tmp_path / nombre))]
+
+
+def test_async_mismo_orden_que_secuencial(api, tmp_path):
+    secuencial = _landing(tmp_path, 'secuencial')
+    for busqueda in BUSQUEDAS:
+        getdata.procesar_busqueda(busqueda, secuencial)
+    secuencial.cerrar(True)
+
+    asincrono = _landing(tmp_path, 'asincrono')
+    asyncio.run(getdata.extraer_busquedas_async(BUSQUEDAS, asincrono, max_concurrencia=8))
+    asincrono.cerrar(True)
+
+    esperados = [f"{b['que']}-{i}" for b in BUSQUEDAS for i in range(OFERTAS_POR_BUSQUEDA)]
+    assert _ids(tmp_path, 'secuencial') == esperados
+    assert _ids(tmp_path, 'asincrono') == esperados
+
+
+def test_marcas_de_agua_danadas_no_rompen_la_ejecucion(tmp_path):
+    ruta = tmp_path / 'adzuna_marcas_de_agua.json'
+    ruta.write_text('{"a|lima|us": {"created": "2026-01-0', encoding='utf-8')
+    marcas = getdata.MarcasDeAgua(str(ruta))
+    assert marcas.obtener(BUSQUEDAS[0]) is None
@@ -0,0 +1,74 @@
+# El CSV de Adzuna no debe depender del tamaño de bloque con que se transforma.
+#
+# Uso (desde la raíz del proyecto):
+#   python -m pytest tests
+
+import os
+import random
+import sys
+
+import pytest
+
+pytest.importorskip('pandas')
+
+raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(raiz, 'source', 'ETL', 'adzuna_API'))
+sys.path.append(os.path.join(raiz, 'source', 'ETL', 'benchmark'))
+import from_json_to_csv
+from benchmark_transformacion_adzuna import oferta_sintetica
+
+
+def _ofertas(cantidad=500):
+    azar = random.Random(7)
+    ofertas = [oferta_sintetica(i, azar) for i in range(cantidad)]
+    # Un bloque con solo salarios enteros y otro con enteros y decimales daban 48000 y 48000.0.
+    ofertas[0]['salary_min'] = 48000
+    ofertas[1]['salary_min'] = 48000.0
+    ofertas[2]['salary_min'] = None
+    return ofertas
+
+
+def _csv(tmp_path, ofertas, tamano_bloque):
+    ruta = tmp_path / f"adzuna_{tamano_bloque}.csv"
+    from_json_to_csv.transformar_a_csv(iter(ofertas), str(ruta), tamano_bloque)
+    return ruta.read_bytes()
+
+
+@pytest.mark.parametrize('tamano_bloque', [1, 3, 64, 499])
+def test_csv_igual_con_cualquier_tamano_de_bloque(tmp_path, tamano_bloque):
+    ofertas = _ofertas()
+    assert _csv(tmp_path, ofertas, tamano_bloque) == _csv(tmp_path, ofertas, len(ofertas))
+
+
+def test_por_columnas_igual_que_oferta_a_oferta():
+    ofertas = _ofertas()
+    por_columnas = from_json_to_csv.transformar_bloque(ofertas).to_csv(index=False)
+    assert por_columnas == from_json_to_csv.transformar_ofertas(ofertas).to_csv(index=False)
+
+
+def test_salarios_se_escriben_tal_cual(tmp_path):
+    filas = _csv(tmp_path, _ofertas(), 1).decode('utf-8').splitlines()
+    salarios = [fila.split(',')[4] for fila in filas[1:4]]
+    assert salarios == ['48000', '48000.0', '']
+
+
+def test_nulos_anidados_y_areas_cortas():
+    # Clave ausente -> 'NA'; null explícito (en la hoja o en el diccionario padre) -> celda vacía.
+    ofertas = [
+        {'company': {'display_name': None}, 'category': {'label': None}, 'location': {'area': []}},
+        {'company': None, 'category': None, 'location': None},
+        {'company': {}, 'category': {}, 'location': {'area': None}},
+        {'location': {'area': ['US']}},
+        {'location': {}},
+    ]
+    por_oferta = from_json_to_csv.transformar_ofertas(ofertas)
+    por_columnas = from_json_to_csv.transformar_bloque(ofertas)
+    assert por_columnas.to_csv(index=False) == por_oferta.to_csv(index=False)
+    columnas = ['nombre_empresa', 'categoria', 'pais', 'region_estado']
+    assert por_columnas[columnas].values.tolist() == [
+        [None, None, 'NA', 'NA'],
+        [None, None, None, None],
+        ['NA', 'NA', None, None],
+        ['NA', 'NA', 'US', 'NA'],
+        ['NA', 'NA', 'NA', 'NA'],
+    ]